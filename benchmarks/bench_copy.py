@@ -0,0 +1,89 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils import copy as copy_mod  # noqa: E402
+from src.utils.copy import CopyBackend  # noqa: E402
+
+
+def make_tree(root, count, size):
+    chunk = os.urandom(min(size, 1 << 20)) if size else b""
+    for i in range(count):
+        sub = os.path.join(root, f"d{i % 50}")
+        os.makedirs(sub, exist_ok=True)
+        with open(os.path.join(sub, f"f{i}"), "wb") as f:
+            written = 0
+            while written < size:
+                part = chunk[: size - written]
+                f.write(part)
+                written += len(part)
+    return count * size
+
+
+def time_copy(copy_function, src, dst):
+    start = time.perf_counter()
+    try:
+        shutil.copytree(src, dst, copy_function=copy_function)
+        return time.perf_counter() - start
+    finally:
+        shutil.rmtree(dst, ignore_errors=True)
+
+
+def bench(strategies, src, work_dir, total_bytes, repeat):
+    # Rounds are interleaved so that page cache and allocator state affect
+    # every strategy alike rather than favouring whichever runs first.
+    best = {}
+    for _ in range(repeat):
+        for label, func in strategies:
+            if best.get(label, 0) is None:
+                continue
+            try:
+                elapsed = time_copy(func, src, os.path.join(work_dir, "out"))
+            except OSError:
+                best[label] = None
+                continue
+            best[label] = min(best.get(label) or elapsed, elapsed)
+    for label, _ in strategies:
+        elapsed = best.get(label)
+        if elapsed is None:
+            print(f"  {label:<34} not supported on this volume")
+            continue
+        mb_s = total_bytes / (1024 * 1024) / elapsed if elapsed else float("inf")
+        print(f"  {label:<34} {elapsed * 1000:9.1f} ms  {mb_s:9.1f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare skill import copy strategies.")
+    parser.add_argument("--small-count", type=int, default=5000)
+    parser.add_argument("--small-kb", type=int, default=4)
+    parser.add_argument("--large-count", type=int, default=4)
+    parser.add_argument("--large-mb", type=int, default=128)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dir", help="Directory on the volume to benchmark (default: temp dir)")
+    args = parser.parse_args()
+
+    strategies = [("shutil.copytree (copy2)", shutil.copy2)]
+    strategies.append(("copy backend (auto)", CopyBackend().copy_file))
+    for name, func in copy_mod._available_methods():
+        strategies.append((f"copy backend ({name} only)", CopyBackend([(name, func)]).copy_file))
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as root:
+        sets = [
+            (f"{args.small_count} x {args.small_kb} KiB", "small", args.small_count, args.small_kb * 1024),
+            (f"{args.large_count} x {args.large_mb} MiB", "large", args.large_count, args.large_mb * 1024 * 1024),
+        ]
+        for title, name, count, size in sets:
+            src = os.path.join(root, name)
+            total_bytes = make_tree(src, count, size)
+            print(title)
+            bench(strategies, src, root, total_bytes, args.repeat)
+            shutil.rmtree(src)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.hashing import FileHasher  # noqa: E402
+
+
+def legacy_hash_file(file_path):
+    # The 4096-byte loop calculate_dir_hash used before the hashing backend.
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f_obj:
+        while True:
+            data = f_obj.read(4096)
+            if not data:
+                break
+            sha256.update(data)
+    return sha256.hexdigest()
+
+
+def make_files(root, count, size):
+    paths = []
+    chunk = os.urandom(min(size, 1 << 20)) if size else b""
+    for i in range(count):
+        path = os.path.join(root, f"f{size}_{i}")
+        with open(path, "wb") as f:
+            written = 0
+            while written < size:
+                part = chunk[: size - written]
+                f.write(part)
+                written += len(part)
+        paths.append(path)
+    return paths
+
+
+def bench(label, func, paths, total_bytes, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            func(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    mb_s = total_bytes / (1024 * 1024) / best if best else float("inf")
+    print(f"  {label:<34} {best * 1000:9.1f} ms  {mb_s:9.1f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare file hashing strategies.")
+    parser.add_argument("--large-mb", type=int, default=256)
+    parser.add_argument("--medium-kb", type=int, default=512)
+    parser.add_argument("--medium-count", type=int, default=200)
+    parser.add_argument("--small-count", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    hashers = [
+        ("legacy 4 KiB loop (sha256)", legacy_hash_file),
+        ("readinto 1 MiB (sha256)", FileHasher("sha256", 1 << 20, None).hash_file),
+        ("readinto 1 MiB + mmap (sha256)", FileHasher("sha256", 1 << 20).hash_file),
+        ("readinto 1 MiB + mmap (blake2b)", FileHasher("blake2b", 1 << 20).hash_file),
+    ]
+
+    with tempfile.TemporaryDirectory() as root:
+        sets = [
+            (f"{args.small_count} x 2 KiB", make_files(root, args.small_count, 2048)),
+            (f"{args.medium_count} x {args.medium_kb} KiB", make_files(root, args.medium_count, args.medium_kb * 1024)),
+            (f"1 x {args.large_mb} MiB", make_files(root, 1, args.large_mb * 1024 * 1024)),
+        ]
+        for title, paths in sets:
+            total_bytes = sum(os.path.getsize(p) for p in paths)
+            print(title)
+            for label, func in hashers:
+                bench(label, func, paths, total_bytes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
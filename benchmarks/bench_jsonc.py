@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.jsonc import loads_jsonc  # noqa: E402
+
+
+def legacy_loads_jsonc(content):
+    # The regex stripper load_jsonc used before the tokenizer.
+    pattern = r"//.*?$|/\*.*?\*/|\'(?:\\.|[^\\\'])*\'|\"(?:\\.|[^\\\"])*\""
+    regex = re.compile(pattern, re.DOTALL | re.MULTILINE)
+
+    def replacer(match):
+        s = match.group(0)
+        if s.startswith("/"):
+            return ""
+        return s
+
+    return json.loads(regex.sub(replacer, content))
+
+
+def make_settings(count):
+    servers = {}
+    for i in range(count):
+        servers[f"server-{i}"] = {
+            "command": "npx",
+            "args": ["-y", f"@scope/mcp-server-{i}", "--url", f"https://example.com/{i}//api"],
+            "env": {"API_KEY": "k" * 40, "LOG_LEVEL": "info"},
+            "disabled": i % 7 == 0,
+            "timeout": 60,
+        }
+    return json.dumps({"mcpServers": servers}, indent=2, ensure_ascii=False)
+
+
+def add_comments(text):
+    text = text.replace('"disabled"', '// toggled by hand\n      "disabled"')
+    return text.replace('"timeout": 60', '/* seconds */ "timeout": 60')
+
+
+def bench(label, func, text, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            func(text)
+        except ValueError:
+            print(f"  {label:<28} rejected the document")
+            return
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    mb_s = len(text) / (1024 * 1024) / best if best else float("inf")
+    print(f"  {label:<28} {best * 1000:9.1f} ms  {mb_s:9.1f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSONC loading strategies.")
+    parser.add_argument("--servers", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    plain = make_settings(args.servers)
+    commented = add_comments(plain)
+    trailing = commented.replace('"timeout": 60', '"timeout": 60,')
+    documents = [
+        ("plain JSON", plain),
+        ("with comments", commented),
+        ("with comments + trailing commas", trailing),
+    ]
+    parsers = [
+        ("legacy regex + json.loads", legacy_loads_jsonc),
+        ("tokenizer", loads_jsonc),
+        ("json.loads (reference)", json.loads),
+    ]
+    for title, text in documents:
+        print(f"{title} ({len(text) / (1024 * 1024):.1f} MiB)")
+        for label, func in parsers:
+            bench(label, func, text, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,29 @@ import os
 
 from .paths import APP_CONFIG_FILE, PROJECT_ROOT
 
+DEFAULT_COMPARE_WORKERS = min(8, os.cpu_count() or 1)
+DEFAULT_IMPORT_WORKERS = 4
+DEFAULT_PROCESS_POOL_THRESHOLD_MB = 512
+DEFAULT_HASH_ALGORITHM = "sha256"
+DEFAULT_HASH_BLOCK_SIZE_KB = 1024
+DEFAULT_HASH_MMAP_THRESHOLD_MB = 64
+COMPARE_MODES = ("full", "quick")
+
 
 class AppConfig:
     def __init__(self):
         self.skills_dir = os.path.join(PROJECT_ROOT, "skills")
         self.mcp_settings_file = os.path.join(PROJECT_ROOT, "mcp", "settings.json")
+        self.compare_workers = DEFAULT_COMPARE_WORKERS
+        self.import_workers = DEFAULT_IMPORT_WORKERS
+        self.hash_process_pool = False
+        self.process_pool_threshold_mb = DEFAULT_PROCESS_POOL_THRESHOLD_MB
+        self.hash_algorithm = DEFAULT_HASH_ALGORITHM
+        self.hash_block_size_kb = DEFAULT_HASH_BLOCK_SIZE_KB
+        self.hash_mmap_threshold_mb = DEFAULT_HASH_MMAP_THRESHOLD_MB
+        self.compare_mode = "full"
+        self.skill_store_enabled = False
+        self.skill_store_dir = os.path.join(PROJECT_ROOT, "skill_store")
         self.load()
 
     def load(self):
@@ -17,11 +35,56 @@ class AppConfig:
                     data = json.load(f)
                     self.skills_dir = data.get("skills_dir", self.skills_dir)
                     self.mcp_settings_file = data.get("mcp_settings_file", self.mcp_settings_file)
+                    self.compare_workers = max(1, int(data.get("compare_workers", self.compare_workers)))
+                    self.import_workers = max(1, int(data.get("import_workers", self.import_workers)))
+                    self.hash_process_pool = bool(data.get("hash_process_pool", self.hash_process_pool))
+                    self.process_pool_threshold_mb = int(
+                        data.get("process_pool_threshold_mb", self.process_pool_threshold_mb)
+                    )
+                    self.hash_algorithm = data.get("hash_algorithm", self.hash_algorithm)
+                    self.hash_block_size_kb = int(data.get("hash_block_size_kb", self.hash_block_size_kb))
+                    self.hash_mmap_threshold_mb = int(
+                        data.get("hash_mmap_threshold_mb", self.hash_mmap_threshold_mb)
+                    )
+                    compare_mode = data.get("compare_mode", self.compare_mode)
+                    if compare_mode in COMPARE_MODES:
+                        self.compare_mode = compare_mode
+                    self.skill_store_enabled = bool(
+                        data.get("skill_store_enabled", self.skill_store_enabled)
+                    )
+                    self.skill_store_dir = data.get("skill_store_dir", self.skill_store_dir)
             except Exception:
                 pass
 
+    def process_pool_threshold(self):
+        if not self.hash_process_pool:
+            return None
+        return self.process_pool_threshold_mb * 1024 * 1024
+
+    def hash_block_size(self):
+        return self.hash_block_size_kb * 1024
+
+    def hash_mmap_threshold(self):
+        # 0 turns the mmap path off.
+        if self.hash_mmap_threshold_mb <= 0:
+            return None
+        return self.hash_mmap_threshold_mb * 1024 * 1024
+
     def save(self):
-        data = {"skills_dir": self.skills_dir, "mcp_settings_file": self.mcp_settings_file}
+        data = {
+            "skills_dir": self.skills_dir,
+            "mcp_settings_file": self.mcp_settings_file,
+            "compare_workers": self.compare_workers,
+            "import_workers": self.import_workers,
+            "hash_process_pool": self.hash_process_pool,
+            "process_pool_threshold_mb": self.process_pool_threshold_mb,
+            "hash_algorithm": self.hash_algorithm,
+            "hash_block_size_kb": self.hash_block_size_kb,
+            "hash_mmap_threshold_mb": self.hash_mmap_threshold_mb,
+            "compare_mode": self.compare_mode,
+            "skill_store_enabled": self.skill_store_enabled,
+            "skill_store_dir": self.skill_store_dir,
+        }
         with open(APP_CONFIG_FILE, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
 
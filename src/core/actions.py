@@ -1,9 +1,14 @@
 import json
 import os
-import shutil
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 
-from ..utils.fs import get_ignore_patterns
+from .plan import plan_import
+from .skill_manifest import write_skill_manifest
+from .sync import remove_tree, replace_skill_dir
+from ..utils.fs import scan_stats
+from ..utils.gitignore import get_ignore_matcher
 from ..utils.jsonc import load_jsonc
 
 
@@ -11,30 +16,118 @@ def delete_skill_dirs(target_dir, skill_names):
     errors = []
     for name in skill_names:
         try:
-            shutil.rmtree(os.path.join(target_dir, name))
+            remove_tree(os.path.join(target_dir, name))
         except Exception as e:
             errors.append((name, str(e)))
     return errors
 
 
-def import_skills_to_target(skills_dir, target_dir, selected_items):
-    errors = []
-    for item in selected_items:
-        skill = item.get("rel_path", item["name"])
-        src = os.path.join(skills_dir, skill)
-        dst = os.path.join(target_dir, os.path.basename(skill))
-        try:
-            if os.path.exists(dst):
-                shutil.rmtree(dst)
+# Returns the bytes written by a delta or planned sync, or None for a full copy.
+def _import_skill(src, dst, skill, hash_cache=None, store=None, delta=True, plan=None):
+    matcher = get_ignore_matcher(src)
+    source_stats = scan_stats(src, matcher)
 
-            ignore_func = None
-            patterns = get_ignore_patterns(src)
-            if patterns:
-                ignore_func = shutil.ignore_patterns(*patterns)
-
-            shutil.copytree(src, dst, ignore=ignore_func)
+    def finalize(new_dir, stats):
+        hashes = stats["hashes"] if stats is not None else None
+        try:
+            write_skill_manifest(src, new_dir, skill, matcher, hashes, source_stats)
         except Exception as e:
-            errors.append((skill, str(e)))
+            # The copy itself succeeded; without a sidecar the next compare
+            # simply hashes the target as well.
+            print(f"Error writing skill manifest for {skill}: {e}")
+
+    stats = replace_skill_dir(src, dst, matcher, hash_cache, store, delta, finalize, plan)
+    return stats["bytes"] if stats is not None else None
+
+
+# Yields ("start", skill_count, total_bytes), then per skill
+# ("skill_started", skill), ("skill_finished", skill, size, copied_bytes) or
+# ("error", skill, message, size), and finally ("done", errors). Sizes are the
+# planned bytes to write; a plan from plan_import() is executed as is,
+# otherwise one is made first. Skills that land in the same destination
+# directory are imported one after another, and all but the first of them are
+# re-planned because the earlier import changes what they are applied to.
+def iter_import_events(
+    skills_dir,
+    target_dir,
+    selected_items,
+    hash_cache=None,
+    store=None,
+    delta=True,
+    workers=1,
+    cancel=None,
+    plan=None,
+):
+    if plan is None:
+        plan = plan_import(skills_dir, target_dir, selected_items, hash_cache, delta, cancel)
+    batches = {}
+    for skill_plan in plan["skills"]:
+        batches.setdefault(os.path.basename(skill_plan["dst"]), []).append(skill_plan)
+
+    yield "start", len(plan["skills"]), plan["bytes"]
+
+    events = queue.Queue()
+
+    def run_batch(name):
+        try:
+            for index, skill_plan in enumerate(batches[name]):
+                if cancel is not None and cancel.cancelled:
+                    return
+                skill, size = skill_plan["skill"], skill_plan["bytes"]
+                events.put(("skill_started", skill))
+                if "error" in skill_plan:
+                    events.put(("error", skill, skill_plan["error"], size))
+                    continue
+                try:
+                    copied = _import_skill(
+                        skill_plan["src"],
+                        skill_plan["dst"],
+                        skill,
+                        hash_cache,
+                        store,
+                        delta,
+                        skill_plan if index == 0 else None,
+                    )
+                except Exception as e:
+                    events.put(("error", skill, str(e), size))
+                    continue
+                events.put(("skill_finished", skill, size, size if copied is None else copied))
+        finally:
+            events.put(None)
+
+    errors = []
+    with ThreadPoolExecutor(max_workers=max(1, workers or 1)) as executor:
+        for name in batches:
+            executor.submit(run_batch, name)
+        remaining = len(batches)
+        while remaining:
+            event = events.get()
+            if event is None:
+                remaining -= 1
+                continue
+            if event[0] == "error":
+                errors.append((event[1], event[2]))
+            yield event
+
+    yield "done", errors
+
+
+def import_skills_to_target(
+    skills_dir,
+    target_dir,
+    selected_items,
+    hash_cache=None,
+    store=None,
+    delta=True,
+    workers=1,
+    plan=None,
+):
+    errors = []
+    for event in iter_import_events(
+        skills_dir, target_dir, selected_items, hash_cache, store, delta, workers, plan=plan
+    ):
+        if event[0] == "done":
+            errors = event[1]
     return errors
 
 
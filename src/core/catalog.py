@@ -0,0 +1,107 @@
+import json
+import os
+import threading
+import time
+
+from ..paths import CATALOG_FILE
+from ..utils.cache_file import write_cache_file
+from ..utils.hash_cache import RACY_WINDOW_NS, root_key
+
+CATALOG_VERSION = 1
+MAX_ROOTS = 10
+SKIPPED_DIRS = {".git"}
+
+
+def _scan_dir(path):
+    is_skill = False
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir():
+                    if not entry.is_symlink() and entry.name not in SKIPPED_DIRS:
+                        subdirs.append(entry.name)
+                elif entry.name == "SKILL.md":
+                    is_skill = True
+            except OSError:
+                continue
+    return is_skill, ([] if is_skill else sorted(subdirs))
+
+
+def discover_skills(skills_dir, old_dirs=None):
+    old_dirs = old_dirs or {}
+    new_dirs = {}
+    skills = []
+    now_ns = time.time_ns()
+    stack = [""]
+    while stack:
+        rel_dir = stack.pop()
+        path = os.path.join(skills_dir, rel_dir) if rel_dir else skills_dir
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+
+        rec = old_dirs.get(rel_dir)
+        if rec and rec.get("mtime") is not None and rec["mtime"] == mtime:
+            is_skill, subdirs = rec["skill"], rec["subdirs"]
+        else:
+            try:
+                is_skill, subdirs = _scan_dir(path)
+            except OSError:
+                continue
+
+        # Entries added within the mtime granularity window may not bump the
+        # directory mtime again, so such directories are rescanned next time.
+        trusted = now_ns - mtime >= RACY_WINDOW_NS
+        new_dirs[rel_dir] = {
+            "mtime": mtime if trusted else None,
+            "skill": is_skill,
+            "subdirs": subdirs,
+        }
+
+        if is_skill:
+            skills.append(rel_dir or ".")
+            continue
+        for name in subdirs:
+            stack.append(f"{rel_dir}/{name}" if rel_dir else name)
+
+    return sorted(skills), new_dirs
+
+
+class SkillCatalog:
+    def __init__(self, catalog_file=None):
+        self.catalog_file = catalog_file or CATALOG_FILE
+        self.roots = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.catalog_file):
+            return
+        try:
+            with open(self.catalog_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CATALOG_VERSION:
+                self.roots = data.get("roots", {})
+        except Exception:
+            self.roots = {}
+
+    def discover(self, skills_dir):
+        key = root_key(skills_dir)
+        with self._lock:
+            old_dirs = (self.roots.get(key) or {}).get("dirs", {})
+
+        skills, new_dirs = discover_skills(skills_dir, old_dirs)
+
+        with self._lock:
+            self.roots[key] = {"time": time.time(), "dirs": new_dirs}
+        return skills
+
+    def save(self):
+        with self._lock:
+            recent = sorted(self.roots.items(), key=lambda kv: kv[1].get("time", 0), reverse=True)
+            self.roots = dict(recent[:MAX_ROOTS])
+            payload = json.dumps({"version": CATALOG_VERSION, "roots": self.roots})
+
+        write_cache_file(self.catalog_file, payload)
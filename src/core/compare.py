@@ -1,9 +1,23 @@
 import os
-import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
-from ..utils.fs import calculate_dir_hash, get_ignore_patterns
+from .catalog import discover_skills
+from .group_signatures import group_signature
+from .skill_manifest import imported_from_source, verified_manifest_digest
+from ..utils.fs import (
+    calculate_dir_hash,
+    get_hasher,
+    hash_dir_detached,
+    manifest_from_stats,
+    scan_stats,
+)
+from ..utils.gitignore import get_ignore_matcher
 from ..utils.jsonc import load_jsonc
 
+STATUS_CHECKING = "⏳ 检查中"
+COMPARE_FULL = "full"
+COMPARE_QUICK = "quick"
+
 
 def collect_target_skill_dirs(target_dir):
     if not os.path.exists(target_dir):
@@ -12,72 +26,332 @@ def collect_target_skill_dirs(target_dir):
         return [
             i
             for i in os.listdir(target_dir)
-            if os.path.isdir(os.path.join(target_dir, i))
+            if not i.startswith(".") and os.path.isdir(os.path.join(target_dir, i))
         ]
     except Exception:
         return []
 
 
-def collect_source_skill_rel_paths(skills_dir):
+def collect_source_skill_rel_paths(skills_dir, catalog=None):
     if not os.path.exists(skills_dir):
         return []
-    source_skills = []
-    for root, dirs, files in os.walk(skills_dir):
-        if "SKILL.md" in files:
-            rel_path = os.path.relpath(root, skills_dir).replace("\\", "/")
-            source_skills.append(rel_path)
-    return source_skills
+    if catalog is not None:
+        return catalog.discover(skills_dir)
+    return discover_skills(skills_dir)[0]
+
+
+def _make_skill_row(skills_dir, target_dir, skill_rel_path):
+    s_path = os.path.join(skills_dir, skill_rel_path)
+    t_path = os.path.join(target_dir, os.path.basename(skill_rel_path))
+
+    parts = skill_rel_path.split("/")
+    if len(parts) > 1:
+        group_name = "/".join(parts[:-1])
+        display_name = parts[-1]
+    else:
+        group_name = None
+        display_name = parts[0]
+
+    return {
+        "name": display_name,
+        "rel_path": skill_rel_path,
+        "status": "🆕 新增",
+        "is_diff": False,
+        "s_path": s_path,
+        "t_path": t_path,
+        "group": group_name,
+        "verified": True,
+    }
+
+
+RESULT_SAME = ("✅ 一致", False)
+RESULT_DIFF = ("⚠️ 差异", True)
+
+
+# Returns (matcher, s_manifest, t_manifest, t_digest). t_digest comes from the
+# import sidecar when every target file still has the size and mtime recorded
+# at import time, so only the source side needs hashing.
+def _skill_manifests(s_path, t_path, cancel=None):
+    matcher = get_ignore_matcher(s_path)
+    s_manifest = manifest_from_stats(scan_stats(s_path, matcher, cancel))
+    t_stats = scan_stats(t_path, matcher, cancel)
+    t_manifest = manifest_from_stats(t_stats)
+    t_digest = None
+    if s_manifest == t_manifest:
+        t_digest = verified_manifest_digest(t_path, t_stats)
+    return matcher, s_manifest, t_manifest, t_digest
+
+
+# Returns (result, source digest); the digest is None when no hashing was
+# needed to decide.
+def _compare_skill(s_path, t_path, hash_cache=None, cancel=None):
+    if not os.path.exists(t_path):
+        return ("🆕 新增", False), None
+
+    matcher, s_manifest, t_manifest, t_digest = _skill_manifests(s_path, t_path, cancel)
+    if s_manifest != t_manifest:
+        return RESULT_DIFF, None
+
+    s_hash = calculate_dir_hash(s_path, matcher, hash_cache, cancel)
+    if t_digest is None:
+        t_digest = calculate_dir_hash(t_path, matcher, hash_cache, cancel)
+    if s_hash == t_digest:
+        return RESULT_SAME, s_hash
+    return RESULT_DIFF, s_hash
+
+
+def compare_skill_dirs(s_path, t_path, hash_cache=None, cancel=None):
+    return _compare_skill(s_path, t_path, hash_cache, cancel)[0]
+
+
+# Decides from the file set, sizes and mtimes alone without reading content.
+# Copies made by import keep the source mtimes, and the import sidecar vouches
+# for copies that could not (store hardlinks), so an untouched copy matches;
+# anything else is reported as different until verified.
+def quick_compare_skill_dirs(s_path, t_path, cancel=None):
+    if not os.path.exists(t_path):
+        return "🆕 新增", False
+    matcher = get_ignore_matcher(s_path)
+    s_stats = scan_stats(s_path, matcher, cancel)
+    t_stats = scan_stats(t_path, matcher, cancel)
+    if s_stats == t_stats or imported_from_source(t_path, s_stats, t_stats):
+        return RESULT_SAME
+    return RESULT_DIFF
+
+
+def _iter_completed(func, items, workers, cancel):
+    if workers and workers > 1 and len(items) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(func, item): item for item in items}
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+    else:
+        for item in items:
+            if cancel is not None:
+                cancel.check()
+            yield item, func(item)
+
+
+def _iter_process_pool_results(right_rows, pending, hash_cache, workers, threshold, cancel):
+    manifests = {}
+    to_hash = []
+    total_bytes = 0
+
+    def manifest_row(index):
+        row = right_rows[index]
+        return _skill_manifests(row["s_path"], row["t_path"], cancel)
+
+    for index, (matcher, s_manifest, t_manifest, t_digest) in _iter_completed(
+        manifest_row, pending, workers, cancel
+    ):
+        if s_manifest != t_manifest:
+            yield index, (RESULT_DIFF, None)
+            continue
+        manifests[index] = (matcher, t_digest)
+        to_hash.append(index)
+        sides = 1 if t_digest is not None else 2
+        total_bytes += sides * sum(max(size, 0) for _, size in s_manifest or [])
+
+    if total_bytes < threshold:
+        def hash_row(index):
+            row = right_rows[index]
+            matcher, t_hash = manifests[index]
+            s_hash = calculate_dir_hash(row["s_path"], matcher, hash_cache, cancel)
+            if t_hash is None:
+                t_hash = calculate_dir_hash(row["t_path"], matcher, hash_cache, cancel)
+            return (RESULT_SAME if s_hash == t_hash else RESULT_DIFF), s_hash
 
+        yield from _iter_completed(hash_row, to_hash, workers, cancel)
+        return
 
-def build_skills_right_rows(skills_dir, target_dir):
+    digests = {}
+    hasher = get_hasher()
+    with ProcessPoolExecutor(max_workers=workers or None) as executor:
+        futures = {}
+        for index in sorted(to_hash):
+            row = right_rows[index]
+            matcher, t_digest = manifests[index]
+            digests[index] = {}
+            if t_digest is not None:
+                digests[index]["t_path"] = t_digest
+            for side in ("s_path", "t_path"):
+                if side in digests[index]:
+                    continue
+                path = row[side]
+                known = hash_cache.known_files(path, hasher.algorithm) if hash_cache else {}
+                future = executor.submit(hash_dir_detached, path, matcher, known, hasher)
+                futures[future] = (index, side, path, known)
+        try:
+            for future in as_completed(futures):
+                if cancel is not None:
+                    cancel.check()
+                index, side, path, known = futures[future]
+                digest, seen = future.result()
+                if hash_cache is not None:
+                    hash_cache.merge_root(path, known, seen, hasher.algorithm)
+                digests[index][side] = digest
+                if len(digests[index]) == 2:
+                    result = digests.pop(index)
+                    same = result["s_path"] == result["t_path"]
+                    yield index, (RESULT_SAME if same else RESULT_DIFF, result["s_path"])
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+# Yields ("rows", rows) and then ("update", index, row) as each row is
+# compared, or ("error", message). With group_signatures, a group whose files still have the stat
+# signature it had when last confirmed identical is marked the same without
+# comparing; groups that fully compare as the same are recorded there.
+def iter_skills_right_rows(
+    skills_dir,
+    target_dir,
+    hash_cache=None,
+    workers=1,
+    catalog=None,
+    cancel=None,
+    process_pool_threshold=None,
+    scheduler=None,
+    group_signatures=None,
+    mode=COMPARE_FULL,
+):
     if not os.path.exists(skills_dir):
-        return None, "源目录不存在，请在设置中配置"
+        yield "error", "源目录不存在，请在设置中配置"
+        return
 
-    right_rows = []
-    source_skills = collect_source_skill_rel_paths(skills_dir)
+    source_skills = collect_source_skill_rel_paths(skills_dir, catalog)
+    right_rows = [
+        _make_skill_row(skills_dir, target_dir, skill_rel_path)
+        for skill_rel_path in sorted(source_skills)
+    ]
+    quick = mode == COMPARE_QUICK
+    pending = []
+    for index, row in enumerate(right_rows):
+        if os.path.exists(row["t_path"]):
+            row["status"] = STATUS_CHECKING
+            row["verified"] = not quick
+            pending.append(index)
 
-    for skill_rel_path in sorted(source_skills):
-        s_path = os.path.join(skills_dir, skill_rel_path)
-        t_path = os.path.join(target_dir, os.path.basename(skill_rel_path))
+    yield "rows", right_rows
 
-        parts = skill_rel_path.split("/")
-        if len(parts) > 1:
-            group_name = "/".join(parts[:-1])
-            display_name = parts[-1]
+    group_pending = {}
+    if group_signatures is not None and not quick:
+        group_sizes = {}
+        for row in right_rows:
+            if row["group"]:
+                group_sizes[row["group"]] = group_sizes.get(row["group"], 0) + 1
+        for index in pending:
+            group = right_rows[index]["group"]
+            if group:
+                group_pending.setdefault(group, []).append(index)
+        # Only groups whose every skill already exists in the target can be
+        # confirmed as a whole.
+        group_pending = {
+            group: indices
+            for group, indices in group_pending.items()
+            if len(indices) == group_sizes[group]
+        }
+
+    def sign_group(group):
+        return group_signature([right_rows[i] for i in group_pending[group]], cancel)
+
+    unconfirmed = {}
+    for group, signature in _iter_completed(sign_group, sorted(group_pending), workers, cancel):
+        if signature is None:
+            continue
+        entry = group_signatures.get(skills_dir, target_dir, group)
+        if entry and entry.get("signature") == signature:
+            confirmed = set(group_pending[group])
+            pending = [index for index in pending if index not in confirmed]
+            for index in group_pending[group]:
+                row = right_rows[index]
+                row["status"], row["is_diff"] = RESULT_SAME
+                yield "update", index, row
         else:
-            group_name = None
-            display_name = parts[0]
+            unconfirmed[group] = (signature, set())
 
-        in_target = os.path.exists(t_path)
+    def compare_row(index):
+        row = right_rows[index]
+        if quick:
+            return quick_compare_skill_dirs(row["s_path"], row["t_path"], cancel), None
+        return _compare_skill(row["s_path"], row["t_path"], hash_cache, cancel)
 
-        status = "🆕 新增"
-        is_diff = False
+    if process_pool_threshold is not None and len(pending) > 1 and not quick:
+        results = _iter_process_pool_results(
+            right_rows, pending, hash_cache, workers, process_pool_threshold, cancel
+        )
+    elif scheduler is not None:
+        results = scheduler.run(
+            compare_row, pending, workers, cancel, key=lambda index: right_rows[index]["rel_path"]
+        )
+    else:
+        results = _iter_completed(compare_row, pending, workers, cancel)
 
-        if in_target:
-            patterns = get_ignore_patterns(s_path)
-            ignore_func = shutil.ignore_patterns(*patterns) if patterns else None
+    for index, (result, _) in results:
+        row = right_rows[index]
+        row["status"], row["is_diff"] = result
+        yield "update", index, row
 
-            if calculate_dir_hash(s_path, ignore_func) == calculate_dir_hash(t_path, ignore_func):
-                status = "✅ 一致"
-            else:
-                status = "⚠️ 差异"
-                is_diff = True
+        group = row["group"]
+        if group not in unconfirmed:
+            continue
+        signature, confirmed = unconfirmed[group]
+        if result != RESULT_SAME:
+            del unconfirmed[group]
+            group_signatures.discard(skills_dir, target_dir, group)
+            continue
+        confirmed.add(row["rel_path"])
+        if len(confirmed) == len(group_pending[group]):
+            group_signatures.put(skills_dir, target_dir, group, signature)
 
-        right_rows.append(
-            {
-                "name": display_name,
-                "rel_path": skill_rel_path,
-                "status": status,
-                "is_diff": is_diff,
-                "s_path": s_path,
-                "t_path": t_path,
-                "group": group_name,
-            }
-        )
 
+def build_skills_right_rows(
+    skills_dir,
+    target_dir,
+    hash_cache=None,
+    workers=1,
+    catalog=None,
+    cancel=None,
+    process_pool_threshold=None,
+    group_signatures=None,
+    mode=COMPARE_FULL,
+):
+    right_rows = None
+    events = iter_skills_right_rows(
+        skills_dir,
+        target_dir,
+        hash_cache,
+        workers,
+        catalog,
+        cancel,
+        process_pool_threshold,
+        group_signatures=group_signatures,
+        mode=mode,
+    )
+    for event in events:
+        if event[0] == "error":
+            return None, event[1]
+        if event[0] == "rows":
+            right_rows = event[1]
     return right_rows, None
 
 
+# Full content comparison for rows a quick refresh only checked by stat.
+def iter_verified_rows(rows, hash_cache=None, workers=1, cancel=None):
+    def verify(row):
+        return compare_skill_dirs(row["s_path"], row["t_path"], hash_cache, cancel)
+
+    for row, result in _iter_completed(verify, list(rows), workers, cancel):
+        row = dict(row)
+        row["status"], row["is_diff"] = result
+        row["verified"] = True
+        yield row
+
+
 def read_mcp_current_data(target_file):
     if not os.path.exists(target_file):
         return {}, []
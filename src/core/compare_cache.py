@@ -0,0 +1,54 @@
+import json
+import os
+import threading
+import time
+
+from ..paths import COMPARE_CACHE_FILE
+from ..utils.cache_file import pair_key, write_cache_file
+
+COMPARE_CACHE_VERSION = 1
+MAX_PAIRS = 20
+ROW_FIELDS = ("name", "rel_path", "status", "is_diff", "s_path", "t_path", "group", "verified")
+
+
+# Last finished compare result for each (source repo, target dir) pair, so a
+# reopened project can be drawn immediately and revalidated in the background.
+class CompareCache:
+    def __init__(self, cache_file=None):
+        self.cache_file = cache_file or COMPARE_CACHE_FILE
+        self.pairs = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == COMPARE_CACHE_VERSION:
+                self.pairs = data.get("pairs", {})
+        except Exception:
+            self.pairs = {}
+
+    def get(self, skills_dir, target_dir):
+        with self._lock:
+            entry = self.pairs.get(pair_key(skills_dir, target_dir))
+        if not entry:
+            return None
+        return [dict(row) for row in entry.get("rows", [])]
+
+    def put(self, skills_dir, target_dir, rows):
+        stored = [{field: row.get(field) for field in ROW_FIELDS} for row in rows]
+        with self._lock:
+            self.pairs[pair_key(skills_dir, target_dir)] = {"time": time.time(), "rows": stored}
+
+    def save(self):
+        with self._lock:
+            recent = sorted(self.pairs.items(), key=lambda kv: kv[1].get("time", 0), reverse=True)
+            self.pairs = dict(recent[:MAX_PAIRS])
+            payload = json.dumps(
+                {"version": COMPARE_CACHE_VERSION, "pairs": self.pairs}, ensure_ascii=False
+            )
+
+        write_cache_file(self.cache_file, payload)
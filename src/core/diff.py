@@ -1,7 +1,7 @@
 import os
-import shutil
 
-from ..utils.fs import get_ignore_patterns
+from ..utils.fs import build_hash_tree
+from ..utils.gitignore import GitIgnoreMatcher, get_ignore_matcher
 
 
 def files_are_different(path_a, path_b):
@@ -12,41 +12,52 @@ def files_are_different(path_a, path_b):
         return True
 
 
-def _walk_with_ignore(path, ignore_func):
-    for root, dirs, files in os.walk(path):
-        if ignore_func:
-            ignored = ignore_func(root, dirs + files)
-            dirs[:] = [d for d in dirs if d not in ignored]
-            files[:] = [f for f in files if f not in ignored]
-        yield root, dirs, files
-
-
-def collect_diff_files(source_path, target_path, ignore_patterns=None):
+def _collect_tree_files(node, rel_path, status, diff_files):
+    if "children" not in node:
+        diff_files.append((rel_path, status))
+        return
+    for name, child in node["children"].items():
+        _collect_tree_files(child, os.path.join(rel_path, name), status, diff_files)
+
+
+def _diff_trees(s_node, t_node, prefix, diff_files):
+    if s_node["digest"] is not None and s_node["digest"] == t_node["digest"]:
+        return
+
+    s_children = s_node["children"]
+    t_children = t_node["children"]
+    for name, s_child in s_children.items():
+        rel_path = os.path.join(prefix, name) if prefix else name
+        t_child = t_children.get(name)
+        s_is_dir = "children" in s_child
+        if t_child is None:
+            _collect_tree_files(s_child, rel_path, "New", diff_files)
+        elif s_is_dir != ("children" in t_child):
+            _collect_tree_files(s_child, rel_path, "New", diff_files)
+            _collect_tree_files(t_child, rel_path, "Deleted", diff_files)
+        elif s_is_dir:
+            _diff_trees(s_child, t_child, rel_path, diff_files)
+        elif s_child["digest"] is None or s_child["digest"] != t_child["digest"]:
+            diff_files.append((rel_path, "Modified"))
+
+    for name, t_child in t_children.items():
+        if name not in s_children:
+            rel_path = os.path.join(prefix, name) if prefix else name
+            _collect_tree_files(t_child, rel_path, "Deleted", diff_files)
+
+
+def collect_diff_files(source_path, target_path, ignore_patterns=None, hash_cache=None):
     diff_files = []
 
-    patterns = ignore_patterns
-    if patterns is None:
-        patterns = get_ignore_patterns(source_path)
-
-    ignore_func = shutil.ignore_patterns(*patterns) if patterns else None
+    if ignore_patterns is None:
+        matcher = get_ignore_matcher(source_path)
+    else:
+        matcher = GitIgnoreMatcher(ignore_patterns)
 
-    for root, _, files in _walk_with_ignore(source_path, ignore_func):
-        for filename in files:
-            rel_path = os.path.relpath(os.path.join(root, filename), source_path)
-            tgt_f = os.path.join(target_path, rel_path)
-            src_f = os.path.join(source_path, rel_path)
-
-            if not os.path.exists(tgt_f):
-                diff_files.append((rel_path, "New"))
-            elif files_are_different(src_f, tgt_f):
-                diff_files.append((rel_path, "Modified"))
-
-    for root, _, files in _walk_with_ignore(target_path, ignore_func):
-        for filename in files:
-            rel_path = os.path.relpath(os.path.join(root, filename), target_path)
-            if not os.path.exists(os.path.join(source_path, rel_path)):
-                diff_files.append((rel_path, "Deleted"))
+    empty = {"digest": None, "children": {}}
+    s_tree = build_hash_tree(source_path, matcher, hash_cache) or empty
+    t_tree = build_hash_tree(target_path, matcher, hash_cache) or empty
+    _diff_trees(s_tree, t_tree, "", diff_files)
 
     diff_files.sort(key=lambda x: x[0])
     return diff_files
-
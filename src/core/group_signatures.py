@@ -0,0 +1,103 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from ..paths import GROUP_SIGNATURES_FILE
+from ..utils.cache_file import pair_key, write_cache_file
+from ..utils.fs import get_hasher
+from ..utils.gitignore import get_ignore_matcher
+from ..utils.hash_cache import RACY_WINDOW_NS, entry_stat_key
+from ..utils.walk import walk_tree
+
+GROUP_SIGNATURES_VERSION = 1
+MAX_PAIRS = 20
+
+
+# Stat-only fingerprint of every source and target file in a group, keyed
+# like the hash cache so that a replace with the same size and mtime still
+# changes it. Returns
+# None when a side is missing or something was modified too recently for its
+# mtime to be trusted.
+def group_signature(rows, cancel=None):
+    now = time.time_ns()
+    sha1 = hashlib.sha1()
+    for row in sorted(rows, key=lambda r: r["rel_path"]):
+        matcher = get_ignore_matcher(row["s_path"])
+        for side in ("s_path", "t_path"):
+            if not os.path.isdir(row[side]):
+                return None
+            sha1.update(f"{row['rel_path']}\0{side}\n".encode("utf-8"))
+            entries = []
+            for rel_path, entry, is_dir in walk_tree(row[side], matcher):
+                if cancel is not None:
+                    cancel.check()
+                if is_dir:
+                    entries.append(f"{rel_path}/\n")
+                    continue
+                try:
+                    size, mtime_ns, ino = entry_stat_key(entry)
+                except OSError:
+                    return None
+                if now - mtime_ns < RACY_WINDOW_NS:
+                    return None
+                entries.append(f"{rel_path}\0{size}:{mtime_ns}:{ino}\n")
+            for line in sorted(entries):
+                sha1.update(line.encode("utf-8"))
+    return sha1.hexdigest()
+
+
+# Per (source repo, target dir) pair, the groups last confirmed identical:
+# group -> {"signature", "algorithm", "time"}. A group is trusted again only
+# while its stat signature is unchanged.
+class GroupSignatureCache:
+    def __init__(self, cache_file=None):
+        self.cache_file = cache_file or GROUP_SIGNATURES_FILE
+        self.pairs = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == GROUP_SIGNATURES_VERSION:
+                self.pairs = data.get("pairs", {})
+        except Exception:
+            self.pairs = {}
+
+    def get(self, skills_dir, target_dir, group):
+        with self._lock:
+            groups = (self.pairs.get(pair_key(skills_dir, target_dir)) or {}).get("groups", {})
+            entry = groups.get(group)
+        if entry and entry.get("algorithm") != get_hasher().algorithm:
+            return None
+        return entry
+
+    def put(self, skills_dir, target_dir, group, signature):
+        now = time.time()
+        with self._lock:
+            pair = self.pairs.setdefault(pair_key(skills_dir, target_dir), {"groups": {}})
+            pair["time"] = now
+            pair["groups"][group] = {
+                "signature": signature,
+                "algorithm": get_hasher().algorithm,
+                "time": now,
+            }
+
+    def discard(self, skills_dir, target_dir, group):
+        with self._lock:
+            pair = self.pairs.get(pair_key(skills_dir, target_dir))
+            if pair:
+                pair["groups"].pop(group, None)
+
+    def save(self):
+        with self._lock:
+            recent = sorted(self.pairs.items(), key=lambda kv: kv[1].get("time", 0), reverse=True)
+            self.pairs = dict(recent[:MAX_PAIRS])
+            payload = json.dumps({"version": GROUP_SIGNATURES_VERSION, "pairs": self.pairs})
+
+        write_cache_file(self.cache_file, payload)
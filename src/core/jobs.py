@@ -0,0 +1,50 @@
+import threading
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise JobCancelled()
+
+
+class RefreshJobs:
+    def __init__(self):
+        self.generation = 0
+        self._token = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._token is not None:
+                self._token.cancel()
+            self.generation += 1
+            self._token = CancelToken()
+            return self.generation, self._token
+
+    def current(self):
+        with self._lock:
+            return self.generation, self._token
+
+    def cancel(self):
+        with self._lock:
+            if self._token is not None:
+                self._token.cancel()
+                self._token = None
+
+    def is_current(self, generation):
+        with self._lock:
+            return generation == self.generation and self._token is not None
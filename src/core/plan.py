@@ -0,0 +1,156 @@
+import os
+
+from .skill_manifest import read_skill_manifest
+from ..utils.fs import build_hash_tree, can_hardlink, get_hasher, scan_stats
+from ..utils.gitignore import get_ignore_matcher
+from ..utils.hash_cache import entry_stat_key
+from ..utils.walk import walk_tree
+
+DEFAULT_COPY_RATE = 80 * 1024 * 1024
+PER_FILE_SECONDS = 0.002
+
+
+def _flatten(tree, prefix="", files=None, dirs=None):
+    files = {} if files is None else files
+    dirs = set() if dirs is None else dirs
+    for name, child in tree["children"].items():
+        rel_path = prefix + name
+        if "children" in child:
+            dirs.add(rel_path)
+            _flatten(child, rel_path + "/", files, dirs)
+        else:
+            files[rel_path] = [child.get("size", -1), child["digest"]]
+    return files, dirs
+
+
+def _sidecar_files(dst, algorithm):
+    manifest = read_skill_manifest(dst)
+    if not manifest or manifest.get("algorithm", "sha256") != algorithm:
+        return {}
+    return manifest.get("files", {})
+
+
+def _target_digest(entry, rel_path, sidecar, hashes):
+    st = entry.stat()
+    recorded = sidecar.get(rel_path)
+    if recorded and recorded[0] == st.st_size and recorded[1] == st.st_mtime_ns:
+        return recorded[2]
+    digest = hashes.lookup(rel_path, entry_stat_key(entry)) if hashes is not None else None
+    if digest is None:
+        digest = get_hasher().hash_file(entry.path)
+    return digest
+
+
+# Works out how dst has to change to become a copy of src (honouring
+# matcher). Source digests come from the hash cache the compare step filled
+# and target digests from the import sidecar or the same cache, so only files
+# neither has seen are read, and files whose size differs are never hashed.
+# "keep" maps reusable target files to the (size, mtime_ns) they were planned
+# with; "remove" lists the top-most target entries that go away. "links" is
+# False when the target volume cannot hardlink, in which case kept files are
+# copied too and count towards "bytes".
+def plan_skill(src, dst, matcher=None, hash_cache=None, delta=True, cancel=None):
+    s_tree = build_hash_tree(src, matcher, hash_cache, cancel)
+    if s_tree is None:
+        raise FileNotFoundError(src)
+    files, dirs = _flatten(s_tree)
+    plan = {
+        "src": src,
+        "dst": dst,
+        "files": files,
+        "dirs": sorted(dirs),
+        "add": [],
+        "replace": [],
+        "keep": {},
+        "remove": [],
+        "bytes": 0,
+        "links": True,
+    }
+
+    t_entries = {}
+    if os.path.isdir(dst):
+        for rel_path, entry, is_dir in walk_tree(dst, follow_symlinks=False):
+            if cancel is not None:
+                cancel.check()
+            t_entries[rel_path] = None if is_dir else entry
+
+    removed_dirs = []
+    for rel_path in sorted(t_entries):
+        if any(rel_path.startswith(d + "/") for d in removed_dirs):
+            continue
+        is_dir = t_entries[rel_path] is None
+        if (rel_path in dirs) if is_dir else (rel_path in files):
+            continue
+        plan["remove"].append(rel_path)
+        if is_dir:
+            removed_dirs.append(rel_path)
+
+    algorithm = get_hasher().algorithm
+    sidecar = _sidecar_files(dst, algorithm) if delta and t_entries else {}
+    hashes = hash_cache.open_root(dst, algorithm) if hash_cache and delta and t_entries else None
+    for rel_path, (size, digest) in sorted(files.items()):
+        if digest is None:
+            raise OSError(f"Unable to read {os.path.join(src, *rel_path.split('/'))}")
+        entry = t_entries.get(rel_path)
+        if entry is not None and delta:
+            try:
+                st = entry.stat()
+                if st.st_size == size and digest == _target_digest(entry, rel_path, sidecar, hashes):
+                    plan["keep"][rel_path] = [st.st_size, st.st_mtime_ns]
+                    continue
+            except OSError:
+                pass
+        plan["replace" if rel_path in t_entries else "add"].append(rel_path)
+        plan["bytes"] += max(size, 0)
+    if plan["keep"] and not can_hardlink(os.path.dirname(os.path.abspath(dst))):
+        plan["links"] = False
+        plan["bytes"] += sum(max(files[rel_path][0], 0) for rel_path in plan["keep"])
+    return plan
+
+
+def _totals(plan):
+    for key in ("add", "replace", "remove"):
+        plan[key] = sum(len(s.get(key, ())) for s in plan["skills"])
+    plan["bytes"] = sum(s.get("bytes", 0) for s in plan["skills"])
+    plan["links"] = all(s.get("links", True) for s in plan["skills"])
+    return plan
+
+
+# Plans an import of selected_items. A skill that cannot be planned carries
+# an "error" instead of operations so the import can report it in order.
+def plan_import(skills_dir, target_dir, selected_items, hash_cache=None, delta=True, cancel=None):
+    skills = []
+    for item in selected_items:
+        skill = item.get("rel_path", item["name"])
+        src = os.path.join(skills_dir, skill)
+        dst = os.path.join(target_dir, os.path.basename(skill))
+        try:
+            skill_plan = plan_skill(src, dst, get_ignore_matcher(src), hash_cache, delta, cancel)
+        except OSError as e:
+            skill_plan = {"src": src, "dst": dst, "error": str(e), "bytes": 0}
+        skill_plan["skill"] = skill
+        skills.append(skill_plan)
+    return _totals({"skills": skills})
+
+
+# Plans deleting whole skills from target_dir: every file goes, and "bytes"
+# is the space the reaper will give back.
+def plan_delete(target_dir, skill_names):
+    skills = []
+    for name in skill_names:
+        dst = os.path.join(target_dir, name)
+        stats = scan_stats(dst) or {}
+        skills.append(
+            {
+                "skill": name,
+                "dst": dst,
+                "remove": sorted(stats),
+                "bytes": sum(max(size, 0) for size, _ in stats.values()),
+            }
+        )
+    return _totals({"skills": skills})
+
+
+def estimate_seconds(plan, copy_rate=None):
+    rate = copy_rate or DEFAULT_COPY_RATE
+    return plan["bytes"] / rate + (plan["add"] + plan["replace"]) * PER_FILE_SECONDS
@@ -0,0 +1,99 @@
+import heapq
+import itertools
+import queue
+import threading
+
+PRIORITY_VISIBLE = 0
+PRIORITY_EXPANDED = 1
+PRIORITY_BACKGROUND = 2
+
+
+# Work queue whose order can be changed while it is being drained. Lower
+# priorities run first; items with equal priority keep submission order.
+# Priorities may be set for keys before their items are submitted.
+class PriorityScheduler:
+    def __init__(self, default_priority=PRIORITY_BACKGROUND):
+        self.default_priority = default_priority
+        self._lock = threading.Lock()
+        self._heap = []
+        self._pending = {}
+        self._priorities = {}
+        self._seq = itertools.count()
+        self._closed = False
+
+    def set_priorities(self, priorities):
+        with self._lock:
+            self._priorities.update(priorities)
+            for key, priority in priorities.items():
+                entry = self._pending.get(key)
+                if entry is not None and entry[1] != priority:
+                    # The old heap entry goes stale and is skipped on pop.
+                    self._pending[key] = (entry[0], priority)
+                    heapq.heappush(self._heap, (priority, next(self._seq), key))
+
+    def _push(self, key, item):
+        with self._lock:
+            priority = self._priorities.get(key, self.default_priority)
+            self._pending[key] = (item, priority)
+            heapq.heappush(self._heap, (priority, next(self._seq), key))
+
+    def _pop(self):
+        with self._lock:
+            while self._heap and not self._closed:
+                priority, _, key = heapq.heappop(self._heap)
+                entry = self._pending.get(key)
+                if entry is None or entry[1] != priority:
+                    continue
+                del self._pending[key]
+                return True, entry[0]
+            return False, None
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._heap = []
+            self._pending = {}
+
+    # Yields (item, func(item)) in completion order, always starting the most
+    # urgent pending item next.
+    def run(self, func, items, workers=1, cancel=None, key=None):
+        key = key or (lambda item: item)
+        items = list(items)
+        for item in items:
+            self._push(key(item), item)
+
+        if not workers or workers <= 1 or len(items) <= 1:
+            try:
+                while True:
+                    if cancel is not None:
+                        cancel.check()
+                    found, item = self._pop()
+                    if not found:
+                        return
+                    yield item, func(item)
+            finally:
+                self.close()
+
+        results = queue.Queue()
+
+        def worker():
+            while True:
+                found, item = self._pop()
+                if not found:
+                    return
+                try:
+                    results.put((item, func(item), None))
+                except BaseException as e:
+                    results.put((item, None, e))
+
+        for _ in range(min(workers, len(items))):
+            threading.Thread(target=worker, daemon=True).start()
+
+        try:
+            for _ in range(len(items)):
+                item, result, error = results.get()
+                if error is not None:
+                    raise error
+                yield item, result
+        finally:
+            self.close()
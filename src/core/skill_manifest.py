@@ -0,0 +1,107 @@
+import json
+import os
+import tempfile
+import time
+
+from ..utils.fs import file_digests, get_hasher, hash_tree_with, scan_stats
+from ..utils.walk import SKILL_MANIFEST_NAME
+
+MANIFEST_VERSION = 1
+
+
+# Records what was actually written to dst: digests come from hashing dst,
+# where hashes (apply_plan's) vouches for files already verified while
+# copying. source_stats should be taken before the copy: if src changes while
+# it is being copied, the recorded stats no longer match and quick compare
+# reports a difference instead of trusting the copy.
+def write_skill_manifest(src, dst, rel_path, matcher=None, hashes=None, source_stats=None):
+    tree = hash_tree_with(dst, matcher, hashes)
+    stats = scan_stats(dst, matcher)
+    if source_stats is None:
+        source_stats = scan_stats(src, matcher)
+    if tree is None or stats is None or source_stats is None:
+        return None
+
+    digests = file_digests(tree)
+    files = {}
+    for file_rel, (size, mtime_ns) in stats.items():
+        digest = digests.get(file_rel)
+        if digest is None or mtime_ns is None:
+            return None
+        files[file_rel] = [size, mtime_ns, digest]
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "rel_path": rel_path,
+        "algorithm": get_hasher().algorithm,
+        "digest": tree["digest"],
+        "imported_at": time.time(),
+        "files": files,
+        "source": {rel: [size, mtime_ns] for rel, (size, mtime_ns) in source_stats.items()},
+    }
+
+    fd, tmp_path = tempfile.mkstemp(prefix=".skill_manifest.", suffix=".tmp", dir=dst, text=True)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(dst, SKILL_MANIFEST_NAME))
+    finally:
+        try:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        except Exception:
+            pass
+    return manifest
+
+
+def read_skill_manifest(skill_dir):
+    try:
+        with open(os.path.join(skill_dir, SKILL_MANIFEST_NAME), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != MANIFEST_VERSION:
+            return None
+        return manifest
+    except Exception:
+        return None
+
+
+# Returns the sidecar when every file of skill_dir still has the size and
+# mtime recorded at import time.
+def _unchanged_manifest(skill_dir, stats):
+    if stats is None:
+        return None
+    manifest = read_skill_manifest(skill_dir)
+    if not manifest:
+        return None
+    files = manifest.get("files", {})
+    if len(files) != len(stats):
+        return None
+    for rel_path, (size, mtime_ns) in stats.items():
+        entry = files.get(rel_path)
+        if not entry or entry[0] != size or entry[1] != mtime_ns:
+            return None
+    return manifest
+
+
+def verified_manifest_digest(skill_dir, stats):
+    manifest = _unchanged_manifest(skill_dir, stats)
+    if not manifest or manifest.get("algorithm", "sha256") != get_hasher().algorithm:
+        return None
+    return manifest.get("digest")
+
+
+# True when skill_dir is untouched since it was imported from a source whose
+# files still have the recorded sizes and mtimes. This holds even where the
+# copy's own mtimes differ from the source, as with files hardlinked from the
+# skill store, whose times belong to the shared object.
+def imported_from_source(skill_dir, source_stats, stats):
+    manifest = _unchanged_manifest(skill_dir, stats)
+    if not manifest or source_stats is None:
+        return False
+    source = manifest.get("source")
+    if source is None or len(source) != len(source_stats):
+        return False
+    for rel_path, (size, mtime_ns) in source_stats.items():
+        if source.get(rel_path) != [size, mtime_ns]:
+            return False
+    return True
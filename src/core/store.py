@@ -0,0 +1,94 @@
+import os
+import stat
+import tempfile
+
+from ..utils.copy import clone_or_copy_file, reflink_file
+from ..utils.fs import build_hash_tree, file_digests, get_hasher
+from ..utils.walk import walk_tree
+
+LINK_HARDLINK = "hardlink"
+LINK_REFLINK = "reflink"
+LINK_COPY = "copy"
+
+
+# Content-addressed file store: objects/<2 hex>/<digest>. Project copies are
+# hardlinked to the objects, so the objects are kept read-only to stop an
+# in-place edit in one project from leaking into every other one.
+class SkillStore:
+    def __init__(self, root):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.tmp_dir = os.path.join(root, "tmp")
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def has(self, digest):
+        return os.path.isfile(self.object_path(digest))
+
+    def ingest(self, src, digest):
+        path = self.object_path(digest)
+        if os.path.isfile(path):
+            return path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix="obj.", dir=self.tmp_dir)
+        os.close(fd)
+        try:
+            clone_or_copy_file(src, tmp_path)
+            # The source may have changed since it was hashed; a wrong object
+            # would be linked into every project, so check the copy.
+            if get_hasher().hash_file(tmp_path) != digest:
+                raise OSError(f"File changed while importing: {src}")
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(tmp_path).st_mode) & ~0o222)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.chmod(tmp_path, stat.S_IWRITE | stat.S_IREAD)
+                os.remove(tmp_path)
+        return path
+
+    def link(self, digest, dst):
+        path = self.object_path(digest)
+        try:
+            os.link(path, dst)
+            return LINK_HARDLINK
+        except OSError:
+            pass
+        # Cross-volume or no hardlink support: an independent, writable copy.
+        try:
+            reflink_file(path, dst)
+            kind = LINK_REFLINK
+        except OSError:
+            clone_or_copy_file(path, dst)
+            kind = LINK_COPY
+        os.chmod(dst, stat.S_IMODE(os.stat(dst).st_mode) | stat.S_IWUSR)
+        return kind
+
+    def is_linked(self, path, digest):
+        # Identity by inode: a hardlinked file is the object, no hashing needed.
+        try:
+            return os.path.samestat(os.stat(path), os.stat(self.object_path(digest)))
+        except OSError:
+            return False
+
+    def materialize(self, src, dst, matcher=None, hash_cache=None):
+        tree = build_hash_tree(src, matcher, hash_cache)
+        if tree is None:
+            raise FileNotFoundError(src)
+        digests = file_digests(tree)
+
+        os.makedirs(dst)
+        kinds = {}
+        for rel_path, entry, is_dir in walk_tree(src, matcher):
+            target = os.path.join(dst, *rel_path.split("/"))
+            if is_dir:
+                os.makedirs(target, exist_ok=True)
+                continue
+            digest = digests.get(rel_path)
+            if digest is None:
+                raise OSError(f"Unable to read {entry.path}")
+            self.ingest(entry.path, digest)
+            kind = self.link(digest, target)
+            kinds[kind] = kinds.get(kind, 0) + 1
+        return kinds
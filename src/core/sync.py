@@ -0,0 +1,231 @@
+import ctypes
+import ctypes.util
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import threading
+
+from .plan import plan_skill
+from ..utils.copy import copy_file
+from ..utils.fs import get_hasher
+from ..utils.hash_cache import stat_key
+
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2
+STAGING_MARKER = ".staging-"
+
+_active_stages = set()
+_stages_lock = threading.Lock()
+
+
+def _clear_readonly_and_retry(func, path, exc_info):
+    # Files linked from the skill store are read-only, which Windows refuses
+    # to unlink.
+    os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+    func(path)
+
+
+def remove_tree(path):
+    shutil.rmtree(path, onerror=_clear_readonly_and_retry)
+
+
+def _link_or_copy(src_file, dst_file):
+    # Unchanged files are carried over from the old tree by hardlink, which
+    # costs no data copy; filesystems without hardlinks get a real copy.
+    # Returns whether the data had to be copied.
+    try:
+        os.link(src_file, dst_file)
+        return False
+    except OSError:
+        copy_file(src_file, dst_file)
+        return True
+
+
+def _load_renameat2():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        return libc.renameat2
+    except (OSError, AttributeError):
+        return None
+
+
+def _exchange(path_a, path_b):
+    renameat2 = _load_renameat2()
+    if renameat2 is None:
+        return False
+    result = renameat2(
+        AT_FDCWD, os.fsencode(path_a), AT_FDCWD, os.fsencode(path_b), RENAME_EXCHANGE
+    )
+    return result == 0
+
+
+def make_stage_dir(dst):
+    parent = os.path.dirname(os.path.abspath(dst))
+    stage = tempfile.mkdtemp(prefix=f".{os.path.basename(dst)}{STAGING_MARKER}", dir=parent)
+    with _stages_lock:
+        _active_stages.add(os.path.normcase(stage))
+    return stage
+
+
+def _release_stage(stage):
+    with _stages_lock:
+        _active_stages.discard(os.path.normcase(stage))
+
+
+# Removes staging directories left in target_dir by a session that ended
+# mid-import; stages still in use by this process are kept. If the crash
+# came between the two renames of a fallback swap, the old tree is moved
+# back to its skill first.
+def purge_stale_stages(target_dir):
+    try:
+        names = os.listdir(target_dir)
+    except OSError:
+        return
+    for name in names:
+        if not name.startswith(".") or STAGING_MARKER not in name:
+            continue
+        stage = os.path.join(target_dir, name)
+        with _stages_lock:
+            if os.path.normcase(stage) in _active_stages:
+                continue
+        dst = os.path.join(target_dir, name[1:].rsplit(STAGING_MARKER, 1)[0])
+        old_dir = os.path.join(stage, "old")
+        try:
+            if os.path.isdir(old_dir) and not os.path.lexists(dst):
+                os.rename(old_dir, dst)
+            remove_tree(stage)
+        except OSError as e:
+            print(f"Error removing staging directory {stage}: {e}")
+
+
+# Puts new_dir at dst. Where the kernel supports it the two trees are swapped
+# in one atomic rename; otherwise the old tree is moved aside into stage and
+# moved back if the second rename fails. The old tree ends up inside stage.
+def swap_into_place(new_dir, dst, stage):
+    if not os.path.lexists(dst):
+        os.rename(new_dir, dst)
+        return
+    if _exchange(new_dir, dst):
+        return
+    old_dir = os.path.join(stage, "old")
+    os.rename(dst, old_dir)
+    try:
+        os.rename(new_dir, dst)
+    except OSError:
+        os.rename(old_dir, dst)
+        raise
+
+
+# Builds out from a plan_skill() plan: kept files are carried over from the
+# planned dst, everything else comes from src. A kept file that changed after
+# planning is copied from src instead. Returns counts relative to dst, with
+# "bytes" covering every byte of file data written, kept files included, plus
+# "hashes": the digest of every file as written to out, keyed for
+# hash_tree_with(). Copies are hashed after copying, since src may change
+# under the copy; kept files and store objects are already verified.
+def apply_plan(plan, out, store=None):
+    src, base = plan["src"], plan["dst"]
+    stats = {"copied": 0, "deleted": len(plan["remove"]), "unchanged": 0, "bytes": 0}
+    hashes = stats["hashes"] = {}
+
+    os.makedirs(out)
+    for rel_dir in plan["dirs"]:
+        os.makedirs(os.path.join(out, *rel_dir.split("/")), exist_ok=True)
+
+    for rel_path, (size, digest) in sorted(plan["files"].items()):
+        src_file = os.path.join(src, *rel_path.split("/"))
+        out_file = os.path.join(out, *rel_path.split("/"))
+        kept = plan["keep"].get(rel_path)
+        if kept is not None:
+            base_file = os.path.join(base, *rel_path.split("/"))
+            try:
+                st = os.stat(base_file)
+                if [st.st_size, st.st_mtime_ns] == kept:
+                    written = 0
+                    if store is not None and store.is_linked(base_file, digest):
+                        # Shared by every project; its times are the store's.
+                        store.link(digest, out_file)
+                    elif st.st_nlink == 1 and st.st_mtime_ns == os.stat(src_file).st_mtime_ns:
+                        if _link_or_copy(base_file, out_file):
+                            written = st.st_size
+                    else:
+                        # Imported copies carry the source times, which quick
+                        # compare relies on. The inode may be shared with the
+                        # live tree or a store object, so its times and mode
+                        # are set on a private copy only.
+                        copy_file(base_file, out_file)
+                        shutil.copystat(src_file, out_file)
+                        written = st.st_size
+                    hashes[rel_path] = stat_key(os.stat(out_file)) + [digest]
+                    stats["unchanged"] += 1
+                    stats["bytes"] += written
+                    continue
+            except OSError:
+                # out_file may be a link to the live file; copying over it
+                # would write through to dst before the swap.
+                if os.path.lexists(out_file):
+                    os.remove(out_file)
+
+        if store is not None:
+            store.ingest(src_file, digest)
+            store.link(digest, out_file)
+        else:
+            copy_file(src_file, out_file)
+            digest = get_hasher().hash_file(out_file)
+        st = os.stat(out_file)
+        stats["copied"] += 1
+        stats["bytes"] += st.st_size
+        hashes[rel_path] = stat_key(st) + [digest]
+    return stats
+
+
+# Builds out as a copy of src (honouring matcher), reusing every file of the
+# existing tree at base whose digest already matches. Only new or modified
+# files are copied.
+def build_staged_copy(src, base, out, matcher=None, hash_cache=None, store=None):
+    return apply_plan(plan_skill(src, base, matcher, hash_cache), out, store)
+
+
+# Replaces dst with a fresh copy of src without ever exposing a missing or
+# half-written skill: the new tree is assembled in a sibling staging
+# directory, finalize(new_dir, stats) may add to it, and it is then swapped
+# in. With delta, unchanged files are reused from the current dst; a ready
+# plan is applied as is instead of comparing the trees again. Returns the
+# stats of the delta or planned build, or None for a full copy.
+def replace_skill_dir(
+    src, dst, matcher=None, hash_cache=None, store=None, delta=True, finalize=None, plan=None
+):
+    stage = make_stage_dir(dst)
+    try:
+        new_dir = os.path.join(stage, "new")
+        stats = None
+        if plan is not None:
+            stats = apply_plan(plan, new_dir, store)
+        elif delta and os.path.isdir(dst):
+            stats = build_staged_copy(src, dst, new_dir, matcher, hash_cache, store)
+        elif store is not None:
+            store.materialize(src, new_dir, matcher, hash_cache)
+        else:
+            ignore_func = matcher.copytree_ignore(src) if matcher else None
+            shutil.copytree(src, new_dir, ignore=ignore_func, copy_function=copy_file)
+        if finalize is not None:
+            finalize(new_dir, stats)
+        swap_into_place(new_dir, dst, stage)
+        return stats
+    finally:
+        try:
+            remove_tree(stage)
+        except OSError as e:
+            print(f"Error removing staging directory {stage}: {e}")
+        _release_stage(stage)
+
+
+# rsync-style update of dst from src: only new or modified files are copied,
+# and entries missing from src (including anything src ignores) are dropped,
+# so the result matches a fresh copy.
+def sync_skill_dir(src, dst, matcher=None, hash_cache=None, store=None):
+    return replace_skill_dir(src, dst, matcher, hash_cache, store, delta=True)
@@ -0,0 +1,116 @@
+import itertools
+import os
+import threading
+import time
+
+from .sync import remove_tree
+
+TRASH_DIR_NAME = ".skills-trash"
+REAP_DELAY_SECONDS = 30.0
+
+
+def trash_dir_for(target_dir):
+    return os.path.join(target_dir, TRASH_DIR_NAME)
+
+
+# Deletes skills by renaming them into a hidden trash directory inside the
+# same target directory, which is a metadata-only operation on one volume.
+# The space is reclaimed by a background timer; until it fires the batch can
+# be restored with undo().
+class SkillTrash:
+    def __init__(self, reap_delay=REAP_DELAY_SECONDS):
+        self.reap_delay = reap_delay
+        self._lock = threading.Lock()
+        self._batches = {}
+        self._ids = itertools.count(1)
+
+    def delete(self, target_dir, names):
+        trash_dir = trash_dir_for(target_dir)
+        moved = []
+        errors = []
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        for name in names:
+            src = os.path.join(target_dir, name)
+            try:
+                os.makedirs(trash_dir, exist_ok=True)
+                dst = os.path.join(trash_dir, f"{name}.{stamp}.{os.getpid()}.{next(self._ids)}")
+                os.rename(src, dst)
+                moved.append((src, dst))
+            except Exception as e:
+                errors.append((name, str(e)))
+
+        if not moved:
+            return None, errors
+        batch_id = next(self._ids)
+        timer = threading.Timer(self.reap_delay, self.reap, args=(batch_id,))
+        timer.daemon = True
+        with self._lock:
+            self._batches[batch_id] = (moved, timer)
+        timer.start()
+        return batch_id, errors
+
+    def undo(self, batch_id):
+        with self._lock:
+            batch = self._batches.pop(batch_id, None)
+        if batch is None:
+            return [("", "已无法撤销")]
+        moved, timer = batch
+        timer.cancel()
+        errors = []
+        for original, trashed in moved:
+            try:
+                if os.path.lexists(original):
+                    raise FileExistsError(f"{original} 已存在")
+                os.rename(trashed, original)
+            except Exception as e:
+                errors.append((os.path.basename(original), str(e)))
+        return errors
+
+    def reap(self, batch_id):
+        with self._lock:
+            batch = self._batches.pop(batch_id, None)
+        if batch is None:
+            return
+        moved, timer = batch
+        timer.cancel()
+        for _, trashed in moved:
+            try:
+                remove_tree(trashed)
+            except Exception as e:
+                print(f"Error reclaiming {trashed}: {e}")
+
+    def pending(self):
+        with self._lock:
+            return sorted(self._batches)
+
+    # Reclaims every pending batch right away; called when the app closes,
+    # since daemon timers die with it and would leave the trash behind.
+    def flush(self):
+        with self._lock:
+            for _, timer in self._batches.values():
+                timer.cancel()
+        for batch_id in self.pending():
+            self.reap(batch_id)
+
+    # Removes leftovers from earlier sessions that ended before their reaper
+    # ran; entries still waiting for undo in this session are kept.
+    def purge_stale(self, target_dir):
+        trash_dir = trash_dir_for(target_dir)
+        with self._lock:
+            keep = {
+                os.path.normcase(trashed)
+                for moved, _ in self._batches.values()
+                for _, trashed in moved
+            }
+        try:
+            names = os.listdir(trash_dir)
+        except OSError:
+            return
+        for name in names:
+            path = os.path.join(trash_dir, name)
+            if os.path.normcase(path) in keep:
+                continue
+            try:
+                remove_tree(path)
+            except Exception as e:
+                print(f"Error reclaiming {path}: {e}")
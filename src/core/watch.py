@@ -0,0 +1,279 @@
+import ctypes
+import ctypes.util
+import hashlib
+import os
+import select
+import struct
+import sys
+import threading
+
+from ..utils.gitignore import get_ignore_matcher
+from ..utils.walk import walk_tree
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+# O_NONBLOCK on Linux; os.O_NONBLOCK does not exist on Windows.
+IN_NONBLOCK = 0o4000
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+EVENT_HEADER = struct.Struct("iIII")
+DEBOUNCE_SECONDS = 0.3
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class InotifyBackend:
+    def __init__(self, roots):
+        self.libc = _load_libc()
+        if self.libc is None:
+            raise OSError("inotify is not available")
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.paths = {}
+        for root, recursive in roots:
+            self._add(root, recursive)
+
+    def _add(self, path, recursive):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            if not os.path.isdir(path):
+                return
+            self.close()
+            raise OSError(errno, f"inotify_add_watch failed: {path}")
+        self.paths[wd] = (path, recursive)
+        if recursive:
+            for rel_path, entry, is_dir in walk_tree(path, follow_symlinks=False):
+                if is_dir and not entry.is_symlink():
+                    self._add_single(entry.path)
+
+    def _add_single(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self.paths[wd] = (path, True)
+
+    def poll(self, timeout):
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed = set()
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + name_len].split(b"\0", 1)[0]
+            offset += name_len
+
+            if mask & IN_Q_OVERFLOW:
+                changed.update(path for path, _ in self.paths.values())
+                continue
+            watched = self.paths.get(wd)
+            if not watched:
+                continue
+            path, recursive = watched
+            full_path = os.path.join(path, os.fsdecode(name)) if name else path
+            changed.add(full_path)
+            if recursive and mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self._add(full_path, True)
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingBackend:
+    def __init__(self, roots, stop_event):
+        self.roots = roots
+        self.stop_event = stop_event
+        self.signatures = {root: self._signature(root, recursive) for root, recursive in roots}
+
+    def _signature(self, root, recursive):
+        if not recursive:
+            # Only the visible subdirectories count: the directory mtime also
+            # moves when staging and trash dirs come and go.
+            try:
+                with os.scandir(root) as it:
+                    names = sorted(e.name for e in it if not e.name.startswith(".") and e.is_dir())
+            except OSError:
+                return None
+            return hashlib.sha1("\0".join(names).encode("utf-8")).hexdigest()
+        try:
+            st = os.stat(root)
+        except OSError:
+            return None
+        sha1 = hashlib.sha1(f"{st.st_mtime_ns}".encode("ascii"))
+        for rel_path, entry, is_dir in walk_tree(root, get_ignore_matcher(root)):
+            try:
+                est = entry.stat()
+            except OSError:
+                continue
+            sha1.update(f"{rel_path}\0{is_dir}{est.st_size}:{est.st_mtime_ns}\n".encode("utf-8"))
+        return sha1.hexdigest()
+
+    def poll(self, timeout):
+        if self.stop_event.wait(timeout):
+            return set()
+        changed = set()
+        for root, recursive in self.roots:
+            signature = self._signature(root, recursive)
+            if signature != self.signatures.get(root):
+                self.signatures[root] = signature
+                changed.add(root)
+        return changed
+
+    def close(self):
+        pass
+
+
+class SkillsWatcher:
+    def __init__(self, skills_dir, target_dir, rows, on_change, interval=2.0, use_inotify=True):
+        self.skills_dir = skills_dir
+        self.target_dir = target_dir
+        self.on_change = on_change
+        self.interval = interval
+        self.use_inotify = use_inotify
+        self.backend_name = None
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.skill_roots = {}
+        self.existing_roots = set()
+        for row in rows:
+            for path in (row["s_path"], row["t_path"]):
+                key = os.path.normcase(os.path.abspath(path))
+                self.skill_roots[key] = row["rel_path"]
+                if os.path.isdir(path):
+                    self.existing_roots.add(key)
+
+        structure_dirs = {skills_dir, target_dir}
+        for row in rows:
+            parts = row["rel_path"].split("/")[:-1]
+            for i in range(1, len(parts) + 1):
+                structure_dirs.add(os.path.join(skills_dir, *parts[:i]))
+        self.structure_dirs = {os.path.normcase(os.path.abspath(d)) for d in structure_dirs}
+        self.roots = [(d, False) for d in sorted(structure_dirs)]
+        self.roots += [(row["s_path"], True) for row in rows]
+        self.roots += [(row["t_path"], True) for row in rows if os.path.isdir(row["t_path"])]
+
+    def _make_backend(self):
+        if self.use_inotify and _load_libc() is not None:
+            try:
+                backend = InotifyBackend(self.roots)
+                self.backend_name = "inotify"
+                return backend
+            except OSError:
+                pass
+        self.backend_name = "polling"
+        return PollingBackend(self.roots, self._stop)
+
+    def classify(self, paths):
+        rel_paths = set()
+        structure_changed = False
+        for path in paths:
+            current = os.path.normcase(os.path.abspath(path))
+            if os.path.basename(current).startswith(".") and os.path.dirname(current) in self.structure_dirs:
+                # Staging dirs, the trash and other hidden entries are never
+                # skills, as in collect_target_skill_dirs.
+                continue
+            if current in self.skill_roots and os.path.isdir(current) != (current in self.existing_roots):
+                # A skill directory appeared or vanished; the row set itself changed.
+                structure_changed = True
+                continue
+            while True:
+                if current in self.skill_roots:
+                    rel_paths.add(self.skill_roots[current])
+                    break
+                parent = os.path.dirname(current)
+                if parent == current:
+                    structure_changed = True
+                    break
+                current = parent
+        return rel_paths, structure_changed
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _next_changes(self, backend):
+        changed = backend.poll(self.interval)
+        if not changed:
+            return changed
+        # Editors write files in bursts; collect the burst before comparing.
+        while not self._stop.is_set():
+            more = backend.poll(DEBOUNCE_SECONDS)
+            if not more:
+                break
+            changed |= more
+        return changed
+
+    def _run(self):
+        backend = None
+        try:
+            backend = self._make_backend()
+            while not self._stop.is_set():
+                try:
+                    changed = self._next_changes(backend)
+                except Exception as e:
+                    if isinstance(backend, PollingBackend):
+                        raise
+                    # E.g. the inotify watch limit was hit on a new directory.
+                    print(f"inotify watch failed, polling instead: {e}")
+                    backend.close()
+                    backend = None
+                    self.backend_name = "polling"
+                    backend = PollingBackend(self.roots, self._stop)
+                    # Whatever changed before the switch is unknown.
+                    self.on_change(set(), True)
+                    continue
+                if self._stop.is_set():
+                    break
+                if not changed:
+                    continue
+                rel_paths, structure_changed = self.classify(changed)
+                if rel_paths or structure_changed:
+                    self.on_change(rel_paths, structure_changed)
+        except Exception as e:
+            print(f"Error in watch thread: {e}")
+        finally:
+            if backend is not None:
+                backend.close()
@@ -4,4 +4,7 @@ import os
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 APP_CONFIG_FILE = os.path.join(PROJECT_ROOT, "app_config.json")
 HISTORY_FILE = os.path.join(PROJECT_ROOT, "history.json")
-
+HASH_CACHE_FILE = os.path.join(PROJECT_ROOT, "hash_cache.json")
+CATALOG_FILE = os.path.join(PROJECT_ROOT, "skill_catalog.json")
+COMPARE_CACHE_FILE = os.path.join(PROJECT_ROOT, "compare_cache.json")
+GROUP_SIGNATURES_FILE = os.path.join(PROJECT_ROOT, "group_signatures.json")
@@ -9,7 +9,9 @@ from src.core.actions import (
     parse_github_tree_url,
     import_mcp_servers,
     import_skills_to_target,
+    iter_import_events,
 )
+from src.core.jobs import CancelToken
 
 
 class TestSkillActions(unittest.TestCase):
@@ -37,6 +39,61 @@ class TestSkillActions(unittest.TestCase):
             with open(os.path.join(dst_skill, "a.txt"), "r", encoding="utf-8") as f:
                 self.assertEqual(f.read(), "A")
 
+    def test_iter_import_events_parallel_with_progress_and_errors(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            items = []
+            for i in range(6):
+                src_skill = os.path.join(skills_dir, "g1", f"s{i}")
+                os.makedirs(src_skill)
+                with open(os.path.join(src_skill, "SKILL.md"), "w", encoding="utf-8") as f:
+                    f.write("x" * (i + 1))
+                items.append({"rel_path": f"g1/s{i}", "name": f"s{i}"})
+            items.append({"rel_path": "g1/missing", "name": "missing"})
+
+            events = list(iter_import_events(skills_dir, target_dir, items, workers=4))
+            self.assertEqual(events[0], ("start", 7, 21))
+            self.assertEqual(events[-1][0], "done")
+            finished = {e[1]: e for e in events if e[0] == "skill_finished"}
+            self.assertEqual(len(finished), 6)
+            self.assertEqual(finished["g1/s2"][2:], (3, 3))
+            self.assertEqual([e[0] for e in events if e[0] == "skill_started"], ["skill_started"] * 7)
+            self.assertEqual([skill for skill, _ in events[-1][1]], ["g1/missing"])
+            for i in range(6):
+                self.assertTrue(os.path.exists(os.path.join(target_dir, f"s{i}", "SKILL.md")))
+
+    def test_iter_import_events_honours_cancel_token(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            os.makedirs(os.path.join(skills_dir, "s"))
+            with open(os.path.join(skills_dir, "s", "SKILL.md"), "w", encoding="utf-8") as f:
+                f.write("s")
+            items = [{"rel_path": "s", "name": "s"}]
+
+            events = list(iter_import_events(skills_dir, target_dir, items, cancel=CancelToken()))
+            self.assertEqual([e[0] for e in events], ["start", "skill_started", "skill_finished", "done"])
+            self.assertTrue(os.path.exists(os.path.join(target_dir, "s", "SKILL.md")))
+
+            token = CancelToken()
+            other_target = os.path.join(target_dir, "other")
+            kinds = []
+            for event in iter_import_events(skills_dir, other_target, items, cancel=token):
+                kinds.append(event[0])
+                if event[0] == "start":
+                    token.cancel()
+            self.assertEqual(kinds, ["start", "done"])
+            self.assertFalse(os.path.exists(os.path.join(other_target, "s")))
+
+    def test_import_same_destination_name_is_serialized(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            for group in ("a", "b"):
+                src_skill = os.path.join(skills_dir, group, "s")
+                os.makedirs(src_skill)
+                with open(os.path.join(src_skill, "SKILL.md"), "w", encoding="utf-8") as f:
+                    f.write(group)
+            items = [{"rel_path": "a/s", "name": "s"}, {"rel_path": "b/s", "name": "s"}]
+            self.assertEqual(import_skills_to_target(skills_dir, target_dir, items, workers=2), [])
+            with open(os.path.join(target_dir, "s", "SKILL.md"), "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), "b")
+
     def test_delete_skill_dirs(self):
         with tempfile.TemporaryDirectory() as target_dir:
             os.makedirs(os.path.join(target_dir, "a"))
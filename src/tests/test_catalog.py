@@ -0,0 +1,78 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import src.core.catalog as catalog_mod
+from src.core.catalog import SkillCatalog, discover_skills
+
+
+def _make_skill(root, rel):
+    path = os.path.join(root, *rel.split("/"))
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, "SKILL.md"), "w", encoding="utf-8") as f:
+        f.write(rel)
+
+
+def _age_dirs(root, age=60):
+    t = time.time() - age
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, (t, t))
+
+
+class TestSkillCatalog(unittest.TestCase):
+    def test_discovery_stops_at_skill_dirs(self):
+        with tempfile.TemporaryDirectory() as td:
+            _make_skill(td, "g1/s1")
+            _make_skill(td, "g1/s1/nested")
+            _make_skill(td, "s2")
+            os.makedirs(os.path.join(td, ".git", "objects"))
+
+            skills, dirs = discover_skills(td)
+            self.assertEqual(skills, ["g1/s1", "s2"])
+            self.assertNotIn("g1/s1/nested", dirs)
+            self.assertNotIn(".git", dirs)
+
+    def test_unchanged_directories_are_not_rescanned(self):
+        with tempfile.TemporaryDirectory() as td, tempfile.TemporaryDirectory() as cache_dir:
+            _make_skill(td, "g1/s1")
+            _make_skill(td, "g2/s2")
+            _age_dirs(td)
+
+            catalog = SkillCatalog(os.path.join(cache_dir, "catalog.json"))
+            self.assertEqual(catalog.discover(td), ["g1/s1", "g2/s2"])
+
+            with mock.patch.object(catalog_mod, "_scan_dir", side_effect=AssertionError("scanned")):
+                self.assertEqual(catalog.discover(td), ["g1/s1", "g2/s2"])
+
+            _make_skill(td, "g2/s3")
+            scanned = []
+            real_scan = catalog_mod._scan_dir
+
+            def spy(path):
+                scanned.append(os.path.relpath(path, td))
+                return real_scan(path)
+
+            with mock.patch.object(catalog_mod, "_scan_dir", side_effect=spy):
+                self.assertEqual(catalog.discover(td), ["g1/s1", "g2/s2", "g2/s3"])
+            self.assertIn("g2", scanned)
+            self.assertNotIn("g1", scanned)
+
+    def test_save_and_reload(self):
+        with tempfile.TemporaryDirectory() as td, tempfile.TemporaryDirectory() as cache_dir:
+            _make_skill(td, "s1")
+            _age_dirs(td)
+            catalog_file = os.path.join(cache_dir, "catalog.json")
+
+            catalog = SkillCatalog(catalog_file)
+            catalog.discover(td)
+            catalog.save()
+
+            reloaded = SkillCatalog(catalog_file)
+            with mock.patch.object(catalog_mod, "_scan_dir", side_effect=AssertionError("scanned")):
+                self.assertEqual(reloaded.discover(td), ["s1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,24 @@
 import os
 import tempfile
+import time
 import unittest
+from unittest import mock
 
+import src.core.compare as compare_mod
+import src.utils.fs as fs_mod
 from src.core.compare import (
+    COMPARE_QUICK,
+    iter_verified_rows,
     build_mcp_right_rows,
+    STATUS_CHECKING,
     build_skills_right_rows,
     collect_source_skill_rel_paths,
     collect_target_skill_dirs,
+    iter_skills_right_rows,
     read_mcp_current_data,
 )
+from src.core.scheduler import PRIORITY_VISIBLE, PriorityScheduler
+from src.utils.hash_cache import HashCache
 
 
 class TestSkillsCompare(unittest.TestCase):
@@ -67,6 +77,140 @@ class TestSkillsCompare(unittest.TestCase):
             self.assertEqual(rows[0]["status"], "⚠️ 差异")
             self.assertTrue(rows[0]["is_diff"])
 
+    def test_size_difference_skips_content_hashing(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            os.makedirs(os.path.join(skills_dir, "s1"))
+            os.makedirs(os.path.join(target_dir, "s1"))
+            with open(os.path.join(skills_dir, "s1", "SKILL.md"), "w", encoding="utf-8") as f:
+                f.write("hello")
+            with open(os.path.join(target_dir, "s1", "SKILL.md"), "w", encoding="utf-8") as f:
+                f.write("hello, world")
+
+            with mock.patch.object(compare_mod, "calculate_dir_hash", side_effect=AssertionError("hashed")):
+                rows, err = build_skills_right_rows(skills_dir, target_dir)
+            self.assertIsNone(err)
+            self.assertEqual(rows[0]["status"], "⚠️ 差异")
+            self.assertTrue(rows[0]["is_diff"])
+
+    def test_build_skills_right_rows_parallel_matches_serial(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            for i in range(12):
+                src = os.path.join(skills_dir, f"g{i % 3}", f"s{i}")
+                os.makedirs(src)
+                with open(os.path.join(src, "SKILL.md"), "w", encoding="utf-8") as f:
+                    f.write(f"skill {i}")
+                if i % 2:
+                    dst = os.path.join(target_dir, f"s{i}")
+                    os.makedirs(dst)
+                    with open(os.path.join(dst, "SKILL.md"), "w", encoding="utf-8") as f:
+                        f.write(f"skill {i}" if i % 4 == 1 else "changed")
+
+            serial, err = build_skills_right_rows(skills_dir, target_dir)
+            self.assertIsNone(err)
+            parallel, err = build_skills_right_rows(skills_dir, target_dir, workers=4)
+            self.assertIsNone(err)
+            self.assertEqual(parallel, serial)
+            self.assertEqual([r["rel_path"] for r in parallel], sorted(r["rel_path"] for r in parallel))
+            self.assertEqual({r["status"] for r in parallel}, {"🆕 新增", "✅ 一致", "⚠️ 差异"})
+
+    def test_iter_skills_right_rows_streams_rows_then_updates(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            for name in ("a", "b", "c"):
+                os.makedirs(os.path.join(skills_dir, name))
+                with open(os.path.join(skills_dir, name, "SKILL.md"), "w", encoding="utf-8") as f:
+                    f.write(name)
+            for name in ("a", "b"):
+                os.makedirs(os.path.join(target_dir, name))
+                with open(os.path.join(target_dir, name, "SKILL.md"), "w", encoding="utf-8") as f:
+                    f.write(name if name == "a" else "changed")
+
+            events = list(iter_skills_right_rows(skills_dir, target_dir, workers=2))
+            kind, rows = events[0]
+            self.assertEqual(kind, "rows")
+            self.assertEqual([r["rel_path"] for r in rows], ["a", "b", "c"])
+
+            updates = {e[2]["rel_path"]: e[2]["status"] for e in events[1:]}
+            self.assertTrue(all(e[0] == "update" for e in events[1:]))
+            self.assertEqual(updates, {"a": "✅ 一致", "b": "⚠️ 差异"})
+            self.assertEqual(rows[2]["status"], "🆕 新增")
+
+    def test_scheduler_compares_prioritized_rows_first(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            for name in ("a", "b", "c"):
+                for root in (skills_dir, target_dir):
+                    os.makedirs(os.path.join(root, name))
+                    with open(os.path.join(root, name, "SKILL.md"), "w", encoding="utf-8") as f:
+                        f.write(name)
+
+            scheduler = PriorityScheduler()
+            scheduler.set_priorities({"c": PRIORITY_VISIBLE})
+            events = list(iter_skills_right_rows(skills_dir, target_dir, scheduler=scheduler))
+            order = [e[2]["rel_path"] for e in events[1:]]
+            self.assertEqual(order, ["c", "a", "b"])
+            self.assertTrue(all(e[2]["status"] == "✅ 一致" for e in events[1:]))
+
+    def test_quick_mode_uses_stats_only_and_verify_hashes(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            for name in ("same", "touched", "edited"):
+                for root in (skills_dir, target_dir):
+                    path = os.path.join(root, name, "SKILL.md")
+                    os.makedirs(os.path.dirname(path))
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write("edit" if root == target_dir and name == "edited" else "same")
+                    os.utime(path, (1000, 1000))
+            os.utime(os.path.join(target_dir, "touched", "SKILL.md"), (2000, 2000))
+            os.utime(os.path.join(target_dir, "edited", "SKILL.md"), (2000, 2000))
+
+            with mock.patch.object(fs_mod, "_hash_file", side_effect=AssertionError("read")):
+                rows, err = build_skills_right_rows(skills_dir, target_dir, mode=COMPARE_QUICK)
+            self.assertIsNone(err)
+            statuses = {r["rel_path"]: r["status"] for r in rows}
+            self.assertEqual(
+                statuses, {"edited": "⚠️ 差异", "same": "✅ 一致", "touched": "⚠️ 差异"}
+            )
+            self.assertFalse(any(r["verified"] for r in rows))
+
+            verified = {r["rel_path"]: r for r in iter_verified_rows(rows)}
+            self.assertEqual(verified["touched"]["status"], "✅ 一致")
+            self.assertEqual(verified["edited"]["status"], "⚠️ 差异")
+            self.assertTrue(all(r["verified"] for r in verified.values()))
+
+    def test_process_pool_mode_matches_thread_mode_and_fills_cache(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir, tempfile.TemporaryDirectory() as cache_dir:
+            old = time.time() - 60
+            for i in range(4):
+                for root, content in ((skills_dir, f"skill {i}"), (target_dir, f"skill {i}" if i % 2 else f"SKILL {i}")):
+                    path = os.path.join(root, f"s{i}", "SKILL.md")
+                    os.makedirs(os.path.dirname(path))
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write(content)
+                    os.utime(path, (old, old))
+
+            expected, _ = build_skills_right_rows(skills_dir, target_dir)
+            cache = HashCache(os.path.join(cache_dir, "cache.json"))
+            rows, err = build_skills_right_rows(
+                skills_dir, target_dir, cache, workers=2, process_pool_threshold=0
+            )
+            self.assertIsNone(err)
+            self.assertEqual(rows, expected)
+            self.assertEqual(len(cache.known_files(os.path.join(skills_dir, "s1"))), 1)
+
+            with mock.patch.object(fs_mod, "_hash_file", side_effect=AssertionError("read")):
+                warm, _ = build_skills_right_rows(skills_dir, target_dir, cache, workers=2)
+            self.assertEqual(warm, expected)
+
+    def test_iter_skills_right_rows_marks_pending_rows_checking(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            os.makedirs(os.path.join(skills_dir, "a"))
+            os.makedirs(os.path.join(target_dir, "a"))
+            with open(os.path.join(skills_dir, "a", "SKILL.md"), "w", encoding="utf-8") as f:
+                f.write("a")
+
+            events = iter_skills_right_rows(skills_dir, target_dir)
+            kind, rows = next(events)
+            self.assertEqual(rows[0]["status"], STATUS_CHECKING)
+            events.close()
+
 
 class TestMcpCompare(unittest.TestCase):
     def test_read_mcp_current_data_and_build_rows(self):
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+from src.core.compare_cache import MAX_PAIRS, CompareCache
+
+
+class TestCompareCache(unittest.TestCase):
+    def test_put_save_and_reload_per_pair(self):
+        with tempfile.TemporaryDirectory() as td:
+            cache_file = os.path.join(td, "compare_cache.json")
+            rows = [
+                {
+                    "name": "s1",
+                    "rel_path": "g1/s1",
+                    "status": "✅ 一致",
+                    "is_diff": False,
+                    "s_path": "/src/g1/s1",
+                    "t_path": "/dst/s1",
+                    "group": "g1",
+                    "color": "green",
+                }
+            ]
+            cache = CompareCache(cache_file)
+            self.assertIsNone(cache.get("/src", "/dst"))
+            cache.put("/src", "/dst", rows)
+            cache.save()
+
+            reloaded = CompareCache(cache_file)
+            cached = reloaded.get("/src", "/dst")
+            self.assertEqual(cached[0]["status"], "✅ 一致")
+            self.assertNotIn("color", cached[0])
+            self.assertIsNone(reloaded.get("/src", "/other"))
+
+            cached[0]["status"] = "changed"
+            self.assertEqual(reloaded.get("/src", "/dst")[0]["status"], "✅ 一致")
+
+    def test_save_keeps_most_recent_pairs(self):
+        with tempfile.TemporaryDirectory() as td:
+            cache = CompareCache(os.path.join(td, "compare_cache.json"))
+            for i in range(MAX_PAIRS + 3):
+                cache.put("/src", f"/dst{i}", [])
+                cache.pairs[list(cache.pairs)[-1]]["time"] = i
+            cache.save()
+            self.assertEqual(len(cache.pairs), MAX_PAIRS)
+            self.assertIsNone(cache.get("/src", "/dst0"))
+            self.assertIsNotNone(cache.get("/src", f"/dst{MAX_PAIRS + 2}"))
+
+    def test_corrupt_file_starts_empty(self):
+        with tempfile.TemporaryDirectory() as td:
+            cache_file = os.path.join(td, "compare_cache.json")
+            with open(cache_file, "w", encoding="utf-8") as f:
+                f.write("{not json")
+            self.assertEqual(CompareCache(cache_file).pairs, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import errno
+import os
+import tempfile
+import unittest
+
+from src.utils import copy as copy_mod
+from src.utils.copy import COPY_BUFFER, CopyBackend
+
+
+def _write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class TestCopyBackend(unittest.TestCase):
+    def test_copies_data_and_metadata(self):
+        with tempfile.TemporaryDirectory() as root:
+            backend = CopyBackend()
+            for name, data in (("empty", b""), ("small", b"abc"), ("big", os.urandom(3 * 1024 * 1024 + 7))):
+                src = os.path.join(root, name)
+                _write(src, data)
+                os.utime(src, ns=(1_600_000_000_000_000_000, 1_600_000_000_000_000_000))
+                dst = backend.copy_file(src, os.path.join(root, name + ".copy"))
+                self.assertEqual(_read(dst), data)
+                self.assertEqual(os.stat(dst).st_mtime_ns, 1_600_000_000_000_000_000)
+
+    def test_copy_into_directory(self):
+        with tempfile.TemporaryDirectory() as root:
+            src = os.path.join(root, "a.txt")
+            _write(src, b"a")
+            os.makedirs(os.path.join(root, "out"))
+            dst = CopyBackend().copy_file(src, os.path.join(root, "out"))
+            self.assertEqual(dst, os.path.join(root, "out", "a.txt"))
+
+    def test_falls_back_and_caches_choice_per_volume(self):
+        calls = []
+
+        def unsupported(fd_src, fd_dst, size):
+            calls.append("fast")
+            os.write(fd_dst, b"partial")
+            raise OSError(errno.EOPNOTSUPP, "not here")
+
+        def buffered(fd_src, fd_dst, size):
+            calls.append("buffer")
+            copy_mod._copy_buffer(fd_src, fd_dst, size)
+
+        backend = CopyBackend([("fast", unsupported), (COPY_BUFFER, buffered)])
+        with tempfile.TemporaryDirectory() as root:
+            src = os.path.join(root, "a")
+            _write(src, b"payload")
+            backend.copy_file(src, os.path.join(root, "b"))
+            backend.copy_file(src, os.path.join(root, "c"))
+            self.assertEqual(_read(os.path.join(root, "b")), b"payload")
+            self.assertEqual(calls, ["fast", "buffer", "buffer"])
+            dev = os.stat(root).st_dev
+            self.assertEqual(backend.method_for(dev, dev), COPY_BUFFER)
+
+    def test_real_errors_are_raised(self):
+        def full(fd_src, fd_dst, size):
+            raise OSError(errno.ENOSPC, "disk full")
+
+        backend = CopyBackend([("fast", full), (COPY_BUFFER, copy_mod._copy_buffer)])
+        with tempfile.TemporaryDirectory() as root:
+            src = os.path.join(root, "a")
+            _write(src, b"payload")
+            with self.assertRaises(OSError):
+                backend.copy_file(src, os.path.join(root, "b"))
+
+    def test_default_methods_end_with_buffer(self):
+        methods = [name for name, _ in copy_mod._available_methods()]
+        self.assertEqual(methods[-1], COPY_BUFFER)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,12 @@
 import os
 import tempfile
+import time
 import unittest
+from unittest import mock
 
+import src.utils.fs as fs_mod
 from src.core.diff import collect_diff_files
+from src.utils.hash_cache import HashCache
 
 
 class TestDiff(unittest.TestCase):
@@ -42,6 +46,35 @@ class TestDiff(unittest.TestCase):
             out = collect_diff_files(src, tgt)
             self.assertEqual(out, [(".gitignore", "New")])
 
+    def test_collect_diff_files_file_replaced_by_dir(self):
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as tgt:
+            os.makedirs(os.path.join(src, "x"))
+            with open(os.path.join(src, "x", "inner.txt"), "w", encoding="utf-8") as f:
+                f.write("I")
+            with open(os.path.join(tgt, "x"), "w", encoding="utf-8") as f:
+                f.write("file")
+
+            out = collect_diff_files(src, tgt, ignore_patterns=[])
+            self.assertEqual(out, [("x", "Deleted"), (os.path.join("x", "inner.txt"), "New")])
+
+    def test_collect_diff_files_reuses_cached_digests(self):
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as tgt, tempfile.TemporaryDirectory() as td:
+            old = time.time() - 60
+            for root, content in ((src, "A"), (tgt, "B")):
+                os.makedirs(os.path.join(root, "same"))
+                for rel, data in (("a.txt", content), (os.path.join("same", "s.txt"), "S")):
+                    path = os.path.join(root, rel)
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write(data)
+                    os.utime(path, (old, old))
+
+            cache = HashCache(os.path.join(td, "cache.json"))
+            first = collect_diff_files(src, tgt, ignore_patterns=[], hash_cache=cache)
+            with mock.patch.object(fs_mod, "_hash_file", side_effect=AssertionError("read")):
+                second = collect_diff_files(src, tgt, ignore_patterns=[], hash_cache=cache)
+            self.assertEqual(first, [("a.txt", "Modified")])
+            self.assertEqual(second, first)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,82 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.utils.gitignore import GitIgnoreMatcher, get_ignore_matcher
+
+
+class TestGitIgnoreMatcher(unittest.TestCase):
+    def test_unanchored_name_matches_at_any_depth(self):
+        m = GitIgnoreMatcher(["node_modules", "*.pyc"])
+        self.assertTrue(m.match("node_modules", is_dir=True))
+        self.assertTrue(m.match("a/b/node_modules", is_dir=True))
+        self.assertTrue(m.match("pkg/x.pyc"))
+        self.assertFalse(m.match("pkg/x.py"))
+
+    def test_anchored_and_dir_only(self):
+        m = GitIgnoreMatcher(["/build", "docs/tmp/", "logs/"])
+        self.assertTrue(m.match("build", is_dir=True))
+        self.assertFalse(m.match("src/build", is_dir=True))
+        self.assertTrue(m.match("docs/tmp", is_dir=True))
+        self.assertFalse(m.match("x/docs/tmp", is_dir=True))
+        self.assertTrue(m.match("a/logs", is_dir=True))
+        self.assertFalse(m.match("a/logs", is_dir=False))
+
+    def test_double_star(self):
+        m = GitIgnoreMatcher(["**/cache", "assets/**/*.bin", "out/**"])
+        self.assertTrue(m.match("cache", is_dir=True))
+        self.assertTrue(m.match("x/y/cache", is_dir=True))
+        self.assertTrue(m.match("assets/a.bin"))
+        self.assertTrue(m.match("assets/a/b/c.bin"))
+        self.assertFalse(m.match("other/a.bin"))
+        self.assertTrue(m.match("out/deep/file.txt"))
+        self.assertFalse(m.match("out", is_dir=True))
+
+    def test_negation_last_rule_wins(self):
+        m = GitIgnoreMatcher(["*.log", "!keep.log", "# comment", "", "debug/keep.log"])
+        self.assertTrue(m.match("a.log"))
+        self.assertFalse(m.match("keep.log"))
+        self.assertFalse(m.match("x/keep.log"))
+        self.assertTrue(m.match("debug/keep.log"))
+
+    def test_empty_matcher_is_falsy(self):
+        m = GitIgnoreMatcher(["# only comments", "   "])
+        self.assertFalse(m)
+        self.assertFalse(m.match("anything"))
+
+    def test_copytree_ignore_uses_relative_paths(self):
+        with tempfile.TemporaryDirectory() as td:
+            src = os.path.join(td, "src")
+            os.makedirs(os.path.join(src, "sub", "build"))
+            os.makedirs(os.path.join(src, "build"))
+            for rel in ("keep.txt", os.path.join("sub", "build", "x.txt"), os.path.join("build", "y.txt")):
+                with open(os.path.join(src, rel), "w", encoding="utf-8") as f:
+                    f.write("x")
+
+            m = GitIgnoreMatcher(["/build/"])
+            dst = os.path.join(td, "dst")
+            shutil.copytree(src, dst, ignore=m.copytree_ignore(src))
+            self.assertTrue(os.path.exists(os.path.join(dst, "sub", "build", "x.txt")))
+            self.assertFalse(os.path.exists(os.path.join(dst, "build")))
+
+    def test_get_ignore_matcher_cached_by_mtime(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, ".gitignore")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("a.txt\n")
+            first = get_ignore_matcher(td)
+            self.assertIs(get_ignore_matcher(td), first)
+
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("b.txt\n")
+            st = os.stat(path)
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+            second = get_ignore_matcher(td)
+            self.assertIsNot(second, first)
+            self.assertTrue(second.match("b.txt"))
+            self.assertFalse(second.match("a.txt"))
+
+
+if __name__ == "__main__":
+    unittest.main()
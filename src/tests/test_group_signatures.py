@@ -0,0 +1,90 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import src.core.compare as compare_mod
+from src.core.compare import iter_skills_right_rows
+from src.core.group_signatures import GroupSignatureCache, group_signature
+
+
+def _write(path, content, old=True):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+    if old:
+        past = time.time() - 60
+        os.utime(path, (past, past))
+
+
+class TestGroupSignatures(unittest.TestCase):
+    def _make_tree(self, skills_dir, target_dir):
+        for name in ("s1", "s2"):
+            _write(os.path.join(skills_dir, "owner", name, "SKILL.md"), name)
+            _write(os.path.join(target_dir, name, "SKILL.md"), name)
+        _write(os.path.join(skills_dir, "owner", "github_address.txt"), "https://github.com/owner/repo")
+
+    def test_unchanged_group_is_confirmed_without_comparing(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir, tempfile.TemporaryDirectory() as cache_dir:
+            self._make_tree(skills_dir, target_dir)
+            cache = GroupSignatureCache(os.path.join(cache_dir, "group_signatures.json"))
+
+            list(iter_skills_right_rows(skills_dir, target_dir, group_signatures=cache))
+            entry = cache.get(skills_dir, target_dir, "owner")
+            self.assertIsNotNone(entry)
+            cache.save()
+
+            reloaded = GroupSignatureCache(cache.cache_file)
+            with mock.patch.object(compare_mod, "_compare_skill", side_effect=AssertionError("compared")):
+                events = list(iter_skills_right_rows(skills_dir, target_dir, group_signatures=reloaded))
+            statuses = {e[2]["rel_path"]: e[2]["status"] for e in events[1:]}
+            self.assertEqual(statuses, {"owner/s1": "✅ 一致", "owner/s2": "✅ 一致"})
+
+    def test_changed_group_is_rechecked_and_forgotten_on_diff(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir, tempfile.TemporaryDirectory() as cache_dir:
+            self._make_tree(skills_dir, target_dir)
+            cache = GroupSignatureCache(os.path.join(cache_dir, "group_signatures.json"))
+            list(iter_skills_right_rows(skills_dir, target_dir, group_signatures=cache))
+
+            path = os.path.join(target_dir, "s2", "SKILL.md")
+            _write(path, "s9")
+            past = time.time() - 30
+            os.utime(path, (past, past))
+
+            events = list(iter_skills_right_rows(skills_dir, target_dir, group_signatures=cache))
+            statuses = {e[2]["rel_path"]: e[2]["status"] for e in events[1:]}
+            self.assertEqual(statuses["owner/s2"], "⚠️ 差异")
+            self.assertIsNone(cache.get(skills_dir, target_dir, "owner"))
+
+    def test_group_with_missing_target_or_recent_write_is_not_signed(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            self._make_tree(skills_dir, target_dir)
+            rows = [
+                {"rel_path": f"owner/{n}", "s_path": os.path.join(skills_dir, "owner", n), "t_path": os.path.join(target_dir, n)}
+                for n in ("s1", "s2")
+            ]
+            self.assertIsNotNone(group_signature(rows))
+            _write(os.path.join(target_dir, "s1", "new.txt"), "x", old=False)
+            self.assertIsNone(group_signature(rows))
+            rows[0]["t_path"] = os.path.join(target_dir, "missing")
+            self.assertIsNone(group_signature(rows))
+
+    def test_inode_swap_changes_signature(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            self._make_tree(skills_dir, target_dir)
+            rows = [
+                {"rel_path": "owner/s1", "s_path": os.path.join(skills_dir, "owner", "s1"), "t_path": os.path.join(target_dir, "s1")}
+            ]
+            before = group_signature(rows)
+            path = os.path.join(target_dir, "s1", "SKILL.md")
+            st = os.stat(path)
+            replacement = path + ".new"
+            _write(replacement, "x2")
+            os.utime(replacement, ns=(st.st_atime_ns, st.st_mtime_ns))
+            os.replace(replacement, path)
+            self.assertNotEqual(group_signature(rows), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
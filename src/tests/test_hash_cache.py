@@ -0,0 +1,96 @@
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import src.utils.fs as fs_mod
+from src.utils.fs import calculate_dir_hash, get_hasher, hash_tree_with
+from src.utils.hash_cache import HashCache, entry_stat_key, stat_key
+
+
+def _write(path, data, age=60):
+    with open(path, "wb") as f:
+        f.write(data)
+    t = time.time() - age
+    os.utime(path, (t, t))
+
+
+class TestHashCache(unittest.TestCase):
+    def test_warm_pass_skips_reading(self):
+        with tempfile.TemporaryDirectory() as td:
+            skill = os.path.join(td, "skill")
+            os.makedirs(skill)
+            _write(os.path.join(skill, "a.txt"), b"hello")
+            _write(os.path.join(skill, "b.txt"), b"world")
+
+            cache = HashCache(os.path.join(td, "cache.json"))
+            cold = calculate_dir_hash(skill, cache=cache)
+            self.assertEqual(cold, calculate_dir_hash(skill))
+
+            with mock.patch.object(fs_mod, "_hash_file", side_effect=AssertionError("read")):
+                self.assertEqual(calculate_dir_hash(skill, cache=cache), cold)
+
+    def test_entry_keys_match_os_stat_keys(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "a.txt")
+            _write(path, b"hello")
+            st = os.stat(path)
+            # What DirEntry.stat() returns on Windows.
+            no_ino = SimpleNamespace(st_size=st.st_size, st_mtime_ns=st.st_mtime_ns, st_ino=0)
+            entry = SimpleNamespace(stat=lambda: no_ino, inode=lambda: st.st_ino)
+            self.assertEqual(entry_stat_key(entry), stat_key(st))
+
+            known = {"a.txt": stat_key(st) + [get_hasher().hash_file(path)]}
+            with mock.patch.object(fs_mod, "_hash_file", side_effect=AssertionError("read")):
+                self.assertIsNotNone(hash_tree_with(td, known=known))
+
+    def test_changed_file_is_rehashed_and_removed_file_evicted(self):
+        with tempfile.TemporaryDirectory() as td:
+            skill = os.path.join(td, "skill")
+            os.makedirs(skill)
+            _write(os.path.join(skill, "a.txt"), b"hello")
+            _write(os.path.join(skill, "b.txt"), b"world")
+
+            cache = HashCache(os.path.join(td, "cache.json"))
+            cold = calculate_dir_hash(skill, cache=cache)
+
+            _write(os.path.join(skill, "a.txt"), b"HELLO!", age=30)
+            os.remove(os.path.join(skill, "b.txt"))
+            warm = calculate_dir_hash(skill, cache=cache)
+            self.assertNotEqual(warm, cold)
+            self.assertEqual(warm, calculate_dir_hash(skill))
+
+            files = cache.open_root(skill).known
+            self.assertEqual(set(files), {"a.txt"})
+
+    def test_recent_files_are_not_cached(self):
+        with tempfile.TemporaryDirectory() as td:
+            skill = os.path.join(td, "skill")
+            os.makedirs(skill)
+            with open(os.path.join(skill, "a.txt"), "wb") as f:
+                f.write(b"fresh")
+
+            cache = HashCache(os.path.join(td, "cache.json"))
+            calculate_dir_hash(skill, cache=cache)
+            self.assertEqual(cache.open_root(skill).known, {})
+
+    def test_save_and_reload(self):
+        with tempfile.TemporaryDirectory() as td:
+            skill = os.path.join(td, "skill")
+            os.makedirs(skill)
+            _write(os.path.join(skill, "a.txt"), b"hello")
+
+            cache_file = os.path.join(td, "cache.json")
+            cache = HashCache(cache_file)
+            digest = calculate_dir_hash(skill, cache=cache)
+            cache.save()
+
+            reloaded = HashCache(cache_file)
+            with mock.patch.object(fs_mod, "_hash_file", side_effect=AssertionError("read")):
+                self.assertEqual(calculate_dir_hash(skill, cache=reloaded), digest)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import hashlib
+import os
+import tempfile
+import unittest
+
+from src.core.skill_manifest import verified_manifest_digest, write_skill_manifest
+from src.utils.fs import calculate_dir_hash, get_hasher, scan_stats, set_hasher
+from src.utils.hash_cache import HashCache
+from src.utils.hashing import FileHasher
+
+
+class TestFileHasher(unittest.TestCase):
+    def test_all_read_paths_agree_with_hashlib(self):
+        with tempfile.TemporaryDirectory() as td:
+            for size in (0, 100, 4096, 4097, 3 * 4096 + 5, 40000):
+                path = os.path.join(td, f"f{size}")
+                data = os.urandom(size)
+                with open(path, "wb") as f:
+                    f.write(data)
+                expected = hashlib.sha256(data).hexdigest()
+                self.assertEqual(FileHasher(block_size=4096, mmap_threshold=None).hash_file(path), expected)
+                self.assertEqual(FileHasher(block_size=4096, mmap_threshold=1).hash_file(path), expected)
+                self.assertEqual(FileHasher(block_size=1 << 20).hash_file(path), expected)
+                self.assertEqual(
+                    FileHasher("blake2b", block_size=4096).hash_file(path),
+                    hashlib.blake2b(data).hexdigest(),
+                )
+
+    def test_rejects_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            FileHasher("md4")
+
+
+class TestHasherSelection(unittest.TestCase):
+    def setUp(self):
+        self.saved = get_hasher()
+
+    def tearDown(self):
+        set_hasher(self.saved)
+
+    def test_algorithm_change_invalidates_cached_digests(self):
+        with tempfile.TemporaryDirectory() as td, tempfile.TemporaryDirectory() as cache_dir:
+            path = os.path.join(td, "a.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("A")
+            os.utime(path, (1, 1))
+
+            cache = HashCache(os.path.join(cache_dir, "hash_cache.json"))
+            sha_digest = calculate_dir_hash(td, cache=cache)
+            set_hasher(FileHasher("blake2b"))
+            self.assertEqual(cache.open_root(td, "blake2b").known, {})
+            blake_digest = calculate_dir_hash(td, cache=cache)
+            self.assertNotEqual(sha_digest, blake_digest)
+            self.assertEqual(cache.roots[list(cache.roots)[0]]["algorithm"], "blake2b")
+            self.assertEqual(calculate_dir_hash(td), blake_digest)
+
+    def test_sidecar_from_other_algorithm_is_not_trusted(self):
+        with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as dst:
+            for root in (src, dst):
+                with open(os.path.join(root, "SKILL.md"), "w", encoding="utf-8") as f:
+                    f.write("x")
+            write_skill_manifest(src, dst, "s")
+            self.assertIsNotNone(verified_manifest_digest(dst, scan_stats(dst)))
+            set_hasher(FileHasher("blake2b"))
+            self.assertIsNone(verified_manifest_digest(dst, scan_stats(dst)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+from src.core.compare import iter_skills_right_rows
+from src.core.jobs import CancelToken, JobCancelled, RefreshJobs
+from src.utils.fs import calculate_dir_hash
+
+
+class TestRefreshJobs(unittest.TestCase):
+    def test_start_supersedes_previous_job(self):
+        jobs = RefreshJobs()
+        gen1, token1 = jobs.start()
+        self.assertTrue(jobs.is_current(gen1))
+
+        gen2, token2 = jobs.start()
+        self.assertTrue(token1.cancelled)
+        self.assertFalse(token2.cancelled)
+        self.assertFalse(jobs.is_current(gen1))
+        self.assertTrue(jobs.is_current(gen2))
+
+    def test_cancel_drops_current_job(self):
+        jobs = RefreshJobs()
+        gen, token = jobs.start()
+        jobs.cancel()
+        self.assertTrue(token.cancelled)
+        self.assertFalse(jobs.is_current(gen))
+
+
+class TestCancellation(unittest.TestCase):
+    def test_hashing_stops_when_cancelled(self):
+        with tempfile.TemporaryDirectory() as td:
+            with open(os.path.join(td, "a.txt"), "w", encoding="utf-8") as f:
+                f.write("a")
+            token = CancelToken()
+            token.cancel()
+            with self.assertRaises(JobCancelled):
+                calculate_dir_hash(td, cancel=token)
+
+    def test_row_stream_stops_after_rows_when_cancelled(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            for name in ("a", "b", "c"):
+                for root in (skills_dir, target_dir):
+                    os.makedirs(os.path.join(root, name))
+                    with open(os.path.join(root, name, "SKILL.md"), "w", encoding="utf-8") as f:
+                        f.write(name)
+
+            for workers in (1, 3):
+                token = CancelToken()
+                events = iter_skills_right_rows(skills_dir, target_dir, workers=workers, cancel=token)
+                self.assertEqual(next(events)[0], "rows")
+                token.cancel()
+                with self.assertRaises(JobCancelled):
+                    list(events)
+
+
+if __name__ == "__main__":
+    unittest.main()
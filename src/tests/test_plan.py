@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import src.core.plan as plan_mod
+from src.core.actions import import_skills_to_target
+from src.core.plan import estimate_seconds, plan_delete, plan_import, plan_skill
+from src.utils.hash_cache import HashCache
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+class TestPlan(unittest.TestCase):
+    def test_plan_skill_classifies_files(self):
+        with tempfile.TemporaryDirectory() as root:
+            src = os.path.join(root, "src")
+            dst = os.path.join(root, "dst")
+            for name in ("same.md", "edited.md", "resized.md"):
+                _write(os.path.join(src, name), "abc")
+                _write(os.path.join(dst, name), "abc")
+            _write(os.path.join(src, "edited.md"), "xyz")
+            _write(os.path.join(src, "resized.md"), "abcdef")
+            _write(os.path.join(src, "new", "n.md"), "new")
+            _write(os.path.join(dst, "stale", "a.md"), "a")
+            _write(os.path.join(dst, "stale", "b.md"), "b")
+
+            plan = plan_skill(src, dst)
+            self.assertEqual(plan["add"], ["new/n.md"])
+            self.assertEqual(plan["replace"], ["edited.md", "resized.md"])
+            self.assertEqual(sorted(plan["keep"]), ["same.md"])
+            self.assertEqual(plan["remove"], ["stale"])
+            self.assertEqual(plan["bytes"], 3 + 3 + 6)
+            self.assertTrue(plan["links"])
+
+            with mock.patch.object(plan_mod, "can_hardlink", return_value=False):
+                plan = plan_skill(src, dst)
+            self.assertFalse(plan["links"])
+            self.assertEqual(plan["bytes"], 3 + 3 + 6 + 3)
+
+    def test_plan_reuses_sidecar_and_cache_without_reading(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            cache = HashCache(os.path.join(skills_dir, "cache.json"))
+            for i in range(5):
+                path = os.path.join(skills_dir, "s", f"f{i}.md")
+                _write(path, f"content {i}")
+                os.utime(path, (1_600_000_000, 1_600_000_000))
+            items = [{"rel_path": "s", "name": "s"}]
+            self.assertEqual(import_skills_to_target(skills_dir, target_dir, items, cache), [])
+
+            with mock.patch.object(plan_mod.get_hasher(), "hash_file", side_effect=AssertionError):
+                plan = plan_import(skills_dir, target_dir, items, cache)
+            self.assertNotIn("error", plan["skills"][0])
+            self.assertEqual(len(plan["skills"][0]["keep"]), 5)
+            self.assertEqual((plan["add"], plan["replace"], plan["remove"], plan["bytes"]), (0, 0, 0, 0))
+
+    def test_import_executes_plan(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            _write(os.path.join(skills_dir, "s", "a.md"), "a")
+            _write(os.path.join(target_dir, "s", "old.md"), "old")
+            items = [{"rel_path": "s", "name": "s"}, {"rel_path": "missing", "name": "missing"}]
+            plan = plan_import(skills_dir, target_dir, items)
+            self.assertEqual((plan["add"], plan["remove"], plan["bytes"]), (1, 1, 1))
+            self.assertIn("error", plan["skills"][1])
+            self.assertGreater(estimate_seconds(plan), 0)
+
+            with mock.patch.object(plan_mod, "build_hash_tree", side_effect=AssertionError):
+                errors = import_skills_to_target(skills_dir, target_dir, items, plan=plan)
+            self.assertEqual([skill for skill, _ in errors], ["missing"])
+            self.assertEqual(sorted(os.listdir(os.path.join(target_dir, "s"))), [".skill_manifest.json", "a.md"])
+
+    def test_plan_delete_counts_files_and_bytes(self):
+        with tempfile.TemporaryDirectory() as target_dir:
+            _write(os.path.join(target_dir, "a", "x.md"), "12345")
+            _write(os.path.join(target_dir, "a", "sub", "y.md"), "12")
+            plan = plan_delete(target_dir, ["a"])
+            self.assertEqual(plan["remove"], 2)
+            self.assertEqual(plan["bytes"], 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
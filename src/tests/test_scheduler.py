@@ -0,0 +1,73 @@
+import threading
+import unittest
+
+from src.core.jobs import CancelToken, JobCancelled
+from src.core.scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_EXPANDED,
+    PRIORITY_VISIBLE,
+    PriorityScheduler,
+)
+
+
+class TestPriorityScheduler(unittest.TestCase):
+    def test_runs_urgent_items_first_then_submission_order(self):
+        scheduler = PriorityScheduler()
+        scheduler.set_priorities({"d": PRIORITY_VISIBLE, "b": PRIORITY_EXPANDED})
+        order = [item for item, _ in scheduler.run(lambda x: x, ["a", "b", "c", "d"])]
+        self.assertEqual(order, ["d", "b", "a", "c"])
+
+    def test_bump_while_running(self):
+        scheduler = PriorityScheduler()
+        seen = []
+
+        def func(item):
+            seen.append(item)
+            if item == "a":
+                scheduler.set_priorities({"e": PRIORITY_VISIBLE})
+            return item
+
+        list(scheduler.run(func, ["a", "b", "c", "d", "e"]))
+        self.assertEqual(seen, ["a", "e", "b", "c", "d"])
+
+    def test_lowering_priority_defers_item(self):
+        scheduler = PriorityScheduler(default_priority=PRIORITY_EXPANDED)
+        scheduler.set_priorities({"a": PRIORITY_BACKGROUND})
+        order = [item for item, _ in scheduler.run(lambda x: x, ["a", "b"])]
+        self.assertEqual(order, ["b", "a"])
+
+    def test_parallel_run_yields_every_item_once(self):
+        scheduler = PriorityScheduler()
+        items = list(range(50))
+        results = dict(scheduler.run(lambda x: x * 2, items, workers=4, key=str))
+        self.assertEqual(results, {i: i * 2 for i in items})
+
+    def test_errors_and_cancel_propagate(self):
+        def boom(item):
+            raise ValueError("bad")
+
+        with self.assertRaises(ValueError):
+            list(PriorityScheduler().run(boom, [1, 2, 3], workers=2))
+
+        cancel = CancelToken()
+        cancel.cancel()
+        with self.assertRaises(JobCancelled):
+            list(PriorityScheduler().run(lambda x: x, [1, 2], cancel=cancel))
+
+    def test_closing_generator_drops_pending_work(self):
+        scheduler = PriorityScheduler()
+        release = threading.Event()
+
+        def func(item):
+            release.wait(5)
+            return item
+
+        gen = scheduler.run(func, list(range(100)), workers=2)
+        release.set()
+        next(gen)
+        gen.close()
+        self.assertEqual(scheduler._pop(), (False, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import src.core.actions as actions_mod
+import src.utils.fs as fs_mod
+from src.core.actions import import_skills_to_target
+from src.core.compare import compare_skill_dirs
+from src.core.skill_manifest import read_skill_manifest, verified_manifest_digest
+from src.utils.fs import calculate_dir_hash, scan_stats
+from src.utils.gitignore import GitIgnoreMatcher
+from src.utils.walk import SKILL_MANIFEST_NAME
+
+
+class TestSkillManifest(unittest.TestCase):
+    def _make_source(self, skills_dir):
+        src = os.path.join(skills_dir, "g1", "s1")
+        os.makedirs(os.path.join(src, "sub"))
+        for rel, content in (("SKILL.md", "desc"), ("sub/a.txt", "A"), ("tmp.log", "x")):
+            with open(os.path.join(src, rel), "w", encoding="utf-8") as f:
+                f.write(content)
+        with open(os.path.join(src, ".gitignore"), "w", encoding="utf-8") as f:
+            f.write("*.log\n")
+        return src
+
+    def test_import_writes_sidecar_matching_target(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            src = self._make_source(skills_dir)
+            errs = import_skills_to_target(skills_dir, target_dir, [{"rel_path": "g1/s1", "name": "s1"}])
+            self.assertEqual(errs, [])
+
+            dst = os.path.join(target_dir, "s1")
+            manifest = read_skill_manifest(dst)
+            self.assertEqual(manifest["rel_path"], "g1/s1")
+            self.assertEqual(sorted(manifest["files"]), [".gitignore", "SKILL.md", "sub/a.txt"])
+            self.assertEqual(manifest["digest"], calculate_dir_hash(src, GitIgnoreMatcher(["*.log"])))
+            self.assertEqual(manifest["digest"], calculate_dir_hash(dst))
+            self.assertNotIn(SKILL_MANIFEST_NAME, scan_stats(dst))
+
+    def test_compare_only_hashes_source_when_sidecar_is_valid(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            src = self._make_source(skills_dir)
+            import_skills_to_target(skills_dir, target_dir, [{"rel_path": "g1/s1", "name": "s1"}])
+            dst = os.path.join(target_dir, "s1")
+
+            hashed = []
+            real_hash = fs_mod._hash_file
+
+            def record(path):
+                hashed.append(path)
+                return real_hash(path)
+
+            with mock.patch.object(fs_mod, "_hash_file", side_effect=record):
+                self.assertEqual(compare_skill_dirs(src, dst), ("✅ 一致", False))
+            self.assertTrue(hashed)
+            self.assertTrue(all(p.startswith(src) for p in hashed))
+
+    def test_edited_target_invalidates_sidecar(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            src = self._make_source(skills_dir)
+            import_skills_to_target(skills_dir, target_dir, [{"rel_path": "g1/s1", "name": "s1"}])
+            dst = os.path.join(target_dir, "s1")
+
+            path = os.path.join(dst, "sub", "a.txt")
+            st = os.stat(path)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("B")
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+            self.assertIsNone(verified_manifest_digest(dst, scan_stats(dst)))
+            self.assertEqual(compare_skill_dirs(src, dst), ("⚠️ 差异", True))
+
+    def test_source_edited_during_import_is_not_recorded_as_copied(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            src = self._make_source(skills_dir)
+            real_write = actions_mod.write_skill_manifest
+
+            def edit_then_write(*args):
+                with open(os.path.join(src, "sub", "a.txt"), "w", encoding="utf-8") as f:
+                    f.write("B")
+                return real_write(*args)
+
+            with mock.patch.object(actions_mod, "write_skill_manifest", side_effect=edit_then_write):
+                import_skills_to_target(skills_dir, target_dir, [{"rel_path": "g1/s1", "name": "s1"}])
+            dst = os.path.join(target_dir, "s1")
+
+            self.assertEqual(read_skill_manifest(dst)["digest"], calculate_dir_hash(dst))
+            self.assertEqual(compare_skill_dirs(src, dst), ("⚠️ 差异", True))
+
+    def test_missing_or_corrupt_sidecar_is_ignored(self):
+        with tempfile.TemporaryDirectory() as td:
+            self.assertIsNone(read_skill_manifest(td))
+            with open(os.path.join(td, SKILL_MANIFEST_NAME), "w", encoding="utf-8") as f:
+                f.write("{broken")
+            self.assertIsNone(verified_manifest_digest(td, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
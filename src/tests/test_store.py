@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import src.core.store as store_mod
+from src.core.actions import delete_skill_dirs, import_skills_to_target
+from src.core.compare import compare_skill_dirs, quick_compare_skill_dirs
+from src.core.store import LINK_HARDLINK, SkillStore
+from src.utils.fs import get_hasher
+from src.utils.gitignore import GitIgnoreMatcher
+
+
+class TestSkillStore(unittest.TestCase):
+    def _make_skill(self, skills_dir):
+        src = os.path.join(skills_dir, "g1", "s1")
+        os.makedirs(os.path.join(src, "sub"))
+        for rel, content in (("SKILL.md", "desc"), ("sub/a.txt", "A"), ("x.log", "ignored")):
+            with open(os.path.join(src, rel), "w", encoding="utf-8") as f:
+                f.write(content)
+        with open(os.path.join(src, ".gitignore"), "w", encoding="utf-8") as f:
+            f.write("*.log\n")
+        return src
+
+    def test_projects_share_store_objects(self):
+        with tempfile.TemporaryDirectory() as root:
+            skills_dir = os.path.join(root, "skills")
+            store = SkillStore(os.path.join(root, "store"))
+            src = self._make_skill(skills_dir)
+            items = [{"rel_path": "g1/s1", "name": "s1"}]
+
+            projects = [os.path.join(root, f"p{i}") for i in range(2)]
+            for project in projects:
+                os.makedirs(project)
+                self.assertEqual(import_skills_to_target(skills_dir, project, items, store=store), [])
+
+            a0 = os.path.join(projects[0], "s1", "sub", "a.txt")
+            a1 = os.path.join(projects[1], "s1", "sub", "a.txt")
+            self.assertTrue(os.path.samefile(a0, a1))
+            self.assertFalse(os.path.exists(os.path.join(projects[0], "s1", "x.log")))
+            self.assertTrue(store.is_linked(a0, get_hasher().hash_file(a0)))
+            self.assertFalse(os.stat(a0).st_mode & 0o222)
+            self.assertEqual(compare_skill_dirs(src, os.path.join(projects[0], "s1")), ("✅ 一致", False))
+
+            self.assertEqual(delete_skill_dirs(projects[0], ["s1"]), [])
+            with open(a1, "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), "A")
+
+    def test_shared_object_times_do_not_break_quick_compare(self):
+        with tempfile.TemporaryDirectory() as root:
+            skills_dir = os.path.join(root, "skills")
+            target_dir = os.path.join(root, "p")
+            store = SkillStore(os.path.join(root, "store"))
+            for name, mtime in (("a", 1_500_000_000), ("b", 1_600_000_000)):
+                path = os.path.join(skills_dir, name, "LICENSE")
+                os.makedirs(os.path.dirname(path))
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write("MIT")
+                os.utime(path, (mtime, mtime))
+            os.makedirs(target_dir)
+            items = [{"rel_path": "a", "name": "a"}, {"rel_path": "b", "name": "b"}]
+            self.assertEqual(import_skills_to_target(skills_dir, target_dir, items, store=store), [])
+
+            b_src, b_dst = os.path.join(skills_dir, "b"), os.path.join(target_dir, "b")
+            self.assertNotEqual(os.stat(os.path.join(b_dst, "LICENSE")).st_mtime, 1_600_000_000)
+            self.assertEqual(quick_compare_skill_dirs(b_src, b_dst), ("✅ 一致", False))
+
+            os.utime(os.path.join(b_src, "LICENSE"), (1_700_000_000, 1_700_000_000))
+            self.assertEqual(quick_compare_skill_dirs(b_src, b_dst), ("⚠️ 差异", True))
+
+    def test_falls_back_to_writable_copy_without_hardlinks(self):
+        with tempfile.TemporaryDirectory() as root:
+            skills_dir = os.path.join(root, "skills")
+            store = SkillStore(os.path.join(root, "store"))
+            self._make_skill(skills_dir)
+            dst = os.path.join(root, "p", "s1")
+
+            src = os.path.join(skills_dir, "g1", "s1")
+            matcher = GitIgnoreMatcher(["*.log"])
+            with mock.patch.object(store_mod.os, "link", side_effect=OSError("EXDEV")):
+                kinds = store.materialize(src, dst, matcher)
+            self.assertNotIn(LINK_HARDLINK, kinds)
+            self.assertEqual(sum(kinds.values()), 3)
+            path = os.path.join(dst, "SKILL.md")
+            self.assertFalse(store.is_linked(path, get_hasher().hash_file(path)))
+            self.assertTrue(os.stat(path).st_mode & 0o200)
+
+            kinds = store.materialize(src, os.path.join(root, "q", "s1"), matcher)
+            self.assertEqual(kinds, {LINK_HARDLINK: 3})
+
+    def test_ingest_rejects_content_that_does_not_match_digest(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = SkillStore(os.path.join(root, "store"))
+            path = os.path.join(root, "f.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("x")
+            with self.assertRaises(OSError):
+                store.ingest(path, "0" * 64)
+            self.assertFalse(store.has("0" * 64))
+            self.assertEqual(os.listdir(store.tmp_dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,223 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import src.core.sync as sync_mod
+from src.core.compare import RESULT_DIFF, RESULT_SAME, quick_compare_skill_dirs
+from src.core.sync import make_stage_dir, purge_stale_stages, replace_skill_dir, sync_skill_dir
+from src.utils.fs import calculate_dir_hash
+from src.utils.gitignore import GitIgnoreMatcher
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+class TestSyncSkillDir(unittest.TestCase):
+    def _make_pair(self, root, count=20):
+        src = os.path.join(root, "src")
+        dst = os.path.join(root, "dst")
+        for i in range(count):
+            _write(os.path.join(src, "docs", f"f{i}.md"), f"line {i}")
+        _write(os.path.join(src, ".gitignore"), "*.log\n")
+        sync_skill_dir(src, dst, GitIgnoreMatcher(["*.log"]))
+        return src, dst
+
+    def test_only_changed_files_are_copied(self):
+        with tempfile.TemporaryDirectory() as root:
+            src, dst = self._make_pair(root)
+            _write(os.path.join(src, "docs", "f3.md"), "edited")
+
+            copied = []
+            real_copy = sync_mod.copy_file
+
+            def record(a, b):
+                copied.append(a)
+                return real_copy(a, b)
+
+            with mock.patch.object(sync_mod, "copy_file", side_effect=record):
+                stats = sync_skill_dir(src, dst, GitIgnoreMatcher(["*.log"]))
+            self.assertEqual(copied, [os.path.join(src, "docs", "f3.md")])
+            self.assertEqual(stats["copied"], 1)
+            self.assertEqual(stats["deleted"], 0)
+            self.assertEqual(stats["unchanged"], 20)
+            self.assertEqual(calculate_dir_hash(src, GitIgnoreMatcher(["*.log"])), calculate_dir_hash(dst))
+
+    def test_removed_and_ignored_entries_are_deleted(self):
+        with tempfile.TemporaryDirectory() as root:
+            src, dst = self._make_pair(root, count=3)
+            os.remove(os.path.join(src, "docs", "f1.md"))
+            _write(os.path.join(src, "debug.log"), "ignored")
+            _write(os.path.join(dst, "stale", "x.txt"), "x")
+            _write(os.path.join(dst, "old.log"), "x")
+            os.makedirs(os.path.join(src, "empty"))
+
+            stats = sync_skill_dir(src, dst, GitIgnoreMatcher(["*.log"]))
+            self.assertEqual(stats["deleted"], 3)
+            self.assertFalse(os.path.exists(os.path.join(dst, "docs", "f1.md")))
+            self.assertFalse(os.path.exists(os.path.join(dst, "stale")))
+            self.assertFalse(os.path.exists(os.path.join(dst, "debug.log")))
+            self.assertTrue(os.path.isdir(os.path.join(dst, "empty")))
+            self.assertEqual(calculate_dir_hash(src, GitIgnoreMatcher(["*.log"])), calculate_dir_hash(dst))
+
+    def test_touched_source_file_reimport_matches_quick_compare(self):
+        with tempfile.TemporaryDirectory() as root:
+            src, dst = self._make_pair(root, count=2)
+            touched = os.path.join(src, "docs", "f1.md")
+            os.utime(touched, (1_600_000_000, 1_600_000_000))
+            self.assertEqual(quick_compare_skill_dirs(src, dst), RESULT_DIFF)
+
+            stats = sync_skill_dir(src, dst, GitIgnoreMatcher(["*.log"]))
+            self.assertEqual(stats["copied"], 0)
+            self.assertEqual(os.stat(os.path.join(dst, "docs", "f1.md")).st_mtime, 1_600_000_000)
+            self.assertEqual(quick_compare_skill_dirs(src, dst), RESULT_SAME)
+
+    def test_kept_files_copied_without_hardlinks_are_counted(self):
+        with tempfile.TemporaryDirectory() as root:
+            src, dst = self._make_pair(root, count=3)
+            with mock.patch.object(sync_mod.os, "link", side_effect=OSError("not supported")):
+                stats = sync_skill_dir(src, dst, GitIgnoreMatcher(["*.log"]))
+            self.assertEqual(stats["copied"], 0)
+            self.assertEqual(stats["unchanged"], 4)
+            self.assertEqual(stats["bytes"], sum(len(f"line {i}") for i in range(3)) + len("*.log\n"))
+
+    def test_shared_kept_file_is_not_modified(self):
+        with tempfile.TemporaryDirectory() as root:
+            src, dst = self._make_pair(root, count=2)
+            # Stands in for a store object the old tree is still linked to.
+            kept = os.path.join(dst, "docs", "f1.md")
+            shared = os.path.join(root, "object")
+            os.link(kept, shared)
+            os.chmod(shared, 0o444)
+            before = os.stat(shared)
+            os.utime(os.path.join(src, "docs", "f1.md"), (1_600_000_000, 1_600_000_000))
+
+            stats = sync_skill_dir(src, dst, GitIgnoreMatcher(["*.log"]))
+            self.assertEqual(stats["copied"], 0)
+            after = os.stat(shared)
+            self.assertEqual((after.st_mode, after.st_mtime_ns), (before.st_mode, before.st_mtime_ns))
+            self.assertEqual(os.stat(kept).st_mtime, 1_600_000_000)
+
+    def test_failed_keep_never_writes_through_a_link(self):
+        with tempfile.TemporaryDirectory() as root:
+            src, dst = self._make_pair(root, count=1)
+            real_copy, real_stat_key = sync_mod.copy_file, sync_mod.stat_key
+            failed = []
+
+            def flaky_stat_key(st):
+                if not failed:
+                    failed.append(st)
+                    raise OSError("stat failed")
+                return real_stat_key(st)
+
+            def checked_copy(a, b):
+                self.assertFalse(os.path.lexists(b))
+                return real_copy(a, b)
+
+            with mock.patch.object(sync_mod, "stat_key", side_effect=flaky_stat_key), mock.patch.object(
+                sync_mod, "copy_file", side_effect=checked_copy
+            ):
+                stats = sync_skill_dir(src, dst, GitIgnoreMatcher(["*.log"]))
+            self.assertEqual(stats["copied"], 1)
+
+    def test_file_and_directory_swaps(self):
+        with tempfile.TemporaryDirectory() as root:
+            src, dst = self._make_pair(root, count=1)
+            os.remove(os.path.join(src, "docs", "f0.md"))
+            os.rmdir(os.path.join(src, "docs"))
+            _write(os.path.join(src, "docs"), "now a file")
+            sync_skill_dir(src, dst)
+            with open(os.path.join(dst, "docs"), "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), "now a file")
+
+
+
+class TestStagedReplace(unittest.TestCase):
+    def _make(self, root):
+        src = os.path.join(root, "src")
+        dst = os.path.join(root, "target", "s1")
+        _write(os.path.join(src, "a.txt"), "new")
+        _write(os.path.join(dst, "a.txt"), "old")
+        return src, dst
+
+    def _assert_clean(self, dst):
+        self.assertEqual(
+            [n for n in os.listdir(os.path.dirname(dst)) if n.startswith(".")], []
+        )
+
+    def _replace_and_check(self, root):
+        src, dst = self._make(root)
+        finalized = []
+        replace_skill_dir(src, dst, delta=False, finalize=lambda new_dir, stats: finalized.append(new_dir))
+        with open(os.path.join(dst, "a.txt"), "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "new")
+        self.assertEqual(len(finalized), 1)
+        self._assert_clean(dst)
+
+    def test_replace_swaps_new_tree_in(self):
+        with tempfile.TemporaryDirectory() as root:
+            self._replace_and_check(root)
+
+    def test_replace_without_rename_exchange(self):
+        with tempfile.TemporaryDirectory() as root:
+            with mock.patch.object(sync_mod, "_exchange", return_value=False):
+                self._replace_and_check(root)
+
+    def test_failed_build_keeps_old_tree(self):
+        with tempfile.TemporaryDirectory() as root:
+            src, dst = self._make(root)
+            with mock.patch.object(sync_mod.shutil, "copytree", side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    replace_skill_dir(src, dst, delta=False)
+            with open(os.path.join(dst, "a.txt"), "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), "old")
+            self._assert_clean(dst)
+
+    def test_failed_second_rename_rolls_back(self):
+        with tempfile.TemporaryDirectory() as root:
+            src, dst = self._make(root)
+            real_rename = os.rename
+            calls = []
+
+            def flaky_rename(a, b):
+                calls.append((a, b))
+                if len(calls) == 2:
+                    raise OSError("busy")
+                return real_rename(a, b)
+
+            with mock.patch.object(sync_mod, "_exchange", return_value=False), mock.patch.object(
+                sync_mod.os, "rename", side_effect=flaky_rename
+            ):
+                with self.assertRaises(OSError):
+                    replace_skill_dir(src, dst, delta=False)
+            with open(os.path.join(dst, "a.txt"), "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), "old")
+            self._assert_clean(dst)
+
+    def test_stale_stages_are_swept(self):
+        with tempfile.TemporaryDirectory() as root:
+            src, dst = self._make(root)
+            target_dir = os.path.dirname(dst)
+            stale = os.path.join(target_dir, ".s1.staging-dead")
+            _write(os.path.join(stale, "new", "a.txt"), "half")
+            # A crash between the two renames of the fallback swap.
+            lost = os.path.join(target_dir, "s2")
+            _write(os.path.join(lost, "b.txt"), "kept")
+            crashed = os.path.join(target_dir, ".s2.staging-dead")
+            os.makedirs(crashed)
+            os.rename(lost, os.path.join(crashed, "old"))
+            live = make_stage_dir(os.path.join(target_dir, "s3"))
+            self.addCleanup(sync_mod._release_stage, live)
+
+            purge_stale_stages(target_dir)
+
+            self.assertEqual(sorted(os.listdir(target_dir)), [os.path.basename(live), "s1", "s2"])
+            with open(os.path.join(lost, "b.txt"), "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), "kept")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+
+from src.core.compare import collect_target_skill_dirs
+from src.core.trash import SkillTrash, trash_dir_for
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+class TestSkillTrash(unittest.TestCase):
+    def _make(self, root):
+        for name in ("a", "b"):
+            _write(os.path.join(root, name, "SKILL.md"), name)
+
+    def test_delete_moves_into_hidden_trash(self):
+        with tempfile.TemporaryDirectory() as root:
+            self._make(root)
+            trash = SkillTrash(reap_delay=60)
+            batch_id, errors = trash.delete(root, ["a", "missing"])
+            self.assertIsNotNone(batch_id)
+            self.assertEqual([name for name, _ in errors], ["missing"])
+            self.assertFalse(os.path.exists(os.path.join(root, "a")))
+            self.assertEqual(len(os.listdir(trash_dir_for(root))), 1)
+            self.assertEqual(sorted(collect_target_skill_dirs(root)), ["b"])
+            trash.flush()
+
+    def test_undo_restores_until_reaped(self):
+        with tempfile.TemporaryDirectory() as root:
+            self._make(root)
+            trash = SkillTrash(reap_delay=60)
+            batch_id, _ = trash.delete(root, ["a", "b"])
+            self.assertEqual(trash.undo(batch_id), [])
+            with open(os.path.join(root, "a", "SKILL.md"), "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), "a")
+            self.assertEqual(trash.pending(), [])
+            self.assertEqual(len(trash.undo(batch_id)), 1)
+
+    def test_undo_does_not_overwrite_new_copy(self):
+        with tempfile.TemporaryDirectory() as root:
+            self._make(root)
+            trash = SkillTrash(reap_delay=60)
+            batch_id, _ = trash.delete(root, ["a"])
+            _write(os.path.join(root, "a", "SKILL.md"), "reimported")
+            self.assertEqual([name for name, _ in trash.undo(batch_id)], ["a"])
+            with open(os.path.join(root, "a", "SKILL.md"), "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), "reimported")
+
+    def test_reaper_reclaims_space(self):
+        with tempfile.TemporaryDirectory() as root:
+            self._make(root)
+            trash = SkillTrash(reap_delay=60)
+            batch_id, _ = trash.delete(root, ["a"])
+            trash.reap(batch_id)
+            self.assertEqual(os.listdir(trash_dir_for(root)), [])
+            self.assertEqual(len(trash.undo(batch_id)), 1)
+
+    def test_flush_reclaims_pending_batches(self):
+        with tempfile.TemporaryDirectory() as root:
+            self._make(root)
+            trash = SkillTrash(reap_delay=60)
+            first, _ = trash.delete(root, ["a"])
+            second, _ = trash.delete(root, ["b"])
+            timers = [trash._batches[first][1], trash._batches[second][1]]
+            trash.flush()
+            self.assertEqual(trash.pending(), [])
+            self.assertEqual(os.listdir(trash_dir_for(root)), [])
+            for timer in timers:
+                timer.join(1)
+                self.assertFalse(timer.is_alive())
+
+    def test_purge_stale_keeps_pending_batches(self):
+        with tempfile.TemporaryDirectory() as root:
+            self._make(root)
+            _write(os.path.join(trash_dir_for(root), "old.1", "SKILL.md"), "old")
+            trash = SkillTrash(reap_delay=60)
+            batch_id, _ = trash.delete(root, ["a"])
+            trash.purge_stale(root)
+            self.assertEqual(len(os.listdir(trash_dir_for(root))), 1)
+            self.assertEqual(trash.undo(batch_id), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+try:
+    import tkinter
+
+    from src.ui.pages import skills as skills_mod
+    from src.ui.platform.deps import ctk
+except (ImportError, SystemExit):
+    skills_mod = None
+
+from src.core.trash import SkillTrash
+
+
+@unittest.skipIf(skills_mod is None, "customtkinter is not installed")
+class TestSkillsPageCachedOpen(unittest.TestCase):
+    def setUp(self):
+        try:
+            self.root = ctk.CTk()
+        except tkinter.TclError:
+            self.skipTest("no display")
+        self.addCleanup(self.root.destroy)
+
+    def test_cached_rows_are_shown_and_revalidated(self):
+        with tempfile.TemporaryDirectory() as target_dir:
+            cached = [
+                {
+                    "name": "s1",
+                    "rel_path": "s1",
+                    "status": "✅ 一致",
+                    "is_diff": False,
+                    "s_path": os.path.join(target_dir, "src", "s1"),
+                    "t_path": os.path.join(target_dir, "s1"),
+                    "group": None,
+                }
+            ]
+            controller = SimpleNamespace(
+                show_home=lambda: None,
+                show_loading=mock.Mock(),
+                hide_loading=lambda: None,
+                compare_cache=mock.Mock(get=mock.Mock(return_value=cached)),
+                skill_trash=SkillTrash(reap_delay=60),
+            )
+            page = skills_mod.SkillsManagerPage(self.root, controller, target_dir)
+            self.addCleanup(page.refresh_jobs.cancel)
+
+            with mock.patch.object(skills_mod.threading, "Thread") as thread:
+                page.refresh_all()
+            thread.assert_called_once()
+            controller.show_loading.assert_not_called()
+            self.assertTrue(page.showing_cached)
+            self.assertIn("缓存", page.cache_label.cget("text"))
+
+            page._finish_revalidate()
+            self.assertFalse(page.showing_cached)
+            self.assertEqual(page.cache_label.cget("text"), "")
+
+    def test_delete_is_planned_off_the_tk_thread(self):
+        with tempfile.TemporaryDirectory() as target_dir:
+            controller = SimpleNamespace(
+                show_home=lambda: None,
+                show_loading=mock.Mock(),
+                hide_loading=lambda: None,
+                compare_cache=mock.Mock(get=mock.Mock(return_value=None)),
+                skill_trash=SkillTrash(reap_delay=60),
+            )
+            page = skills_mod.SkillsManagerPage(self.root, controller, target_dir)
+            self.addCleanup(page.refresh_jobs.cancel)
+            page.left_list.get_checked_items = lambda: ["s1"]
+
+            with mock.patch.object(skills_mod.threading, "Thread") as thread, mock.patch.object(
+                skills_mod, "plan_delete"
+            ) as plan_delete:
+                page.delete_selected()
+                page.delete_selected()
+            plan_delete.assert_not_called()
+            thread.assert_called_once()
+            self.assertEqual(thread.call_args.kwargs["target"], page._plan_delete_thread)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,6 +9,7 @@ class TestUiStatus(unittest.TestCase):
         self.assertEqual(status_to_color("✅ 一致", colors), "gray")
         self.assertEqual(status_to_color("⚠️ 差异", colors), "W")
         self.assertEqual(status_to_color("🆕 新增", colors), "S")
+        self.assertEqual(status_to_color("⏳ 检查中", colors), "gray")
 
 
 if __name__ == "__main__":
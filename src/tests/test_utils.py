@@ -1,10 +1,13 @@
+import json
 import os
 import tempfile
 import unittest
 
 from src.core.history import HistoryManager
-from src.utils.fs import calculate_dir_hash
-from src.utils.jsonc import load_jsonc
+from src.utils.cache_file import pair_key, write_cache_file
+from src.utils.fs import build_hash_tree, build_manifest, calculate_dir_hash, can_hardlink
+from src.utils.gitignore import GitIgnoreMatcher
+from src.utils.jsonc import load_jsonc, loads_jsonc
 
 
 class TestJsonc(unittest.TestCase):
@@ -26,6 +29,37 @@ class TestJsonc(unittest.TestCase):
             self.assertEqual(data["b"], 2)
             self.assertEqual(data["url"], "https://example.com/x//y")
 
+    def test_loads_jsonc_trailing_commas_and_comment_markers_in_strings(self):
+        data = loads_jsonc(
+            '{\n'
+            '  "a": [1, 2, /* last */ ],\n'
+            '  "b": "/* not a comment */ // nor this",\n'
+            '  "c": "quote \\" // still a string",\n'
+            '  "d": {"x": 1,}, // trailing\n'
+            '}\n'
+        )
+        self.assertEqual(data["a"], [1, 2])
+        self.assertEqual(data["b"], "/* not a comment */ // nor this")
+        self.assertEqual(data["c"], 'quote " // still a string')
+        self.assertEqual(data["d"], {"x": 1})
+
+    def test_loads_jsonc_errors_point_into_original_text(self):
+        with self.assertRaises(json.JSONDecodeError) as ctx:
+            loads_jsonc('{\n  /* multi\n     line */ "a": 1,\n  "b": nope,\n  "c": 2,\n}')
+        self.assertEqual((ctx.exception.lineno, ctx.exception.colno), (4, 8))
+        with self.assertRaises(json.JSONDecodeError) as ctx:
+            loads_jsonc('{"a": 1 /* open')
+        self.assertEqual(ctx.exception.msg, "Unterminated comment")
+        with self.assertRaises(json.JSONDecodeError):
+            loads_jsonc("[1,,]")
+
+    def test_load_jsonc_accepts_bom(self):
+        with tempfile.TemporaryDirectory() as td:
+            p = os.path.join(td, "a.jsonc")
+            with open(p, "w", encoding="utf-8-sig") as f:
+                f.write('{"a": 1} // c')
+            self.assertEqual(load_jsonc(p), {"a": 1})
+
 
 class TestHash(unittest.TestCase):
     def test_calculate_dir_hash_stable(self):
@@ -40,6 +74,43 @@ class TestHash(unittest.TestCase):
             h2 = calculate_dir_hash(td)
             self.assertEqual(h1, h2)
 
+    def test_hash_tree_digests_propagate_to_root(self):
+        with tempfile.TemporaryDirectory() as td:
+            os.makedirs(os.path.join(td, "a"))
+            os.makedirs(os.path.join(td, "b"))
+            with open(os.path.join(td, "a", "x.txt"), "wb") as f:
+                f.write(b"x")
+            with open(os.path.join(td, "b", "y.txt"), "wb") as f:
+                f.write(b"y")
+
+            before = build_hash_tree(td)
+            self.assertEqual(before["digest"], calculate_dir_hash(td))
+            with open(os.path.join(td, "a", "x.txt"), "wb") as f:
+                f.write(b"changed")
+            after = build_hash_tree(td)
+
+            self.assertNotEqual(after["digest"], before["digest"])
+            self.assertNotEqual(after["children"]["a"]["digest"], before["children"]["a"]["digest"])
+            self.assertEqual(after["children"]["b"]["digest"], before["children"]["b"]["digest"])
+
+
+class TestManifest(unittest.TestCase):
+    def test_build_manifest_sorted_with_sizes_and_ignores(self):
+        with tempfile.TemporaryDirectory() as td:
+            os.makedirs(os.path.join(td, "d", "node_modules"))
+            with open(os.path.join(td, "b.txt"), "wb") as f:
+                f.write(b"bb")
+            with open(os.path.join(td, "d", "a.txt"), "wb") as f:
+                f.write(b"a")
+            with open(os.path.join(td, "d", "node_modules", "x.js"), "wb") as f:
+                f.write(b"x")
+
+            self.assertEqual(
+                build_manifest(td, GitIgnoreMatcher(["node_modules/"])),
+                [("b.txt", 2), ("d/a.txt", 1)],
+            )
+            self.assertIsNone(build_manifest(os.path.join(td, "missing")))
+
 
 class TestHistory(unittest.TestCase):
     def test_history_dedup_normcase(self):
@@ -50,6 +121,28 @@ class TestHistory(unittest.TestCase):
         self.assertEqual(len(hm.data["skills_dirs"]), 1)
 
 
+class TestHardlinkProbe(unittest.TestCase):
+    def test_can_hardlink_leaves_no_probe_behind(self):
+        with tempfile.TemporaryDirectory() as td:
+            self.assertTrue(can_hardlink(td))
+            self.assertEqual(os.listdir(td), [])
+
+
+class TestCacheFile(unittest.TestCase):
+    def test_write_replaces_without_leftovers(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "sub", "cache.json")
+            write_cache_file(path, json.dumps({"v": 1}))
+            write_cache_file(path, json.dumps({"v": 2}))
+            with open(path, "r", encoding="utf-8") as f:
+                self.assertEqual(json.load(f), {"v": 2})
+            self.assertEqual(os.listdir(os.path.dirname(path)), ["cache.json"])
+
+    def test_pair_key_normalises_paths(self):
+        with tempfile.TemporaryDirectory() as td:
+            self.assertEqual(pair_key(td, os.path.join(td, "t", "..", "t")), pair_key(td + os.sep, os.path.join(td, "t")))
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+
+from src.utils.gitignore import GitIgnoreMatcher
+from src.utils.walk import walk_tree
+
+
+class TestWalkTree(unittest.TestCase):
+    def test_prunes_ignored_directories(self):
+        with tempfile.TemporaryDirectory() as td:
+            os.makedirs(os.path.join(td, "node_modules", "pkg"))
+            os.makedirs(os.path.join(td, "src"))
+            with open(os.path.join(td, "src", "a.py"), "w", encoding="utf-8") as f:
+                f.write("a")
+
+            seen = {rel: is_dir for rel, _, is_dir in walk_tree(td, GitIgnoreMatcher(["node_modules/"]))}
+            self.assertEqual(seen, {"src": True, "src/a.py": False})
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "symlinks not supported")
+    def test_symlink_loops_are_not_followed(self):
+        with tempfile.TemporaryDirectory() as td:
+            os.makedirs(os.path.join(td, "a"))
+            os.makedirs(os.path.join(td, "b"))
+            with open(os.path.join(td, "b", "f.txt"), "w", encoding="utf-8") as f:
+                f.write("f")
+            try:
+                os.symlink(td, os.path.join(td, "a", "up"), target_is_directory=True)
+                os.symlink(os.path.join(td, "b"), os.path.join(td, "a", "to_b"), target_is_directory=True)
+                os.symlink(os.path.join(td, "a"), os.path.join(td, "b", "to_a"), target_is_directory=True)
+            except OSError:
+                self.skipTest("cannot create symlinks")
+
+            rels = sorted(rel for rel, _, _ in walk_tree(td))
+            self.assertIn("a/up", rels)
+            self.assertNotIn("a/up/a", rels)
+            self.assertIn("a/to_b/f.txt", rels)
+            self.assertIn("a/to_b/to_a", rels)
+            self.assertNotIn("a/to_b/to_a/to_b", rels)
+            self.assertIn("b/to_a/to_b", rels)
+            self.assertNotIn("b/to_a/to_b/f.txt", rels)
+
+
+if __name__ == "__main__":
+    unittest.main()
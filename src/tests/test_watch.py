@@ -0,0 +1,123 @@
+import os
+import queue
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from src.core.compare import build_skills_right_rows
+import src.core.watch as watch_mod
+from src.core.watch import PollingBackend, SkillsWatcher, _load_libc
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(data)
+
+
+class TestSkillsWatcher(unittest.TestCase):
+    def _fixture(self, skills_dir, target_dir):
+        _write(os.path.join(skills_dir, "g1", "s1", "SKILL.md"), "one")
+        _write(os.path.join(skills_dir, "s2", "SKILL.md"), "two")
+        _write(os.path.join(target_dir, "s1", "SKILL.md"), "one")
+        rows, _ = build_skills_right_rows(skills_dir, target_dir)
+        return rows
+
+    def test_classify_maps_paths_to_skills(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            rows = self._fixture(skills_dir, target_dir)
+            watcher = SkillsWatcher(skills_dir, target_dir, rows, lambda *a: None)
+
+            rels, structure = watcher.classify(
+                [
+                    os.path.join(skills_dir, "g1", "s1", "SKILL.md"),
+                    os.path.join(target_dir, "s1", "deep", "x.txt"),
+                ]
+            )
+            self.assertEqual(rels, {"g1/s1"})
+            self.assertFalse(structure)
+
+            os.makedirs(os.path.join(target_dir, "s2"))
+            rels, structure = watcher.classify([os.path.join(target_dir, "s2")])
+            self.assertEqual(rels, set())
+            self.assertTrue(structure)
+
+            rels, structure = watcher.classify([os.path.join(skills_dir, "g1")])
+            self.assertTrue(structure)
+
+            staging = os.path.join(target_dir, ".s1.staging-abc")
+            os.makedirs(staging)
+            rels, structure = watcher.classify([staging, os.path.join(target_dir, ".skills-trash")])
+            self.assertEqual(rels, set())
+            self.assertFalse(structure)
+
+    def test_polling_ignores_hidden_entries_in_target_dir(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            self._fixture(skills_dir, target_dir)
+            backend = PollingBackend([(target_dir, False)], threading.Event())
+            os.makedirs(os.path.join(target_dir, ".s1.staging-abc"))
+            self.assertEqual(backend.poll(0), set())
+            os.makedirs(os.path.join(target_dir, "s3"))
+            self.assertEqual(backend.poll(0), {target_dir})
+
+    def _assert_reports_change(self, use_inotify):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            rows = self._fixture(skills_dir, target_dir)
+            events = queue.Queue()
+            watcher = SkillsWatcher(
+                skills_dir,
+                target_dir,
+                rows,
+                lambda rels, structure: events.put((rels, structure)),
+                interval=0.1,
+                use_inotify=use_inotify,
+            )
+            watcher.start()
+            try:
+                time.sleep(0.3)
+                _write(os.path.join(target_dir, "s1", "SKILL.md"), "changed content")
+                rels, structure = events.get(timeout=5)
+            finally:
+                watcher.stop()
+            self.assertEqual(rels, {"g1/s1"})
+            self.assertFalse(structure)
+            return watcher.backend_name
+
+    def test_polling_backend_reports_changed_skill(self):
+        self.assertEqual(self._assert_reports_change(use_inotify=False), "polling")
+
+    @unittest.skipIf(_load_libc() is None, "inotify not available")
+    def test_inotify_backend_reports_changed_skill(self):
+        self.assertEqual(self._assert_reports_change(use_inotify=True), "inotify")
+
+    @unittest.skipIf(_load_libc() is None, "inotify not available")
+    def test_failed_inotify_falls_back_to_polling(self):
+        with tempfile.TemporaryDirectory() as skills_dir, tempfile.TemporaryDirectory() as target_dir:
+            rows = self._fixture(skills_dir, target_dir)
+            events = queue.Queue()
+            watcher = SkillsWatcher(
+                skills_dir,
+                target_dir,
+                rows,
+                lambda rels, structure: events.put((rels, structure)),
+                interval=0.1,
+            )
+            with mock.patch.object(
+                watch_mod.InotifyBackend, "poll", side_effect=OSError(28, "No space left on device")
+            ):
+                watcher.start()
+                try:
+                    self.assertEqual(events.get(timeout=5), (set(), True))
+                    time.sleep(0.3)
+                    _write(os.path.join(target_dir, "s1", "SKILL.md"), "changed content")
+                    rels, structure = events.get(timeout=5)
+                finally:
+                    watcher.stop()
+            self.assertEqual(watcher.backend_name, "polling")
+            self.assertEqual(rels, {"g1/s1"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,16 @@
 from .platform.deps import ctk
 from .pages import HomePage, InstallSkillsPage, MCPManagerPage, SkillsManagerPage
 from .utils.window_utils import center_window
+from ..config import app_config
+from ..core.catalog import SkillCatalog
+from ..core.compare_cache import CompareCache
+from ..core.group_signatures import GroupSignatureCache
 from ..core.history import HistoryManager
+from ..core.store import SkillStore
+from ..core.trash import SkillTrash
+from ..utils.fs import set_hasher
+from ..utils.hash_cache import HashCache
+from ..utils.hashing import FileHasher
 from .dialogs import LoadingOverlay
 
 
@@ -12,13 +21,39 @@ class SkillsManagerAppV3(ctk.CTk):
         center_window(self, 1000, 750)
 
         self.history_manager = HistoryManager()
+        try:
+            set_hasher(
+                FileHasher(
+                    app_config.hash_algorithm,
+                    app_config.hash_block_size(),
+                    app_config.hash_mmap_threshold(),
+                )
+            )
+        except ValueError as e:
+            print(f"Invalid hashing settings, using defaults: {e}")
+        self.hash_cache = HashCache()
+        self.skill_catalog = SkillCatalog()
+        self.compare_cache = CompareCache()
+        self.group_signatures = GroupSignatureCache()
+        self.skill_store = SkillStore(app_config.skill_store_dir) if app_config.skill_store_enabled else None
+        self.skill_trash = SkillTrash()
+        # Measured import throughput in bytes/s, used for sync plan estimates.
+        self.copy_rate = None
         self.container = ctk.CTkFrame(self, fg_color="transparent")
         self.container.pack(fill="both", expand=True)
         self.current_frame = None
         self.loading_overlay = None
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
         self.show_home()
 
+    def on_close(self):
+        if self.current_frame:
+            self.current_frame.destroy()
+            self.current_frame = None
+        self.skill_trash.flush()
+        self.destroy()
+
     def show_loading(self, message="正在加载..."):
         if self.loading_overlay:
             self.loading_overlay.destroy()
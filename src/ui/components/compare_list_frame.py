@@ -9,8 +9,20 @@ class CompareListFrame(ctk.CTkScrollableFrame):
     def __init__(self, master, skills_dir=None, **kwargs):
         super().__init__(master, **kwargs)
         self.rows = []
+        self.row_index = {}
         self.groups = {}
         self.skills_dir = skills_dir
+        self.on_view_change = None
+        self._view_change_job = None
+
+        canvas = getattr(self, "_parent_canvas", None)
+        scrollbar = getattr(self, "_scrollbar", None)
+        if canvas is not None and scrollbar is not None:
+            def on_scroll(*args):
+                scrollbar.set(*args)
+                self.schedule_view_change()
+
+            canvas.configure(yscrollcommand=on_scroll)
 
     def add_header(self, columns):
         header_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -126,6 +138,7 @@ class CompareListFrame(ctk.CTkScrollableFrame):
             group["content"].pack(fill="x", padx=(10, 0))
             group["arrow_btn"].configure(text="▼")
             group["expanded"] = True
+        self.schedule_view_change()
 
     def expand_all(self):
         for name in self.groups:
@@ -134,6 +147,7 @@ class CompareListFrame(ctk.CTkScrollableFrame):
                 group["content"].pack(fill="x", padx=(10, 0))
                 group["arrow_btn"].configure(text="▼")
                 group["expanded"] = True
+        self.schedule_view_change()
 
     def collapse_all(self):
         for name in self.groups:
@@ -142,6 +156,46 @@ class CompareListFrame(ctk.CTkScrollableFrame):
                 group["content"].pack_forget()
                 group["arrow_btn"].configure(text="▶")
                 group["expanded"] = False
+        self.schedule_view_change()
+
+    def schedule_view_change(self):
+        if self.on_view_change is None or self._view_change_job is not None:
+            return
+
+        def fire():
+            self._view_change_job = None
+            if self.on_view_change is not None:
+                try:
+                    self.on_view_change()
+                except Exception:
+                    pass
+
+        # Scrolling produces a stream of events; report the settled view once.
+        self._view_change_job = self.after(100, fire)
+
+    def expanded_keys(self):
+        keys = []
+        for key, row in self.row_index.items():
+            group = self.groups.get(row["group"]) if row["group"] else None
+            if group is None or group["expanded"]:
+                keys.append(key)
+        return keys
+
+    def visible_keys(self):
+        canvas = getattr(self, "_parent_canvas", None)
+        if canvas is None:
+            return []
+        top = canvas.winfo_rooty()
+        bottom = top + canvas.winfo_height()
+        keys = []
+        for key, row in self.row_index.items():
+            frame = row["row_frame"]
+            if not frame.winfo_ismapped():
+                continue
+            y = frame.winfo_rooty()
+            if y + frame.winfo_height() >= top and y <= bottom:
+                keys.append(key)
+        return keys
 
     def add_row(
         self,
@@ -190,29 +244,7 @@ class CompareListFrame(ctk.CTkScrollableFrame):
 
         row_frame.bind("<Button-1>", toggle_check)
 
-        status_text = data.get("status", "")
-        status_clean = (
-            status_text.replace("✅ ", "")
-            .replace("🆕 ", "")
-            .replace("⚠️ ", "")
-            .strip()
-        )
-
-        badge_bg = "gray"
-        badge_text = "white"
-
-        if "一致" in status_text:
-            badge_bg = COLORS["neutral_bg"]
-            badge_text = COLORS["neutral_text"]
-            status_clean = "一致"
-        elif "新增" in status_text:
-            badge_bg = COLORS["success_bg"]
-            badge_text = COLORS["success_text"]
-            status_clean = "新增"
-        elif "差异" in status_text:
-            badge_bg = COLORS["warning_bg"]
-            badge_text = COLORS["warning_text"]
-            status_clean = "差异"
+        badge_bg, badge_text, status_clean = self._status_badge(data.get("status", ""))
 
         status_frame = ctk.CTkFrame(row_frame, fg_color=badge_bg, corner_radius=10, height=24)
         status_frame.pack(side="right", padx=(5, 10))
@@ -220,31 +252,20 @@ class CompareListFrame(ctk.CTkScrollableFrame):
         status_frame.bind("<Leave>", on_leave)
         status_frame.bind("<Button-1>", toggle_check)
 
-        ctk.CTkLabel(
+        status_label = ctk.CTkLabel(
             status_frame,
             text=f" {status_clean} ",
             text_color=badge_text,
             font=("Segoe UI", 11, "bold"),
-        ).pack(padx=8, pady=2)
+        )
+        status_label.pack(padx=8, pady=2)
 
         for child in status_frame.winfo_children():
             child.bind("<Button-1>", toggle_check)
 
+        diff_btn = None
         if diff_command:
-            diff_btn = ctk.CTkButton(
-                row_frame,
-                text="👁️",
-                width=30,
-                height=24,
-                command=diff_command,
-                fg_color="transparent",
-                hover_color=("gray80", "gray40"),
-                text_color=COLORS["text_sub"],
-                font=("Segoe UI", 14),
-            )
-            diff_btn.pack(side="right", padx=5)
-            diff_btn.bind("<Enter>", on_enter)
-            diff_btn.bind("<Leave>", on_leave)
+            diff_btn = self._make_diff_button(row_frame, status_frame, diff_command, on_enter, on_leave)
 
         name_color = COLORS["text_nested"] if group else COLORS["text_link"]
 
@@ -279,7 +300,84 @@ class CompareListFrame(ctk.CTkScrollableFrame):
             lbl.bind("<Leave>", on_leave)
             lbl.bind("<Button-1>", toggle_check)
 
-        self.rows.append({"checkbox": checkbox, "data": data})
+        row = {
+            "checkbox": checkbox,
+            "data": data,
+            "row_frame": row_frame,
+            "status_frame": status_frame,
+            "status_label": status_label,
+            "diff_btn": diff_btn,
+            "hover": (on_enter, on_leave),
+            "group": group,
+        }
+        self.rows.append(row)
+        self.row_index[data.get("rel_path", data["name"])] = row
+
+    def _status_badge(self, status_text):
+        status_clean = (
+            status_text.replace("✅ ", "")
+            .replace("🆕 ", "")
+            .replace("⚠️ ", "")
+            .replace("⏳ ", "")
+            .strip()
+        )
+
+        badge_bg = "gray"
+        badge_text = "white"
+
+        if "一致" in status_text:
+            badge_bg = COLORS["neutral_bg"]
+            badge_text = COLORS["neutral_text"]
+            status_clean = "一致"
+        elif "新增" in status_text:
+            badge_bg = COLORS["success_bg"]
+            badge_text = COLORS["success_text"]
+            status_clean = "新增"
+        elif "差异" in status_text:
+            badge_bg = COLORS["warning_bg"]
+            badge_text = COLORS["warning_text"]
+            status_clean = "差异"
+        elif "检查中" in status_text:
+            badge_bg = COLORS["neutral_bg"]
+            badge_text = COLORS["text_sub"]
+            status_clean = "检查中"
+
+        return badge_bg, badge_text, status_clean
+
+    def _make_diff_button(self, row_frame, status_frame, diff_command, on_enter, on_leave):
+        diff_btn = ctk.CTkButton(
+            row_frame,
+            text="👁️",
+            width=30,
+            height=24,
+            command=diff_command,
+            fg_color="transparent",
+            hover_color=("gray80", "gray40"),
+            text_color=COLORS["text_sub"],
+            font=("Segoe UI", 14),
+        )
+        diff_btn.pack(side="right", padx=5, after=status_frame)
+        diff_btn.bind("<Enter>", on_enter)
+        diff_btn.bind("<Leave>", on_leave)
+        return diff_btn
+
+    def set_row_status(self, key, status_text, diff_command=None):
+        row = self.row_index.get(key)
+        if not row:
+            return
+        row["data"]["status"] = status_text
+        badge_bg, badge_text, status_clean = self._status_badge(status_text)
+        row["status_frame"].configure(fg_color=badge_bg)
+        row["status_label"].configure(text=f" {status_clean} ", text_color=badge_text)
+
+        if row["diff_btn"] is not None:
+            row["diff_btn"].destroy()
+            row["diff_btn"] = None
+        if diff_command:
+            on_enter, on_leave = row["hover"]
+            row["diff_btn"] = self._make_diff_button(
+                row["row_frame"], row["status_frame"], diff_command, on_enter, on_leave
+            )
 
     def get_checked_items(self):
         return [row["data"] for row in self.rows if row["checkbox"].get() == 1]
@@ -288,6 +386,7 @@ class CompareListFrame(ctk.CTkScrollableFrame):
         for widget in self.winfo_children():
             widget.destroy()
         self.rows = []
+        self.row_index = {}
         self.groups = {}
 
     def set_message(self, message):
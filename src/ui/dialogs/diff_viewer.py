@@ -9,7 +9,7 @@ from ..utils.window_utils import center_window_relative
 
 
 class DiffViewerDialog(ctk.CTkToplevel):
-    def __init__(self, parent, skill_name, source_path, target_path):
+    def __init__(self, parent, skill_name, source_path, target_path, hash_cache=None):
         super().__init__(parent)
         self.title(f"差异对比: {skill_name}")
         center_window_relative(self, parent, 1000, 800)
@@ -20,6 +20,7 @@ class DiffViewerDialog(ctk.CTkToplevel):
 
         self.source_path = source_path
         self.target_path = target_path
+        self.hash_cache = hash_cache
 
         self.grid_columnconfigure(0, weight=1)
         self.grid_columnconfigure(1, weight=3)
@@ -69,7 +70,9 @@ class DiffViewerDialog(ctk.CTkToplevel):
             pass
 
     def analyze_files(self):
-        self.diff_files = collect_diff_files(self.source_path, self.target_path)
+        self.diff_files = collect_diff_files(
+            self.source_path, self.target_path, hash_cache=self.hash_cache
+        )
         self.lbl_files.configure(text=f"变动文件 ({len(self.diff_files)})")
 
         for f, status in self.diff_files:
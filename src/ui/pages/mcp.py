@@ -5,6 +5,7 @@ from tkinter import messagebox
 from ...config import app_config
 from ...core.actions import delete_mcp_servers, import_mcp_servers, save_mcp_target
 from ...core.compare import build_mcp_right_rows, read_mcp_current_data
+from ...core.jobs import JobCancelled, RefreshJobs
 from ..components import CompareListFrame
 from ..platform.deps import ctk
 from ..dialogs import DescriptionDialog, TextDiffDialog
@@ -50,30 +51,49 @@ class MCPManagerPage(ctk.CTkFrame):
             command=self.import_selected,
         ).pack(fill="x", padx=10, pady=10)
 
+        self.refresh_jobs = RefreshJobs()
         self.after(100, self.refresh_all)
 
+    def destroy(self):
+        self.refresh_jobs.cancel()
+        super().destroy()
+
     def refresh_all(self):
+        generation, cancel = self.refresh_jobs.start()
         self.controller.show_loading("正在加载 MCP 配置...")
-        threading.Thread(target=self._refresh_thread, daemon=True).start()
+        threading.Thread(target=self._refresh_thread, args=(generation, cancel), daemon=True).start()
+
+    def _post(self, generation, callback):
+        def run():
+            if self.refresh_jobs.is_current(generation):
+                callback()
+
+        try:
+            self.after(0, run)
+        except Exception:
+            pass
 
-    def _refresh_thread(self):
+    def _refresh_thread(self, generation, cancel):
         try:
             current_data, left_items = read_mcp_current_data(self.target_file)
+            cancel.check()
             right_rows, error_msg = build_mcp_right_rows(app_config.mcp_settings_file, current_data)
 
             if right_rows:
                 for row in right_rows:
                     row["color"] = status_to_color(row.get("status", ""), COLORS)
 
-            self.after(
-                0,
+            self._post(
+                generation,
                 lambda: self._update_ui(
                     current_data, left_items, right_rows or [], error_msg
                 ),
             )
 
+        except JobCancelled:
+            pass
         except Exception as e:
-            self.after(0, lambda: self.controller.hide_loading())
+            self._post(generation, lambda: self.controller.hide_loading())
             print(f"Error in refresh thread: {e}")
 
     def _update_ui(self, current_data, left_items, right_rows, error_msg):
@@ -1,9 +1,31 @@
+import os
 import threading
+import time
+import tkinter as tk
 from tkinter import messagebox
 
 from ...config import app_config
-from ...core.actions import delete_skill_dirs, import_skills_to_target
-from ...core.compare import build_skills_right_rows, collect_target_skill_dirs
+from ...core.actions import iter_import_events
+from ...core.compare import (
+    COMPARE_FULL,
+    COMPARE_QUICK,
+    STATUS_CHECKING,
+    collect_target_skill_dirs,
+    compare_skill_dirs,
+    iter_skills_right_rows,
+    iter_verified_rows,
+    quick_compare_skill_dirs,
+)
+from ...core.jobs import JobCancelled, RefreshJobs
+from ...core.plan import estimate_seconds, plan_delete, plan_import
+from ...core.scheduler import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_EXPANDED,
+    PRIORITY_VISIBLE,
+    PriorityScheduler,
+)
+from ...core.sync import purge_stale_stages
+from ...core.watch import SkillsWatcher
 from ...utils.fs import get_skill_description
 from ..components import CompareListFrame
 from ..platform.deps import ctk
@@ -30,7 +52,28 @@ class SkillsManagerPage(ctk.CTkFrame):
         content = ctk.CTkFrame(self, fg_color="transparent")
         content.pack(fill="both", expand=True, padx=20, pady=(0, 20))
 
-        _, self.left_list = build_left_card(content, "📂 当前项目 (本地)", self.icon_del, self.delete_selected)
+        left_card, self.left_list = build_left_card(
+            content, "📂 当前项目 (本地)", self.icon_del, self.delete_selected
+        )
+
+        self.undo_frame = ctk.CTkFrame(left_card, fg_color="transparent")
+        self.undo_label = ctk.CTkLabel(
+            self.undo_frame, text="", font=("Segoe UI", 10), text_color="gray"
+        )
+        self.undo_label.pack(side="left")
+        ctk.CTkButton(
+            self.undo_frame,
+            text="撤销",
+            width=60,
+            height=20,
+            font=("Segoe UI", 10),
+            fg_color="transparent",
+            border_width=1,
+            text_color="gray",
+            command=self.undo_delete,
+        ).pack(side="right")
+        self.undo_batch = None
+        self.undo_hide_job = None
 
         right_card = ctk.CTkFrame(content, fg_color=("white", "gray20"), corner_radius=10)
         right_card.pack(side="right", fill="both", expand=True, padx=(10, 0))
@@ -41,11 +84,45 @@ class SkillsManagerPage(ctk.CTkFrame):
         ctk.CTkLabel(right_header, text="☁️ 可用 Skills (源)", font=("Segoe UI", 14, "bold")).pack(
             side="left"
         )
+        self.cache_label = ctk.CTkLabel(
+            right_header, text="", font=("Segoe UI", 10), text_color="gray"
+        )
+        self.cache_label.pack(side="left", padx=10)
+
+        self.watch_var = tk.BooleanVar(value=False)
+        ctk.CTkSwitch(
+            right_header,
+            text="监视变更",
+            variable=self.watch_var,
+            font=("Segoe UI", 10),
+            command=self.toggle_watch,
+        ).pack(side="right", padx=5)
+
+        self.quick_var = tk.BooleanVar(value=app_config.compare_mode == COMPARE_QUICK)
+        ctk.CTkSwitch(
+            right_header,
+            text="快速比较",
+            variable=self.quick_var,
+            font=("Segoe UI", 10),
+            command=self.toggle_compare_mode,
+        ).pack(side="right", padx=5)
 
         self.right_list = CompareListFrame(right_card, skills_dir=app_config.skills_dir)
         self.right_list.pack(fill="both", expand=True, padx=10, pady=5)
         self.right_list.add_header([("选择", 4), ("名称", 15), ("状态", 8), ("操作", 5)])
+        self.right_list.on_view_change = self._on_view_change
 
+        ctk.CTkButton(
+            right_header,
+            text="校验选中",
+            width=60,
+            height=20,
+            font=("Segoe UI", 10),
+            fg_color="transparent",
+            border_width=1,
+            text_color="gray",
+            command=self.verify_selected,
+        ).pack(side="right", padx=5)
         ctk.CTkButton(
             right_header,
             text="全部展开",
@@ -69,38 +146,221 @@ class SkillsManagerPage(ctk.CTkFrame):
             command=self.right_list.collapse_all,
         ).pack(side="right", padx=5)
 
-        ctk.CTkButton(
+        self.import_btn = ctk.CTkButton(
             right_card,
             text=" 导入 / 更新选中",
             image=self.icon_import,
             fg_color=COLORS["primary"],
             command=self.import_selected,
-        ).pack(fill="x", padx=10, pady=10)
+        )
+        self.import_btn.pack(fill="x", padx=10, pady=10)
+
+        self.progress_frame = ctk.CTkFrame(right_card, fg_color="transparent")
+        self.progress_bar = ctk.CTkProgressBar(self.progress_frame, mode="determinate")
+        self.progress_bar.pack(fill="x", pady=(0, 4))
+        self.progress_label = ctk.CTkLabel(
+            self.progress_frame, text="", font=("Segoe UI", 10), text_color="gray"
+        )
+        self.progress_label.pack(anchor="w")
+        self.importing = False
+        self.deleting = False
 
+        self.refresh_jobs = RefreshJobs()
+        self.watcher = None
+        self.rows_by_rel = {}
+        self.showing_cached = False
+        self.scheduler = None
         self.after(100, self.refresh_all)
+        threading.Thread(
+            target=self.controller.skill_trash.purge_stale, args=(target_dir,), daemon=True
+        ).start()
+        threading.Thread(target=purge_stale_stages, args=(target_dir,), daemon=True).start()
+
+    def destroy(self):
+        self.refresh_jobs.cancel()
+        self._stop_watcher()
+        super().destroy()
+
+    def toggle_watch(self):
+        if self.watch_var.get():
+            self._start_watcher()
+        else:
+            self._stop_watcher()
+
+    def _start_watcher(self):
+        self._stop_watcher()
+        rows = list(self.rows_by_rel.values())
+        if not rows:
+            return
+        self.watcher = SkillsWatcher(app_config.skills_dir, self.target_dir, rows, self._on_watch_change)
+        self.watcher.start()
+
+    def _stop_watcher(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+    def toggle_compare_mode(self):
+        app_config.compare_mode = COMPARE_QUICK if self.quick_var.get() else COMPARE_FULL
+        try:
+            app_config.save()
+        except Exception as e:
+            print(f"Error saving config: {e}")
+        self.refresh_all()
+
+    def verify_selected(self):
+        rows = []
+        for item in self.right_list.get_checked_items():
+            row = self.rows_by_rel.get(item.get("rel_path"))
+            if row and os.path.exists(row["t_path"]):
+                rows.append(row)
+        generation, cancel = self.refresh_jobs.current()
+        if not rows or cancel is None:
+            return
+        for row in rows:
+            self.right_list.set_row_status(row["rel_path"], STATUS_CHECKING)
+        threading.Thread(
+            target=self._verify_thread, args=(generation, cancel, rows), daemon=True
+        ).start()
+
+    def _verify_thread(self, generation, cancel, rows):
+        try:
+            for row in iter_verified_rows(
+                rows, self.controller.hash_cache, app_config.compare_workers, cancel
+            ):
+                self._post(generation, lambda row=row: self._update_row(row))
+            self.controller.hash_cache.save()
+        except JobCancelled:
+            pass
+        except Exception as e:
+            print(f"Error in verify thread: {e}")
+
+    def _on_watch_change(self, rel_paths, structure_changed):
+        if structure_changed:
+            try:
+                self.after(0, self.refresh_all)
+            except Exception:
+                pass
+            return
+
+        generation, cancel = self.refresh_jobs.current()
+        if cancel is None:
+            return
+        try:
+            for rel_path in sorted(rel_paths):
+                row = self.rows_by_rel.get(rel_path)
+                if not row:
+                    continue
+                row = dict(row)
+                if app_config.compare_mode == COMPARE_QUICK:
+                    row["status"], row["is_diff"] = quick_compare_skill_dirs(
+                        row["s_path"], row["t_path"], cancel
+                    )
+                    row["verified"] = False
+                else:
+                    row["status"], row["is_diff"] = compare_skill_dirs(
+                        row["s_path"], row["t_path"], self.controller.hash_cache, cancel
+                    )
+                self._post(generation, lambda row=row: self._update_row(row))
+            self.controller.hash_cache.save()
+        except JobCancelled:
+            pass
 
     def refresh_all(self):
-        self.controller.show_loading("正在加载 Skills...")
-        threading.Thread(target=self._refresh_thread, daemon=True).start()
+        generation, cancel = self.refresh_jobs.start()
+        self.scheduler = PriorityScheduler()
+        cached_rows = None
+        if not self.rows_by_rel:
+            cached_rows = self.controller.compare_cache.get(app_config.skills_dir, self.target_dir)
+        if cached_rows:
+            # Stale-while-revalidate: draw the last result now, fix it up as
+            # the background comparison reports back.
+            for row in cached_rows:
+                row["color"] = status_to_color(row.get("status", ""), COLORS)
+            self._update_ui(collect_target_skill_dirs(self.target_dir), cached_rows, None)
+            self.showing_cached = True
+            self.cache_label.configure(text="🕓 缓存结果 · 校验中...")
+        else:
+            self.controller.show_loading("正在加载 Skills...")
+        threading.Thread(
+            target=self._refresh_thread, args=(generation, cancel, self.scheduler), daemon=True
+        ).start()
+
+    def _post(self, generation, callback):
+        def run():
+            if self.refresh_jobs.is_current(generation):
+                callback()
 
-    def _refresh_thread(self):
+        try:
+            self.after(0, run)
+        except Exception:
+            pass
+
+    def _on_view_change(self):
+        if self.scheduler is None:
+            return
+        priorities = {key: PRIORITY_BACKGROUND for key in self.rows_by_rel}
+        priorities.update((key, PRIORITY_EXPANDED) for key in self.right_list.expanded_keys())
+        priorities.update((key, PRIORITY_VISIBLE) for key in self.right_list.visible_keys())
+        self.scheduler.set_priorities(priorities)
+
+    def _refresh_thread(self, generation, cancel, scheduler):
         try:
             target_skills = collect_target_skill_dirs(self.target_dir)
 
-            right_rows, error_msg = build_skills_right_rows(app_config.skills_dir, self.target_dir)
-            if right_rows:
-                for row in right_rows:
-                    row["color"] = status_to_color(row.get("status", ""), COLORS)
+            events = iter_skills_right_rows(
+                app_config.skills_dir,
+                self.target_dir,
+                self.controller.hash_cache,
+                workers=app_config.compare_workers,
+                catalog=self.controller.skill_catalog,
+                cancel=cancel,
+                process_pool_threshold=app_config.process_pool_threshold(),
+                scheduler=scheduler,
+                group_signatures=self.controller.group_signatures,
+                mode=app_config.compare_mode,
+            )
+            final_rows = None
+            for event in events:
+                if event[0] == "error":
+                    self._post(generation, lambda msg=event[1]: self._update_ui(target_skills, [], msg))
+                elif event[0] == "rows":
+                    final_rows = event[1]
+                    right_rows = [dict(row) for row in event[1]]
+                    for row in right_rows:
+                        row["color"] = status_to_color(row.get("status", ""), COLORS)
+                    self._post(generation, lambda rows=right_rows: self._show_rows(target_skills, rows))
+                else:
+                    self._post(generation, lambda row=dict(event[2]): self._update_row(row))
 
-            self.after(0, lambda: self._update_ui(target_skills, right_rows or [], error_msg))
+            self._post(generation, self._finish_revalidate)
+            if final_rows is not None:
+                self.controller.compare_cache.put(app_config.skills_dir, self.target_dir, final_rows)
+                self.controller.compare_cache.save()
+            self.controller.skill_catalog.save()
+            self.controller.hash_cache.save()
+            self.controller.group_signatures.save()
 
+        except JobCancelled:
+            pass
         except Exception as e:
-            self.after(0, lambda: self.controller.hide_loading())
+            self._post(generation, lambda: self.controller.hide_loading())
+            self._post(generation, self._finish_revalidate)
             print(f"Error in refresh thread: {e}")
 
+    def _diff_command(self, row):
+        if not row["is_diff"]:
+            return None
+        return lambda s=row["name"], sp=row["s_path"], tp=row["t_path"]: DiffViewerDialog(
+            self, s, sp, tp, self.controller.hash_cache
+        )
+
     def _update_ui(self, target_skills, right_rows, error_msg):
         self.left_list.clear()
         self.right_list.clear()
+        self.rows_by_rel = {row["rel_path"]: row for row in right_rows}
+        if self.watch_var.get():
+            self._start_watcher()
 
         for s in target_skills:
             self.left_list.add_item(s)
@@ -109,41 +369,220 @@ class SkillsManagerPage(ctk.CTkFrame):
             self.right_list.set_message(error_msg)
         else:
             for row in right_rows:
-                diff_cmd = None
-                if row["is_diff"]:
-                    diff_cmd = lambda s=row["name"], sp=row["s_path"], tp=row["t_path"]: DiffViewerDialog(
-                        self, s, sp, tp
-                    )
-
                 self.right_list.add_row(
                     {"name": row["name"], "rel_path": row["rel_path"], "status": row["status"]},
                     status_color=row["color"],
-                    diff_command=diff_cmd,
+                    diff_command=self._diff_command(row),
                     name_command=lambda s=row["name"], sp=row["s_path"]: DescriptionDialog(
                         self, f"Skill: {s}", get_skill_description(sp)
                     ),
                     group=row["group"],
                 )
+            self.right_list.schedule_view_change()
 
         self.controller.hide_loading()
 
+    def _show_rows(self, target_skills, right_rows):
+        if not self.showing_cached:
+            self._update_ui(target_skills, right_rows, None)
+            return
+
+        if [row["rel_path"] for row in right_rows] != list(self.rows_by_rel):
+            # The skill set changed since the cached run; keep cached statuses
+            # for rows that are still being checked.
+            for row in right_rows:
+                cached = self.rows_by_rel.get(row["rel_path"])
+                if cached and row["status"] == STATUS_CHECKING:
+                    row["status"], row["is_diff"] = cached["status"], cached["is_diff"]
+                    row["color"] = status_to_color(row["status"], COLORS)
+            self._update_ui(target_skills, right_rows, None)
+            return
+
+        self.left_list.clear()
+        for s in target_skills:
+            self.left_list.add_item(s)
+        for row in right_rows:
+            if row["status"] != STATUS_CHECKING:
+                self._update_row(row)
+
+    def _finish_revalidate(self):
+        self.showing_cached = False
+        self.cache_label.configure(text="")
+
+    def _update_row(self, row):
+        self.rows_by_rel[row["rel_path"]] = row
+        self.right_list.set_row_status(row["rel_path"], row["status"], self._diff_command(row))
+
     def delete_selected(self):
         items = self.left_list.get_checked_items()
-        if not items:
+        if not items or self.deleting:
             return
-        if not messagebox.askyesno("确认", f"删除 {len(items)} 个 Skills？"):
+        self.deleting = True
+        # Counting the files walks every selected tree, so it stays off the
+        # Tk thread.
+        threading.Thread(target=self._plan_delete_thread, args=(items,), daemon=True).start()
+
+    def _plan_delete_thread(self, items):
+        try:
+            plan = plan_delete(self.target_dir, items)
+        except Exception as e:
+            print(f"Error planning delete: {e}")
+            plan = None
+        self._post_ui(lambda: self._confirm_delete(items, plan))
+
+    def _confirm_delete(self, items, plan):
+        self.deleting = False
+        if plan is None:
+            names = list(items)
+            detail = ""
+        else:
+            names = [skill_plan["skill"] for skill_plan in plan["skills"]]
+            detail = f"\n{plan['remove']} 个文件，释放 {plan['bytes'] / (1024 * 1024):.1f} MB"
+        if not messagebox.askyesno("确认", f"删除 {len(items)} 个 Skills？" + detail):
             return
-        errors = delete_skill_dirs(self.target_dir, items)
+        # Only renames into the trash happen here; the reaper frees the space.
+        batch_id, errors = self.controller.skill_trash.delete(self.target_dir, names)
         for name, err in errors:
             print(err)
+        if batch_id is not None:
+            self._show_undo(batch_id, len(names) - len(errors))
+        self.refresh_all()
+
+    def _show_undo(self, batch_id, count):
+        self.undo_batch = batch_id
+        self.undo_label.configure(text=f"已删除 {count} 个 Skills")
+        self.undo_frame.pack(fill="x", padx=10, pady=(0, 10))
+        if self.undo_hide_job is not None:
+            self.after_cancel(self.undo_hide_job)
+        delay_ms = int(self.controller.skill_trash.reap_delay * 1000)
+        self.undo_hide_job = self.after(delay_ms, self._hide_undo)
+
+    def _hide_undo(self):
+        self.undo_batch = None
+        self.undo_hide_job = None
+        self.undo_frame.pack_forget()
+
+    def undo_delete(self):
+        batch_id = self.undo_batch
+        if self.undo_hide_job is not None:
+            self.after_cancel(self.undo_hide_job)
+        self._hide_undo()
+        if batch_id is None:
+            return
+        errors = self.controller.skill_trash.undo(batch_id)
+        if errors:
+            lines = [f"{skill}: {err}" if skill else err for skill, err in errors[:10]]
+            messagebox.showerror("撤销失败", "\n".join(lines))
         self.refresh_all()
 
     def import_selected(self):
         items = self.right_list.get_checked_items()
-        if not items:
+        if not items or self.importing:
             return
-        errors = import_skills_to_target(app_config.skills_dir, self.target_dir, items)
-        for skill, err in errors:
-            messagebox.showerror("Error", err)
+        self.importing = True
+        self.import_btn.configure(state="disabled")
+        self.progress_bar.set(0)
+        self.progress_label.configure(text="正在生成同步计划...")
+        self.progress_frame.pack(fill="x", padx=10, pady=(0, 10))
+        threading.Thread(target=self._plan_thread, args=(items,), daemon=True).start()
+
+    def _post_ui(self, callback):
+        try:
+            self.after(0, callback)
+        except Exception:
+            pass
+
+    def _plan_thread(self, items):
+        try:
+            plan = plan_import(
+                app_config.skills_dir, self.target_dir, items, self.controller.hash_cache
+            )
+        except Exception as e:
+            error = str(e)
+            self._post_ui(lambda: self._finish_import([("", error)]))
+            return
+        self._post_ui(lambda: self._confirm_plan(items, plan))
+
+    def _confirm_plan(self, items, plan):
+        seconds = estimate_seconds(plan, self.controller.copy_rate)
+        lines = [
+            f"新增 {plan['add']} 个文件，替换 {plan['replace']} 个，删除 {plan['remove']} 个",
+            f"写入 {plan['bytes'] / (1024 * 1024):.1f} MB，预计 {max(seconds, 0.1):.1f} 秒",
+        ]
+        failed = sum(1 for skill_plan in plan["skills"] if "error" in skill_plan)
+        if not plan.get("links", True):
+            lines.append("目标磁盘不支持硬链接，未变化的文件也会被复制")
+        if failed:
+            lines.append(f"{failed} 个 Skills 无法读取")
+        if not messagebox.askyesno("同步计划", f"导入 {len(items)} 个 Skills？\n" + "\n".join(lines)):
+            self.importing = False
+            self.import_btn.configure(state="normal")
+            self.progress_frame.pack_forget()
+            return
+        self.progress_label.configure(text="准备导入...")
+        threading.Thread(target=self._import_thread, args=(items, plan), daemon=True).start()
+
+    def _import_thread(self, items, plan):
+        started = time.monotonic()
+        total_count = total_bytes = 0
+        done_count = done_bytes = copied_bytes = 0
+        errors = []
+        try:
+            events = iter_import_events(
+                app_config.skills_dir,
+                self.target_dir,
+                items,
+                self.controller.hash_cache,
+                self.controller.skill_store,
+                workers=app_config.import_workers,
+                plan=plan,
+            )
+            for event in events:
+                kind = event[0]
+                if kind == "start":
+                    total_count, total_bytes = event[1], event[2]
+                elif kind == "skill_finished":
+                    done_count += 1
+                    done_bytes += event[2]
+                    copied_bytes += event[3]
+                elif kind == "error":
+                    done_count += 1
+                    done_bytes += event[3]
+                elif kind == "done":
+                    errors = event[1]
+                    continue
+                else:
+                    continue
+
+                if total_bytes:
+                    fraction = done_bytes / total_bytes
+                else:
+                    fraction = done_count / max(total_count, 1)
+                rate = copied_bytes / max(time.monotonic() - started, 1e-6) / (1024 * 1024)
+                text = f"导入中 {done_count}/{total_count} · {rate:.1f} MB/s"
+                self._post_ui(lambda f=fraction, t=text: self._set_import_progress(f, t))
+            # Small imports are dominated by per-file overhead and would skew
+            # the rate used for the next estimate.
+            if copied_bytes >= 8 * 1024 * 1024:
+                self.controller.copy_rate = copied_bytes / max(time.monotonic() - started, 1e-6)
+            self.controller.hash_cache.save()
+        except Exception as e:
+            errors.append(("", str(e)))
+        self._post_ui(lambda: self._finish_import(errors))
+
+    def _set_import_progress(self, fraction, text):
+        self.progress_bar.set(min(max(fraction, 0.0), 1.0))
+        self.progress_label.configure(text=text)
+
+    def _finish_import(self, errors):
+        self.importing = False
+        self.import_btn.configure(state="normal")
+        self.progress_frame.pack_forget()
         self.refresh_all()
-        show_message(self, "完成", "导入完成")
+        if errors:
+            lines = [f"{skill}: {err}" if skill else err for skill, err in errors[:10]]
+            if len(errors) > 10:
+                lines.append(f"... 另有 {len(errors) - 10} 个")
+            messagebox.showerror("导入失败", f"{len(errors)} 个 Skills 导入失败:\n" + "\n".join(lines))
+        else:
+            show_message(self, "完成", "导入完成")
@@ -1,5 +1,5 @@
 def status_to_color(status_text, colors):
-    if "一致" in status_text:
+    if "一致" in status_text or "检查中" in status_text:
         return "gray"
     if "差异" in status_text:
         return colors.get("warning")
@@ -0,0 +1,37 @@
+import os
+import tempfile
+
+
+# Key for state kept per (source repo, target dir) pair.
+def pair_key(skills_dir, target_dir):
+    source = os.path.normcase(os.path.abspath(skills_dir))
+    target = os.path.normcase(os.path.abspath(target_dir))
+    return f"{source}\n{target}"
+
+
+# Replaces path with text through a temp file in the same directory, so a
+# crash never leaves a half-written cache. Caches are best effort: errors are
+# swallowed and the next load simply starts empty.
+def write_cache_file(path, text):
+    try:
+        target_dir = os.path.dirname(os.path.abspath(path))
+        os.makedirs(target_dir, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f"{os.path.splitext(os.path.basename(path))[0]}.",
+            suffix=".tmp",
+            dir=target_dir,
+            text=True,
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        finally:
+            try:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            except Exception:
+                pass
+    except Exception:
+        pass
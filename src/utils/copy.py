@@ -0,0 +1,171 @@
+import errno
+import os
+import shutil
+import sys
+import threading
+
+FICLONE = 0x40049409
+BUFFER_SIZE = 1024 * 1024
+
+COPY_REFLINK = "reflink"
+COPY_FILE_RANGE = "copy_file_range"
+COPY_SENDFILE = "sendfile"
+COPY_BUFFER = "buffer"
+
+# Errors meaning "this mechanism does not work between these two files",
+# after which the next one is tried. Anything else is a real copy error.
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EBADF,
+    errno.EPERM,
+    errno.ETXTBSY,
+    errno.EOPNOTSUPP,
+    getattr(errno, "ENOTSUP", errno.EOPNOTSUPP),
+    getattr(errno, "ENOTTY", errno.EINVAL),
+}
+
+
+def reflink_file(src, dst):
+    # Copy-on-write clone; raises OSError where the platform or filesystem
+    # cannot share extents.
+    if not sys.platform.startswith("linux"):
+        raise OSError("reflink is not supported on this platform")
+    import fcntl
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            os.remove(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+def _copy_reflink(fd_src, fd_dst, size):
+    import fcntl
+
+    fcntl.ioctl(fd_dst, FICLONE, fd_src)
+
+
+def _copy_file_range(fd_src, fd_dst, size):
+    copied = 0
+    while copied < size:
+        n = os.copy_file_range(fd_src, fd_dst, size - copied)
+        if n == 0:
+            # Some filesystems report success without copying anything.
+            raise OSError(errno.EOPNOTSUPP, "copy_file_range made no progress")
+        copied += n
+
+
+def _copy_sendfile(fd_src, fd_dst, size):
+    offset = 0
+    while offset < size:
+        n = os.sendfile(fd_dst, fd_src, offset, min(size - offset, 1 << 30))
+        if n == 0:
+            raise OSError(errno.EOPNOTSUPP, "sendfile made no progress")
+        offset += n
+
+
+_local = threading.local()
+
+
+def _copy_buffer(fd_src, fd_dst, size):
+    # One buffer per thread, reused across files.
+    buf = getattr(_local, "buf", None)
+    if buf is None:
+        buf = _local.buf = bytearray(BUFFER_SIZE)
+    view = memoryview(buf)
+    with open(fd_src, "rb", buffering=0, closefd=False) as fsrc:
+        while True:
+            n = fsrc.readinto(buf)
+            if not n:
+                break
+            written = 0
+            while written < n:
+                written += os.write(fd_dst, view[written:n])
+
+
+def _available_methods():
+    methods = []
+    if sys.platform.startswith("linux"):
+        methods.append((COPY_REFLINK, _copy_reflink))
+        if hasattr(os, "copy_file_range"):
+            methods.append((COPY_FILE_RANGE, _copy_file_range))
+        # Only Linux accepts a regular file as the sendfile destination.
+        if hasattr(os, "sendfile"):
+            methods.append((COPY_SENDFILE, _copy_sendfile))
+    methods.append((COPY_BUFFER, _copy_buffer))
+    return methods
+
+
+# Copies file data with the fastest mechanism that works between the source
+# and destination volumes: a reflink, then an in-kernel copy, then a large
+# user-space buffer. The first mechanism that succeeds for a pair of volumes
+# is remembered, so later files skip the ones that already failed there.
+class CopyBackend:
+    def __init__(self, methods=None):
+        self.methods = methods or _available_methods()
+        self._chosen = {}
+        self._lock = threading.Lock()
+
+    def method_for(self, src_dev, dst_dev):
+        with self._lock:
+            return self._chosen.get((src_dev, dst_dev))
+
+    def _candidates(self, key):
+        with self._lock:
+            chosen = self._chosen.get(key)
+        if chosen is None:
+            return self.methods
+        index = [name for name, _ in self.methods].index(chosen)
+        return self.methods[index:]
+
+    def copy_data(self, src, dst):
+        # Raw descriptors: the data never passes through Python file buffers.
+        with open(src, "rb", buffering=0) as fsrc, open(dst, "wb", buffering=0) as fdst:
+            fd_src, fd_dst = fsrc.fileno(), fdst.fileno()
+            st_src = os.fstat(fd_src)
+            key = (st_src.st_dev, os.fstat(fd_dst).st_dev)
+            if st_src.st_size == 0:
+                return None
+            candidates = self._candidates(key)
+            for index, (name, func) in enumerate(candidates):
+                try:
+                    func(fd_src, fd_dst, st_src.st_size)
+                except OSError as e:
+                    if e.errno not in _UNSUPPORTED_ERRNOS or index == len(candidates) - 1:
+                        raise
+                    os.ftruncate(fd_dst, 0)
+                    os.lseek(fd_src, 0, os.SEEK_SET)
+                    os.lseek(fd_dst, 0, os.SEEK_SET)
+                    continue
+                with self._lock:
+                    self._chosen.setdefault(key, name)
+                return name
+        return None
+
+    def copy_file(self, src, dst):
+        # Same contract as shutil.copy2, usable as a copytree copy_function.
+        if os.path.isdir(dst):
+            dst = os.path.join(dst, os.path.basename(src))
+        self.copy_data(src, dst)
+        shutil.copystat(src, dst)
+        return dst
+
+
+_backend = CopyBackend()
+
+
+def get_copy_backend():
+    return _backend
+
+
+def copy_file(src, dst):
+    return _backend.copy_file(src, dst)
+
+
+def clone_or_copy_file(src, dst):
+    copy_file(src, dst)
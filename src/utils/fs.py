@@ -1,6 +1,24 @@
-import hashlib
 import os
 import re
+import tempfile
+import threading
+
+from .hash_cache import RootHashes, entry_stat_key
+from .hashing import FileHasher
+from .walk import walk_tree
+
+_hasher = FileHasher()
+_link_support = {}
+_link_lock = threading.Lock()
+
+
+def get_hasher():
+    return _hasher
+
+
+def set_hasher(hasher):
+    global _hasher
+    _hasher = hasher
 
 
 def get_skill_description(skill_dir):
@@ -40,33 +58,165 @@ def get_skill_description(skill_dir):
         return f"读取错误: {e}"
 
 
-def calculate_dir_hash(directory, ignore_func=None):
+def _hash_file(file_path):
+    return _hasher.hash_file(file_path)
+
+
+def _file_digest(entry, rel_path, hashes):
+    try:
+        if hashes is None:
+            return _hash_file(entry.path)
+        key = entry_stat_key(entry)
+        digest = hashes.lookup(rel_path, key)
+        if digest is None:
+            digest = _hash_file(entry.path)
+            hashes.store(rel_path, key, digest)
+        return digest
+    except Exception:
+        return None
+
+
+def _entry_size(entry):
+    # DirEntry caches its stat, so after a hash cache lookup this is free.
+    try:
+        return entry.stat().st_size
+    except OSError:
+        return -1
+
+
+def _dir_digest(children):
+    digest = _hasher.new()
+    for name in sorted(children):
+        node = children[name]
+        kind = "d" if "children" in node else "f"
+        digest.update(f"{name}\0{kind}{node['digest'] or '?'}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _build_tree(directory, matcher, hashes, cancel):
+    nodes = {"": {"digest": None, "children": {}}}
+    for rel_path, entry, is_dir in walk_tree(directory, matcher):
+        if cancel is not None:
+            cancel.check()
+        if is_dir:
+            node = {"digest": None, "children": {}}
+            nodes[rel_path] = node
+        else:
+            node = {"digest": _file_digest(entry, rel_path, hashes), "size": _entry_size(entry)}
+        nodes[rel_path.rpartition("/")[0]]["children"][entry.name] = node
+
+    for rel_dir in sorted(nodes, key=lambda p: p.count("/") if p else -1, reverse=True):
+        node = nodes[rel_dir]
+        node["digest"] = _dir_digest(node["children"])
+    return nodes[""]
+
+
+def build_hash_tree(directory, matcher=None, cache=None, cancel=None):
+    if not os.path.exists(directory):
+        return None
+    hashes = cache.open_root(directory, _hasher.algorithm) if cache else None
+    tree = _build_tree(directory, matcher, hashes, cancel)
+    if hashes is not None:
+        hashes.commit()
+    return tree
+
+
+def file_digests(tree, prefix=""):
+    digests = {}
+    for name, child in tree["children"].items():
+        if "children" in child:
+            digests.update(file_digests(child, prefix + name + "/"))
+        else:
+            digests[prefix + name] = child["digest"]
+    return digests
+
+
+def hash_dir_detached(directory, matcher=None, known=None, hasher=None):
+    # Runs in worker processes: takes the cached entries of the root and hands
+    # back the refreshed ones so the parent can merge them into its HashCache.
+    # Spawned workers do not inherit the parent's hasher, so it is passed in.
+    if hasher is not None:
+        set_hasher(hasher)
+    if not os.path.exists(directory):
+        return None, {}
+    hashes = RootHashes(None, None, known or {})
+    tree = _build_tree(directory, matcher, hashes, None)
+    return tree["digest"], hashes.seen
+
+
+# Hashes a tree whose file digests are mostly known already: known maps
+# rel_path to a stat_key() + [digest] entry, and only files whose stat no
+# longer matches are read.
+def hash_tree_with(directory, matcher=None, known=None):
     if not os.path.exists(directory):
         return None
-    sha256 = hashlib.sha256()
-    for root, dirs, files in os.walk(directory):
-        if ignore_func:
-            ignored = ignore_func(root, dirs + files)
-            dirs[:] = [d for d in dirs if d not in ignored]
-            files[:] = [f for f in files if f not in ignored]
-
-        dirs.sort()
-        files.sort()
-        for d in dirs:
-            sha256.update(d.encode("utf-8"))
-        for f in files:
-            sha256.update(f.encode("utf-8"))
-            file_path = os.path.join(root, f)
-            try:
-                with open(file_path, "rb") as f_obj:
-                    while True:
-                        data = f_obj.read(4096)
-                        if not data:
-                            break
-                        sha256.update(data)
-            except Exception:
-                pass
-    return sha256.hexdigest()
+    return _build_tree(directory, matcher, RootHashes(None, None, known or {}), None)
+
+
+def calculate_dir_hash(directory, matcher=None, cache=None, cancel=None):
+    tree = build_hash_tree(directory, matcher, cache, cancel)
+    if tree is None:
+        return None
+    return tree["digest"]
+
+
+# Whether files in directory can be hardlinked, probed once per volume.
+# FAT/exFAT and some network shares cannot, and a delta sync there has to
+# copy the files it keeps as well.
+def can_hardlink(directory):
+    try:
+        dev = os.stat(directory).st_dev
+    except OSError:
+        return True
+    with _link_lock:
+        if dev in _link_support:
+            return _link_support[dev]
+    try:
+        fd, probe = tempfile.mkstemp(prefix=".link-probe.", dir=directory)
+        os.close(fd)
+    except OSError:
+        return True
+    try:
+        os.link(probe, probe + ".link")
+        os.remove(probe + ".link")
+        supported = True
+    except OSError:
+        supported = False
+    finally:
+        try:
+            os.remove(probe)
+        except OSError:
+            pass
+    with _link_lock:
+        _link_support[dev] = supported
+    return supported
+
+
+def scan_stats(directory, matcher=None, cancel=None):
+    if not os.path.exists(directory):
+        return None
+    stats = {}
+    for rel_path, entry, is_dir in walk_tree(directory, matcher):
+        if cancel is not None:
+            cancel.check()
+        if is_dir:
+            continue
+        try:
+            st = entry.stat()
+            stats[rel_path] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            stats[rel_path] = (-1, None)
+    return stats
+
+
+def manifest_from_stats(stats):
+    if stats is None:
+        return None
+    return sorted((rel_path, size) for rel_path, (size, _) in stats.items())
+
+
+def build_manifest(directory, matcher=None, cancel=None):
+    return manifest_from_stats(scan_stats(directory, matcher, cancel))
 
 
 def is_text_file(filename):
@@ -86,21 +236,3 @@ def is_text_file(filename):
         ".sh",
         ".ps1",
     ]
-
-
-def get_ignore_patterns(src_dir):
-    gitignore_path = os.path.join(src_dir, ".gitignore")
-    patterns = []
-    if os.path.exists(gitignore_path):
-        try:
-            with open(gitignore_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("#"):
-                        if line.endswith("/"):
-                            line = line[:-1]
-                        patterns.append(line)
-        except Exception:
-            pass
-    return patterns
-
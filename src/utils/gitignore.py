@@ -0,0 +1,152 @@
+import os
+import re
+import threading
+
+
+def _translate(pattern):
+    out = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        at_segment_start = i == 0 or pattern[i - 1] == "/"
+        if pattern.startswith("**/", i) and at_segment_start:
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i) and at_segment_start and i + 2 == n:
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            j = i + 1
+            if j < n and pattern[j] in "!^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j >= n:
+                out.append(re.escape(c))
+                i += 1
+                continue
+            body = pattern[i + 1 : j]
+            if body[:1] in ("!", "^"):
+                body = "^" + body[1:]
+            out.append("[" + body.replace("\\", "\\\\") + "]")
+            i = j + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+def _parse_line(line):
+    line = line.rstrip("\r\n")
+    while line.endswith(" ") and not line.endswith("\\ "):
+        line = line[:-1]
+    if not line or line.startswith("#"):
+        return None
+
+    negate = False
+    if line.startswith("!"):
+        negate = True
+        line = line[1:]
+    elif line.startswith("\\!") or line.startswith("\\#"):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    anchored = "/" in line
+    line = line.lstrip("/")
+    body = _translate(line)
+    regex = body if anchored else "(?:.*/)?" + body
+    return regex, negate, dir_only
+
+
+class GitIgnoreMatcher:
+    def __init__(self, patterns=None):
+        rules = [r for r in (_parse_line(p) for p in patterns or []) if r]
+        self.has_dir_only = any(dir_only for _, _, dir_only in rules)
+        self._negated = {}
+        self._dir_regex = self._combine(rules, include_dir_only=True)
+        self._file_regex = self._combine(rules, include_dir_only=False)
+
+    def _combine(self, rules, include_dir_only):
+        # Later rules win in gitignore, and the regex engine takes the first
+        # alternative that matches, so alternatives are emitted in reverse.
+        parts = []
+        for index in range(len(rules) - 1, -1, -1):
+            regex, negate, dir_only = rules[index]
+            if dir_only and not include_dir_only:
+                continue
+            self._negated[f"p{index}"] = negate
+            parts.append(f"(?P<p{index}>{regex})")
+        if not parts:
+            return None
+        return re.compile("^(?:" + "|".join(parts) + ")$", re.DOTALL)
+
+    def __bool__(self):
+        return self._dir_regex is not None
+
+    def match(self, rel_path, is_dir=False):
+        regex = self._dir_regex if is_dir else self._file_regex
+        if regex is None:
+            return False
+        m = regex.match(rel_path)
+        return bool(m) and not self._negated[m.lastgroup]
+
+    def copytree_ignore(self, base_dir):
+        def ignore(root, names):
+            rel_root = os.path.relpath(root, base_dir).replace("\\", "/")
+            prefix = "" if rel_root == "." else rel_root + "/"
+            ignored = set()
+            for name in names:
+                is_dir = self.has_dir_only and os.path.isdir(os.path.join(root, name))
+                if self.match(prefix + name, is_dir):
+                    ignored.add(name)
+            return ignored
+
+        return ignore
+
+
+_matcher_cache = {}
+_matcher_lock = threading.Lock()
+
+
+def read_gitignore_lines(src_dir):
+    gitignore_path = os.path.join(src_dir, ".gitignore")
+    try:
+        with open(gitignore_path, "r", encoding="utf-8") as f:
+            return [line.rstrip("\r\n") for line in f]
+    except Exception:
+        return []
+
+
+def get_ignore_matcher(src_dir):
+    gitignore_path = os.path.join(src_dir, ".gitignore")
+    try:
+        mtime = os.stat(gitignore_path).st_mtime_ns
+    except OSError:
+        mtime = None
+
+    key = os.path.normcase(os.path.abspath(src_dir))
+    with _matcher_lock:
+        cached = _matcher_cache.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    matcher = GitIgnoreMatcher(read_gitignore_lines(src_dir) if mtime is not None else [])
+    with _matcher_lock:
+        _matcher_cache[key] = (mtime, matcher)
+    return matcher
@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+import time
+
+from ..paths import HASH_CACHE_FILE
+from .cache_file import write_cache_file
+
+CACHE_VERSION = 2
+DEFAULT_ALGORITHM = "sha256"
+ROOT_TTL_SECONDS = 30 * 24 * 3600
+RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+
+
+def root_key(directory):
+    return os.path.normcase(os.path.abspath(directory))
+
+
+def stat_key(st):
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+# stat_key() of a scandir entry. On Windows DirEntry.stat() leaves st_ino at
+# 0, while inode() asks for the real file index, as os.stat() does.
+def entry_stat_key(entry):
+    st = entry.stat()
+    return [st.st_size, st.st_mtime_ns, entry.inode()]
+
+
+# Digests of one hashed directory keyed by relative path. Only entries touched
+# during the current pass survive commit(), so removed files are evicted.
+class RootHashes:
+    def __init__(self, cache, key, known, algorithm=DEFAULT_ALGORITHM):
+        self.cache = cache
+        self.key = key
+        self.known = known
+        self.algorithm = algorithm
+        self.seen = {}
+
+    def lookup(self, rel_path, key):
+        entry = self.known.get(rel_path)
+        if entry and entry[:3] == key:
+            self.seen[rel_path] = entry
+            return entry[3]
+        return None
+
+    def store(self, rel_path, key, digest):
+        # A file modified within the mtime granularity window may change again
+        # without its stat tuple changing, so it is not safe to remember yet.
+        if time.time_ns() - key[1] < RACY_WINDOW_NS:
+            return
+        self.seen[rel_path] = key + [digest]
+
+    def commit(self):
+        self.cache._commit_root(self.key, self.known, self.seen, self.algorithm)
+
+
+class HashCache:
+    def __init__(self, cache_file=None):
+        self.cache_file = cache_file or HASH_CACHE_FILE
+        self.roots = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.roots = data.get("roots", {})
+        except Exception:
+            self.roots = {}
+
+    # Digests made with another algorithm are useless, so a root hashed with a
+    # different algorithm reads as empty.
+    def _entry(self, key, algorithm):
+        with self._lock:
+            entry = self.roots.get(key) or {}
+        if entry.get("algorithm", DEFAULT_ALGORITHM) != algorithm:
+            return {}
+        return entry
+
+    def open_root(self, directory, algorithm=DEFAULT_ALGORITHM):
+        key = root_key(directory)
+        return RootHashes(self, key, self._entry(key, algorithm).get("files", {}), algorithm)
+
+    def known_files(self, directory, algorithm=DEFAULT_ALGORITHM):
+        return dict(self._entry(root_key(directory), algorithm).get("files", {}))
+
+    def merge_root(self, directory, known, seen, algorithm=DEFAULT_ALGORITHM):
+        self._commit_root(root_key(directory), known, seen, algorithm)
+
+    def _commit_root(self, key, known, seen, algorithm=DEFAULT_ALGORITHM):
+        now = time.time()
+        with self._lock:
+            old = self.roots.get(key)
+            changed = (
+                old is None
+                or old.get("algorithm", DEFAULT_ALGORITHM) != algorithm
+                or seen != known
+                or now - old.get("time", 0) > 24 * 3600
+            )
+            self.roots[key] = {
+                "time": now,
+                "algorithm": algorithm,
+                "files": seen,
+            }
+            if changed:
+                self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            now = time.time()
+            self.roots = {
+                k: v for k, v in self.roots.items() if now - v.get("time", 0) < ROOT_TTL_SECONDS
+            }
+            payload = json.dumps({"version": CACHE_VERSION, "roots": self.roots})
+            self._dirty = False
+
+        write_cache_file(self.cache_file, payload)
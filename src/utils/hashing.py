@@ -0,0 +1,67 @@
+import hashlib
+import mmap
+import os
+import threading
+
+DEFAULT_ALGORITHM = "sha256"
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+DEFAULT_MMAP_THRESHOLD = 64 * 1024 * 1024
+SUPPORTED_ALGORITHMS = ("sha256", "blake2b", "sha512", "sha1")
+
+_buffers = threading.local()
+
+
+def _read_buffer(block_size):
+    # One buffer per thread, reused for every file that thread hashes.
+    buf = getattr(_buffers, "buf", None)
+    if buf is None or len(buf) != block_size:
+        buf = bytearray(block_size)
+        _buffers.buf = buf
+        _buffers.view = memoryview(buf)
+    return buf, _buffers.view
+
+
+# Hashes whole files: a single read for files that fit in one block, a
+# reusable readinto() buffer for medium files and mmap for large ones.
+class FileHasher:
+    def __init__(
+        self,
+        algorithm=DEFAULT_ALGORITHM,
+        block_size=DEFAULT_BLOCK_SIZE,
+        mmap_threshold=DEFAULT_MMAP_THRESHOLD,
+    ):
+        if algorithm not in SUPPORTED_ALGORITHMS:
+            raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+        self.algorithm = algorithm
+        self.block_size = max(4096, int(block_size))
+        self.mmap_threshold = mmap_threshold
+
+    def new(self):
+        return hashlib.new(self.algorithm)
+
+    def hash_file(self, file_path):
+        digest = self.new()
+        with open(file_path, "rb", buffering=0) as f:
+            size = os.fstat(f.fileno()).st_size
+            if self.mmap_threshold is not None and size >= self.mmap_threshold:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        digest.update(mapped)
+                    return digest.hexdigest()
+                except (OSError, ValueError):
+                    # Some filesystems refuse mappings; fall back to reading.
+                    f.seek(0)
+                    digest = self.new()
+
+            if size < self.block_size:
+                # read() without a size runs to EOF, even if the file grew.
+                digest.update(f.read())
+                return digest.hexdigest()
+
+            buf, view = _read_buffer(self.block_size)
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                digest.update(view[:n])
+        return digest.hexdigest()
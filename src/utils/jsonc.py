@@ -1,19 +1,56 @@
 import json
 import re
 
+_LINE_COMMENT = r"//[^\n]*"
+# Unrolled so that it never backtracks, however long the comment.
+_BLOCK_COMMENT = r"/\*[^*]*\*+(?:[^/*][^*]*\*+)*/"
+# Single whitespace characters: a nested "+" here would backtrack
+# exponentially on every comma followed by indentation.
+_GAP = rf"(?:[ \t\n\r]|{_LINE_COMMENT}|{_BLOCK_COMMENT})*"
 
-def load_jsonc(file_path):
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-    pattern = r"//.*?$|/\*.*?\*/|\'(?:\\.|[^\\\'])*\'|\"(?:\\.|[^\\\"])*\""
-    regex = re.compile(pattern, re.DOTALL | re.MULTILINE)
+# One scan over the document. "keep" swallows maximal runs of plain JSON,
+# strings included (so comment markers inside strings are left alone), and
+# stops only at a comment or at a comma that is followed by nothing but
+# whitespace or comments before a closing bracket.
+_TOKENS = re.compile(
+    rf'(?P<keep>(?:[^"/,]+|"[^"\\]*(?:\\.[^"\\]*)*"|/(?![/*])|,(?!{_GAP}[}}\]]))+)'
+    rf"|{_LINE_COMMENT}|{_BLOCK_COMMENT}|,"
+)
+
+
+def _blank(match):
+    keep = match.group("keep")
+    if keep is not None:
+        return keep
+    # Same length and same line breaks, so every offset the decoder reports
+    # is also an offset into the original text.
+    text = match.group()
+    if "\n" not in text:
+        return " " * len(text)
+    return "\n".join(" " * len(line) for line in text.split("\n"))
 
-    def replacer(match):
-        s = match.group(0)
-        if s.startswith("/"):
-            return ""
-        return s
 
-    json_str = regex.sub(replacer, content)
-    return json.loads(json_str)
+# Parses JSON with // and /* */ comments and trailing commas. Plain JSON,
+# which is what this app writes back, goes straight to the json module's C
+# decoder; that attempt stops at the first comment, so it costs little when
+# it fails. Otherwise comments and trailing commas are blanked out in place
+# by a single precompiled scan and the result is decoded. Errors are raised
+# as json.JSONDecodeError with the line and column in the original text.
+def loads_jsonc(text):
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(_TOKENS.sub(_blank, text))
+    except json.JSONDecodeError as e:
+        message = e.msg
+        if text.startswith("/*", e.pos):
+            message = "Unterminated comment"
+        raise json.JSONDecodeError(message, text, e.pos) from None
 
+
+def load_jsonc(file_path):
+    # utf-8-sig: editors on Windows often save settings files with a BOM.
+    with open(file_path, "r", encoding="utf-8-sig") as f:
+        return loads_jsonc(f.read())
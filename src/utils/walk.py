@@ -0,0 +1,56 @@
+import os
+
+SKILL_MANIFEST_NAME = ".skill_manifest.json"
+
+
+def _is_within(path, parent):
+    prefix = parent if parent.endswith(os.sep) else parent + os.sep
+    return path == parent or path.startswith(prefix)
+
+
+# Yields (rel_path, DirEntry, is_dir) for everything below root except the
+# import sidecar at the top level. Ignored directories are pruned before they
+# are opened, and symlinked directories are only entered when they do not lead
+# back into the branch being walked.
+def walk_tree(root, matcher=None, follow_symlinks=True):
+    try:
+        root_real = os.path.realpath(root)
+        if not os.path.isdir(root_real):
+            return
+    except OSError:
+        return
+
+    stack = [(root, "", root_real, ())]
+    while stack:
+        path, rel_prefix, real_path, hops = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        for entry in entries:
+            if not rel_prefix and entry.name == SKILL_MANIFEST_NAME:
+                continue
+            rel_path = rel_prefix + entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if matcher and matcher.match(rel_path, is_dir):
+                continue
+            yield rel_path, entry, is_dir
+
+            if not is_dir:
+                continue
+            try:
+                is_link = entry.is_symlink()
+            except OSError:
+                is_link = False
+            if not is_link:
+                stack.append((entry.path, rel_path + "/", os.path.join(real_path, entry.name), hops))
+            elif follow_symlinks:
+                target = os.path.realpath(entry.path)
+                if any(_is_within(p, target) for p in hops + (real_path,)):
+                    continue
+                stack.append((entry.path, rel_path + "/", target, hops + (real_path,)))